@@ -0,0 +1,430 @@
+#!/usr/bin/env python3
+"""
+Dashboard HTML estático (um único arquivo, sem servidor) com os benchmarks pré-agregados.
+
+Em vez de navegar por centenas de PNGs em `charts/summary`, o dataset é agregado
+uma vez por célula (campanha, dispositivo, algoritmo, delegate, modo, tamanho) e
+embutido como JSON compacto no HTML. O navegador só filtra e desenha (SVG gerado
+por JavaScript puro, sem CDN), então o arquivo abre offline e pode ir junto com a
+campanha.
+
+Por célula:
+
+- `runs` (linhas do CSV) e `n` (iterações extraídas de `notes`);
+- média, desvio, mínimo, máximo, percentis p50/p90/p95/p99, IQR e média aparada
+  das iterações (T+P, `benchmark_stats.tail_summary`); linhas sem amostras em
+  `notes` entram com a própria média;
+- `transfer`/`compute`: média por iteração (ou das colunas da linha, nos CSVs
+  legacy sem T/P);
+- `samples_per_s`: vazão média (`benchmark_normalize.throughput`).
+
+Exemplo:
+
+```bash
+python3 benchmark_dashboard.py --csv app/src/BANCHMARK/.store --output docs/charts/dashboard.html
+python3 benchmark_dashboard.py --csv app/src/BANCHMARK/comparativo-09-12/benchmark_results.csv \
+  --output docs/charts/comparativo-09-12/dashboard.html
+```
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import pandas as pd
+
+from benchmark_normalize import filter_known, normalize_frame, throughput
+from benchmark_notes import explode_samples
+from benchmark_stats import DEFAULT_PERCENTILES, tail_summary
+from benchmark_store import load_benchmarks
+from generate_overview_charts import DELEGATE_COLORS
+
+LOAD_COLUMNS = [
+    "campaign",
+    "device_model",
+    "deviceModel",
+    "deviceInfo",
+    "model",
+    "delegate",
+    "test_name",
+    "data_description",
+    "input_size",
+    "batch_size",
+    "duration_ms",
+    "transfer_ms",
+    "compute_ms",
+]
+CELL_KEYS = ["campaign", "device_model", "algorithm", "delegate_norm", "is_batch", "vector_length"]
+# Dimensões de texto viram índices em listas (`dims`) para o JSON ficar pequeno.
+DIMENSIONS = ["campaign", "device_model", "algorithm", "delegate_norm"]
+PERCENTILES = list(DEFAULT_PERCENTILES)
+METRIC_COLUMNS = (
+    ["runs", "n", "mean", "std", "min", "max"]
+    + [f"p{q}" for q in PERCENTILES]
+    + ["iqr", "trim_mean", "transfer", "compute", "samples_per_s"]
+)
+# Algarismos significativos no JSON (bem além do que os gráficos mostram).
+VALUE_DIGITS = 4
+DEFAULT_OUTPUT = "docs/charts/dashboard.html"
+
+
+def load_frame(source: Path, campaigns: Optional[List[str]] = None) -> pd.DataFrame:
+    df = load_benchmarks(source, LOAD_COLUMNS, campaigns=campaigns, include_notes=True, compact=True)
+    if "campaign" not in df.columns:
+        # CSV de uma campanha: a pasta dá o nome (como no store colunar).
+        df = df.assign(campaign=source.parent.name)
+    return filter_known(normalize_frame(df))
+
+
+def iteration_samples(df: pd.DataFrame) -> pd.DataFrame:
+    """Uma linha por iteração com as chaves da célula; linhas sem `notes` úteis
+    entram com a própria média (uma amostra)."""
+    samples = explode_samples(df, CELL_KEYS)
+    missing = df.index.difference(pd.Index(samples["row_id"].unique()))
+    if len(missing):
+        rows = df.loc[missing, CELL_KEYS + ["transfer_ms", "compute_ms", "duration_ms"]]
+        rows = rows.assign(row_id=missing, iteration=1)
+        samples = pd.concat([samples, rows[samples.columns]], ignore_index=True)
+    return samples.dropna(subset=["duration_ms"])
+
+
+def aggregate_cells(df: pd.DataFrame) -> pd.DataFrame:
+    """Métricas por célula (`CELL_KEYS`) a partir das iterações e das linhas."""
+    samples = iteration_samples(df)
+    cells = tail_summary(samples, CELL_KEYS, "duration_ms", PERCENTILES).set_index(CELL_KEYS)
+    grouped = samples.groupby(CELL_KEYS, observed=True, sort=True)
+    cells["transfer"] = grouped["transfer_ms"].mean()
+    cells["compute"] = grouped["compute_ms"].mean()
+
+    rows = df.assign(samples_per_s=throughput(df)["samples_per_s"])
+    per_row = rows.groupby(CELL_KEYS, observed=True, sort=True).agg(
+        runs=("duration_ms", "size"),
+        row_transfer=("transfer_ms", "mean"),
+        row_compute=("compute_ms", "mean"),
+        samples_per_s=("samples_per_s", "mean"),
+    )
+    cells = cells.join(per_row, how="inner")
+    # CSVs legacy só têm o total por iteração: usa a divisão média da linha.
+    cells["transfer"] = cells["transfer"].fillna(cells.pop("row_transfer"))
+    cells["compute"] = cells["compute"].fillna(cells.pop("row_compute"))
+    return cells.reset_index()
+
+
+def _round(value: Any) -> Any:
+    if value is None or (isinstance(value, float) and not math.isfinite(value)):
+        return None
+    if isinstance(value, float) and value != 0:
+        return float(f"{value:.{VALUE_DIGITS}g}")
+    return value
+
+
+def build_payload(cells: pd.DataFrame, source: Path) -> Dict[str, Any]:
+    """JSON colunar: `dims` com os textos e `rows` com índices + métricas."""
+    dims: Dict[str, List[str]] = {}
+    encoded = pd.DataFrame(index=cells.index)
+    for key in DIMENSIONS:
+        codes, uniques = pd.factorize(cells[key].astype(str), sort=True)
+        dims[key] = list(uniques)
+        encoded[key] = codes
+    encoded["is_batch"] = cells["is_batch"].astype(int)
+    encoded["vector_length"] = cells["vector_length"].astype("int64")
+    for column in METRIC_COLUMNS:
+        encoded[column] = cells[column].astype("float64")
+
+    columns = list(encoded.columns)
+    integer = {c for c in columns if c in DIMENSIONS or c in ("is_batch", "vector_length", "runs", "n")}
+    rows = [
+        [int(v) if c in integer else _round(float(v)) for c, v in zip(columns, record)]
+        for record in encoded.itertuples(index=False, name=None)
+    ]
+    return {
+        "source": str(source),
+        "generated": datetime.now().strftime("%Y-%m-%d %H:%M"),
+        "percentiles": PERCENTILES,
+        "colors": {k: v for k, v in DELEGATE_COLORS.items() if k in dims["delegate_norm"]},
+        "dims": dims,
+        "columns": columns,
+        "rows": rows,
+    }
+
+
+def render_html(payload: Dict[str, Any], title: str) -> str:
+    data = json.dumps(payload, ensure_ascii=False, separators=(",", ":"), allow_nan=False)
+    # `</script>` dentro do JSON encerraria o bloco.
+    data = data.replace("</", "<\\/")
+    return HTML_TEMPLATE.replace("__TITLE__", title).replace("__DATA__", data)
+
+
+def build_dashboard(source: Path, output: Path, campaigns: Optional[List[str]] = None) -> pd.DataFrame:
+    df = load_frame(source, campaigns)
+    if df.empty:
+        raise ValueError(f"Nenhuma linha de MAD/FFT com delegate conhecido em {source}")
+    cells = aggregate_cells(df)
+    payload = build_payload(cells, source)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(render_html(payload, f"Benchmarks — {source.name}"), encoding="utf-8")
+    return cells
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Gera um dashboard HTML autocontido (filtros e gráficos no navegador)."
+    )
+    parser.add_argument(
+        "--csv",
+        required=True,
+        help="Caminho para benchmark_results.csv consolidado, diretório do store colunar ou banco SQLite.",
+    )
+    parser.add_argument(
+        "--campaign",
+        action="append",
+        help="Filtra campanhas do store colunar (nome da pasta). Pode ser repetido.",
+    )
+    parser.add_argument(
+        "--output",
+        default=DEFAULT_OUTPUT,
+        help=f"Arquivo HTML de saída (padrão: {DEFAULT_OUTPUT}).",
+    )
+    args = parser.parse_args()
+
+    output = Path(args.output)
+    cells = build_dashboard(Path(args.csv), output, args.campaign)
+    size = output.stat().st_size / 1024
+    print(
+        f"Dashboard salvo em {output} ({len(cells)} células, "
+        f"{int(cells['n'].sum())} iterações, {size:.0f} KB)."
+    )
+
+
+HTML_TEMPLATE = """<!DOCTYPE html>
+<html lang="pt-BR">
+<head>
+<meta charset="utf-8">
+<title>__TITLE__</title>
+<style>
+body { font-family: system-ui, sans-serif; margin: 0; color: #1a202c; background: #f7fafc; }
+header { padding: 12px 20px; background: #2d3748; color: #fff; }
+header small { color: #cbd5e0; margin-left: 8px; }
+main { display: grid; grid-template-columns: 260px 1fr; gap: 16px; padding: 16px 20px; }
+aside { font-size: 13px; }
+fieldset { border: 1px solid #cbd5e0; border-radius: 4px; margin: 0 0 10px; padding: 6px 8px; background: #fff; }
+legend { font-weight: 600; }
+fieldset label { display: block; white-space: nowrap; overflow: hidden; text-overflow: ellipsis; }
+select { width: 100%; }
+section { background: #fff; border: 1px solid #e2e8f0; border-radius: 4px; padding: 8px 12px; margin-bottom: 16px; }
+h2 { font-size: 15px; margin: 4px 0 8px; }
+svg text { font-size: 11px; fill: #4a5568; }
+.legend span { display: inline-block; margin: 2px 12px 2px 0; font-size: 12px; }
+.legend i { display: inline-block; width: 18px; height: 0; border-top: 3px solid; vertical-align: middle; margin-right: 4px; }
+table { border-collapse: collapse; font-size: 12px; width: 100%; }
+th, td { padding: 3px 6px; border-bottom: 1px solid #edf2f7; text-align: right; }
+th { cursor: pointer; background: #edf2f7; position: sticky; top: 0; }
+td.t, th.t { text-align: left; }
+.scroll { max-height: 420px; overflow: auto; }
+.empty { color: #a0aec0; padding: 24px; }
+</style>
+</head>
+<body>
+<header><strong>__TITLE__</strong><small id="meta"></small></header>
+<main>
+<aside>
+  <fieldset><legend>Campanhas</legend><div id="f-campaign"></div></fieldset>
+  <fieldset><legend>Dispositivos</legend><div id="f-device_model"></div></fieldset>
+  <fieldset><legend>Delegates</legend><div id="f-delegate_norm"></div></fieldset>
+  <fieldset><legend>Algoritmo</legend><select id="f-algorithm"></select></fieldset>
+  <fieldset><legend>Modo</legend><select id="f-mode">
+    <option value="0">single</option><option value="1">batch</option></select></fieldset>
+  <fieldset><legend>Métrica</legend><select id="f-metric"></select>
+    <label><input type="checkbox" id="f-logy"> eixo Y log</label></fieldset>
+  <fieldset><legend>Tamanho (divisão T/P)</legend><select id="f-size"></select></fieldset>
+</aside>
+<div>
+  <section><h2 id="line-title"></h2><div id="line"></div><div class="legend" id="legend"></div></section>
+  <section><h2 id="split-title"></h2><div id="split"></div></section>
+  <section><h2>Células filtradas</h2><div class="scroll" id="table"></div></section>
+</div>
+</main>
+<script id="data" type="application/json">__DATA__</script>
+<script>
+"use strict";
+const D = JSON.parse(document.getElementById("data").textContent);
+const DIMS = ["campaign", "device_model", "algorithm", "delegate_norm"];
+const ROWS = D.rows.map(r => {
+  const o = {};
+  D.columns.forEach((c, i) => { o[c] = DIMS.includes(c) ? D.dims[c][r[i]] : r[i]; });
+  return o;
+});
+const METRICS = [["mean", "média"], ["trim_mean", "média aparada"]].concat(D.percentiles.map(q => ["p" + q, "p" + q]),
+  [["iqr", "IQR"], ["transfer", "transferência (média)"], ["compute", "processamento (média)"],
+   ["samples_per_s", "amostras/s"]]);
+const DASHES = ["", "6 3", "2 3", "8 3 2 3", "1 5"];
+const $ = id => document.getElementById(id);
+const fmt = v => v == null ? "–" : Math.abs(v) >= 1e5 ? v.toExponential(2) : +v.toPrecision(4);
+const size = n => n >= 1024 ? (n % 1024 ? (n / 1024).toFixed(1) : n / 1024) + "k" : "" + n;
+const uniq = (rows, k) => [...new Set(rows.map(r => r[k]))].sort((a, b) => a < b ? -1 : a > b ? 1 : 0);
+const el = (tag, attrs, text) => {
+  const e = document.createElementNS("http://www.w3.org/2000/svg", tag);
+  for (const k in attrs) e.setAttribute(k, attrs[k]);
+  if (text != null) e.textContent = text;
+  return e;
+};
+let sortKey = "vector_length", sortDir = 1;
+
+function checks(key, values, checked) {
+  const box = $("f-" + key);
+  const known = new Set([...box.querySelectorAll("input")].map(i => i.value));
+  const prev = new Set([...box.querySelectorAll("input:checked")].map(i => i.value));
+  const init = !box.dataset.ready;
+  box.dataset.ready = "1";
+  box.innerHTML = "";
+  values.forEach(v => {
+    const label = document.createElement("label");
+    const input = document.createElement("input");
+    input.type = "checkbox"; input.value = v;
+    // Mantém a escolha do usuário; valores novos (ex.: outra campanha) entram marcados.
+    input.checked = init ? checked(v) : prev.has(v) || !known.has(v);
+    input.onchange = update;
+    label.append(input, " " + v); label.title = v;
+    box.append(label);
+  });
+}
+const selected = key => new Set([...$("f-" + key).querySelectorAll("input:checked")].map(i => i.value));
+function options(id, values, labels) {
+  const sel = $(id), prev = sel.value;
+  sel.innerHTML = "";
+  values.forEach((v, i) => sel.add(new Option(labels ? labels[i] : v, v)));
+  if (values.map(String).includes(prev)) sel.value = prev;
+}
+
+function filtered() {
+  const camp = selected("campaign"), dev = selected("device_model"), del = selected("delegate_norm");
+  const alg = $("f-algorithm").value, mode = +$("f-mode").value;
+  return ROWS.filter(r => camp.has(r.campaign) && dev.has(r.device_model) && del.has(r.delegate_norm)
+    && r.algorithm === alg && r.is_batch === mode);
+}
+const seriesKey = (r, many) => (many ? r.device_model + " [" + r.campaign + "]" : r.device_model) + " · " + r.delegate_norm;
+
+function lineChart(rows, metric, label) {
+  const box = $("line"), legend = $("legend");
+  box.innerHTML = ""; legend.innerHTML = "";
+  $("line-title").textContent = label + " × tamanho do vetor";
+  const pts = rows.filter(r => r[metric] != null && (!$("f-logy").checked || r[metric] > 0));
+  if (!pts.length) { box.innerHTML = '<div class="empty">Sem dados para o filtro.</div>'; return; }
+  const W = 820, H = 360, L = 64, R = 12, T = 10, B = 36;
+  const logy = $("f-logy").checked;
+  const xs = uniq(pts, "vector_length"), ys = pts.map(r => r[metric]);
+  const x0 = Math.log2(xs[0]), x1 = Math.log2(xs[xs.length - 1]) || x0 + 1;
+  let y0 = logy ? Math.log10(Math.min(...ys)) : 0, y1 = logy ? Math.log10(Math.max(...ys)) : Math.max(...ys);
+  if (y1 === y0) y1 = y0 + 1;
+  const px = v => L + (x1 === x0 ? 0.5 : (Math.log2(v) - x0) / (x1 - x0)) * (W - L - R);
+  const py = v => H - B - ((logy ? Math.log10(v) : v) - y0) / (y1 - y0) * (H - T - B);
+  const svg = el("svg", { width: W, height: H, viewBox: `0 0 ${W} ${H}` });
+  for (let i = 0; i <= 5; i++) {
+    const t = y0 + (y1 - y0) * i / 5, v = logy ? 10 ** t : t, y = py(v);
+    svg.append(el("line", { x1: L, x2: W - R, y1: y, y2: y, stroke: "#edf2f7" }));
+    svg.append(el("text", { x: L - 6, y: y + 4, "text-anchor": "end" }, fmt(v)));
+  }
+  xs.forEach(v => svg.append(el("text", { x: px(v), y: H - B + 16, "text-anchor": "middle" }, size(v))));
+  const many = new Set(pts.map(r => r.campaign)).size > 1;
+  const devices = uniq(pts, "device_model");
+  const groups = new Map();
+  pts.forEach(r => { const k = seriesKey(r, many); if (!groups.has(k)) groups.set(k, []); groups.get(k).push(r); });
+  [...groups.keys()].sort().forEach(k => {
+    const g = groups.get(k).sort((a, b) => a.vector_length - b.vector_length);
+    const color = D.colors[g[0].delegate_norm] || "#718096";
+    const dash = DASHES[devices.indexOf(g[0].device_model) % DASHES.length];
+    svg.append(el("polyline", { points: g.map(r => px(r.vector_length) + "," + py(r[metric])).join(" "),
+      fill: "none", stroke: color, "stroke-width": 2, "stroke-dasharray": dash }));
+    g.forEach(r => {
+      const c = el("circle", { cx: px(r.vector_length), cy: py(r[metric]), r: 3, fill: color });
+      c.append(el("title", {}, `${k}\\n${size(r.vector_length)}: ${fmt(r[metric])} (n=${r.n}, p50=${fmt(r.p50)}, p99=${fmt(r.p99)})`));
+      svg.append(c);
+    });
+    const item = document.createElement("span");
+    item.innerHTML = `<i style="border-color:${color};border-top-style:${dash ? "dashed" : "solid"}"></i>`;
+    item.append(k); legend.append(item);
+  });
+  box.append(svg);
+}
+
+function splitChart(rows) {
+  const box = $("split"), n = +$("f-size").value;
+  box.innerHTML = "";
+  $("split-title").textContent = "Transferência × processamento (ms) — " + size(n);
+  const pts = rows.filter(r => r.vector_length === n && r.compute != null);
+  if (!pts.length) { box.innerHTML = '<div class="empty">Sem dados para o tamanho.</div>'; return; }
+  const many = new Set(pts.map(r => r.campaign)).size > 1;
+  pts.sort((a, b) => seriesKey(a, many) < seriesKey(b, many) ? -1 : 1);
+  const W = 820, L = 260, bar = 16, H = pts.length * (bar + 6) + 24;
+  const max = Math.max(...pts.map(r => (r.transfer || 0) + r.compute));
+  const sx = v => v / max * (W - L - 70);
+  const svg = el("svg", { width: W, height: H, viewBox: `0 0 ${W} ${H}` });
+  pts.forEach((r, i) => {
+    const y = i * (bar + 6) + 4, t = r.transfer || 0, color = D.colors[r.delegate_norm] || "#718096";
+    svg.append(el("text", { x: L - 6, y: y + 12, "text-anchor": "end" }, seriesKey(r, many)));
+    const a = el("rect", { x: L, y, width: sx(t), height: bar, fill: "#cbd5e0" });
+    a.append(el("title", {}, "transferência " + fmt(t) + " ms"));
+    const b = el("rect", { x: L + sx(t), y, width: sx(r.compute), height: bar, fill: color });
+    b.append(el("title", {}, "processamento " + fmt(r.compute) + " ms"));
+    svg.append(a, b, el("text", { x: L + sx(t + r.compute) + 4, y: y + 12 }, fmt(t + r.compute)));
+  });
+  svg.append(el("text", { x: L, y: H - 4 }, "cinza: transferência · cor do delegate: processamento"));
+  box.append(svg);
+}
+
+function table(rows) {
+  const cols = [["campaign", "campanha"], ["device_model", "dispositivo"], ["delegate_norm", "delegate"],
+    ["vector_length", "tamanho"], ["runs", "execuções"], ["n", "iterações"], ["mean", "média"],
+    ["std", "desvio"]].concat(D.percentiles.map(q => ["p" + q, "p" + q]),
+    [["iqr", "IQR"], ["transfer", "T"], ["compute", "P"], ["samples_per_s", "amostras/s"]]);
+  const text = new Set(["campaign", "device_model", "delegate_norm"]);
+  const sorted = rows.slice().sort((a, b) => {
+    const x = a[sortKey], y = b[sortKey];
+    return (x == null) - (y == null) || (x < y ? -sortDir : x > y ? sortDir : 0);
+  });
+  const head = cols.map(([k, l]) => `<th class="${text.has(k) ? "t" : ""}" data-k="${k}">${l}${k === sortKey ? (sortDir > 0 ? " ▲" : " ▼") : ""}</th>`).join("");
+  const body = sorted.map(r => "<tr>" + cols.map(([k]) =>
+    text.has(k) ? `<td class="t">${r[k]}</td>` : `<td>${k === "vector_length" ? size(r[k]) : fmt(r[k])}</td>`).join("") + "</tr>").join("");
+  $("table").innerHTML = `<table><thead><tr>${head}</tr></thead><tbody>${body}</tbody></table>`;
+  $("table").querySelectorAll("th").forEach(th => th.onclick = () => {
+    sortDir = th.dataset.k === sortKey ? -sortDir : 1; sortKey = th.dataset.k; update();
+  });
+}
+
+function update() {
+  const camp = selected("campaign");
+  checks("device_model", uniq(ROWS.filter(r => camp.has(r.campaign)), "device_model"), () => true);
+  const rows = filtered();
+  const metric = $("f-metric").value;
+  options("f-size", uniq(rows, "vector_length").sort((a, b) => a - b).map(String),
+    uniq(rows, "vector_length").sort((a, b) => a - b).map(size));
+  lineChart(rows, metric, METRICS.find(m => m[0] === metric)[1] + (metric === "samples_per_s" ? "" : " (ms)"));
+  splitChart(rows);
+  table(rows);
+}
+
+$("meta").textContent = `${D.source} · ${ROWS.length} células · gerado em ${D.generated}`;
+checks("campaign", D.dims.campaign, v => v === D.dims.campaign[0]);
+checks("delegate_norm", D.dims.delegate_norm, () => true);
+options("f-algorithm", D.dims.algorithm);
+options("f-metric", METRICS.map(m => m[0]), METRICS.map(m => m[1]));
+["f-algorithm", "f-mode", "f-metric", "f-logy", "f-size"].forEach(id => $(id).onchange = update);
+update();
+</script>
+</body>
+</html>
+"""
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except Exception as exc:
+        print(f"Erro: {exc}", file=sys.stderr)
+        sys.exit(1)
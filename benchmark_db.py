@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+"""
+Banco SQLite local (stdlib) com os benchmarks e tabelas auxiliares indexadas.
+
+A tabela `runs` recebe as linhas dos CSVs consolidados / store colunar no schema
+do store, mais as colunas derivadas usadas em todos os gráficos:
+
+- `device_model`: rótulo do aparelho como em `normalize_frame` (device_model,
+  deviceInfo ou model, o primeiro preenchido);
+- `algorithm`: MAD / FFT / Outro (a partir de `test_name`);
+- `delegate_norm`: CPU Kotlin / TFLite CPU / TFLite GPU / TFLite NNAPI;
+- `packets`/`sensors`/`vector_length`: pacotes, sensores e amostras por sensor de
+  `data_description` (sem descrição: `input_size / (batch_size × sensores)`, 10 na FFT);
+- `batch_mode`: `batch` para `batch_size > 1` ou testes `x10`, senão `single`.
+
+Há um índice composto em (device_model, algorithm, delegate_norm, vector_length,
+batch_mode) e outro em (algorithm, delegate_norm, vector_length, batch_mode) para
+filtros sem dispositivo, então filtros e agregações por essas chaves viram buscas
+indexadas em vez de varreduras completas do DataFrame. `generate_charts.py` e
+`charts.py` agregam direto no banco (`aggregate_runs`) quando `--csv` é um .sqlite. CSVs auxiliares (ex.: resultados de
+energia ou precisão) entram com `--table nome=arquivo.csv` e ganham índices nas
+mesmas chaves que possuírem.
+
+Exemplo:
+
+```bash
+python3 benchmark_db.py --source app/src/BANCHMARK/comparativo-09-12/benchmark_results.csv \
+  --db app/src/BANCHMARK/benchmarks.sqlite
+python3 generate_charts.py --csv app/src/BANCHMARK/benchmarks.sqlite --output /tmp/charts
+```
+
+```python
+from benchmark_db import connect, aggregate_runs
+with connect("app/src/BANCHMARK/benchmarks.sqlite") as conn:
+    agg = aggregate_runs(conn, algorithms=["FFT"], delegates=["TFLite GPU"])
+```
+"""
+
+from __future__ import annotations
+
+import argparse
+import sqlite3
+import sys
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from benchmark_normalize import batch_flags, data_layout, detect_algorithms, device_labels, normalize_delegates
+from benchmark_schema import STORE_COLUMNS, reindex_columns
+from merge_benchmarks import DEFAULT_BENCHMARK_DIR, parse_device_args
+
+DEFAULT_DB_PATH = DEFAULT_BENCHMARK_DIR / "benchmarks.sqlite"
+DB_SUFFIXES = {".sqlite", ".sqlite3", ".db"}
+RUNS_TABLE = "runs"
+INDEX_COLUMNS = ["device_model", "algorithm", "delegate_norm", "vector_length", "batch_mode"]
+# Índices em ordem de prefixo: com e sem o dispositivo à frente.
+INDEXES = {"keys": INDEX_COLUMNS, "algorithm": INDEX_COLUMNS[1:]}
+DERIVED_COLUMNS = ["algorithm", "delegate_norm", "packets", "sensors", "vector_length", "batch_mode"]
+DEFAULT_METRICS = ["duration_ms", "transfer_ms", "compute_ms"]
+
+
+def is_database(path: Path) -> bool:
+    return Path(path).suffix.lower() in DB_SUFFIXES
+
+
+def derive_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """Acrescenta as DERIVED_COLUMNS (via benchmark_normalize)."""
+    df = df.copy()
+    df["device_model"] = device_labels(df).astype(object)
+    df["algorithm"] = detect_algorithms(df["test_name"]).astype(object)
+    df["delegate_norm"] = normalize_delegates(df["delegate"], df["test_name"]).astype(object)
+    layout = data_layout(df, df["algorithm"])
+    df["packets"] = layout["packets"]
+    df["sensors"] = layout["sensors"]
+    df["vector_length"] = layout["samples"]
+    is_batch = batch_flags(df) | batch_flags(df, by="test_name")
+    df["batch_mode"] = np.where(is_batch, "batch", "single")
+    return df
+
+
+def _sql_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Tipos nullable do pandas viram objetos/NaN aceitos pelo sqlite3."""
+    out = df.copy()
+    for col in out.columns:
+        if str(out[col].dtype) in ("Int64", "boolean", "string"):
+            out[col] = out[col].astype(object).where(out[col].notna(), None)
+    return out
+
+
+def _create_indexes(conn: sqlite3.Connection, table: str, columns: Iterable[str]) -> None:
+    for name, keys in INDEXES.items():
+        present = [c for c in keys if c in set(columns)]
+        if not present:
+            continue
+        quoted = ", ".join(f'"{c}"' for c in present)
+        conn.execute(f'CREATE INDEX IF NOT EXISTS "idx_{table}_{name}" ON "{table}" ({quoted})')
+    if "campaign" in columns:
+        conn.execute(f'CREATE INDEX IF NOT EXISTS "idx_{table}_campaign" ON "{table}" ("campaign")')
+
+
+def _source_frames(source: Path, label: Optional[str]) -> Iterable[pd.DataFrame]:
+    from benchmark_store import load_benchmarks
+    from merge_benchmarks import iter_labeled_chunks
+
+    if source.is_dir():
+        yield load_benchmarks(source, include_notes=True)
+        return
+    campaign = source.parent.name
+    for chunk in iter_labeled_chunks(source, label):
+        chunk["campaign"] = campaign
+        yield chunk
+
+
+def build_database(
+    sources: Sequence[Tuple[Optional[str], Path]],
+    db_path: Path,
+    tables: Optional[Dict[str, Path]] = None,
+) -> int:
+    """Recria o banco com `runs` (benchmarks) e as tabelas auxiliares; retorna as linhas de `runs`."""
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = db_path.with_name(db_path.name + ".tmp")
+    if tmp_path.exists():
+        tmp_path.unlink()
+    rows = 0
+    with sqlite3.connect(tmp_path) as conn:
+        for label, source in sources:
+            if not source.exists():
+                raise FileNotFoundError(f"Fonte não encontrada: {source}")
+            for frame in _source_frames(source, label):
+                frame = derive_columns(reindex_columns(frame, STORE_COLUMNS))
+                _sql_frame(frame).to_sql(RUNS_TABLE, conn, if_exists="append", index=False)
+                rows += len(frame)
+        if rows:
+            _create_indexes(conn, RUNS_TABLE, STORE_COLUMNS + DERIVED_COLUMNS)
+        for name, path in (tables or {}).items():
+            extra = pd.read_csv(path)
+            extra.columns = [str(c).strip() for c in extra.columns]
+            if {"test_name", "delegate", "input_size", "batch_size"} <= set(extra.columns):
+                extra = derive_columns(extra)
+            extra.to_sql(name, conn, if_exists="replace", index=False)
+            _create_indexes(conn, name, extra.columns)
+    tmp_path.replace(db_path)
+    return rows
+
+
+def connect(db_path: Path) -> sqlite3.Connection:
+    db_path = Path(db_path)
+    if not db_path.exists():
+        raise FileNotFoundError(f"Banco não encontrado: {db_path} (rode benchmark_db.py)")
+    return sqlite3.connect(db_path)
+
+
+def query(conn: sqlite3.Connection, sql: str, params: Sequence[object] = ()) -> pd.DataFrame:
+    return pd.read_sql_query(sql, conn, params=list(params))
+
+
+def _where(filters: Dict[str, Optional[Sequence[object]]]) -> Tuple[str, List[object]]:
+    clauses: List[str] = []
+    params: List[object] = []
+    for column, values in filters.items():
+        if values:
+            values = list(values)
+            clauses.append(f'"{column}" IN ({", ".join("?" * len(values))})')
+            params.extend(values)
+    return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+
+def select_runs(
+    conn: sqlite3.Connection,
+    columns: Optional[Iterable[str]] = None,
+    *,
+    devices: Optional[Sequence[str]] = None,
+    algorithms: Optional[Sequence[str]] = None,
+    delegates: Optional[Sequence[str]] = None,
+    vector_lengths: Optional[Sequence[int]] = None,
+    batch_modes: Optional[Sequence[str]] = None,
+    campaigns: Optional[Sequence[str]] = None,
+) -> pd.DataFrame:
+    """Linhas de `runs` filtradas pelas chaves indexadas (None = sem filtro)."""
+    available = set(STORE_COLUMNS + DERIVED_COLUMNS)
+    if columns is None:
+        select = "*"
+    else:
+        select = ", ".join(f'"{c}"' for c in dict.fromkeys(columns) if c in available)
+    where, params = _where(
+        {
+            "device_model": devices,
+            "algorithm": algorithms,
+            "delegate_norm": delegates,
+            "vector_length": vector_lengths,
+            "batch_mode": batch_modes,
+            "campaign": campaigns,
+        }
+    )
+    return query(conn, f"SELECT {select} FROM {RUNS_TABLE}{where}", params)
+
+
+def aggregate_runs(
+    conn: sqlite3.Connection,
+    keys: Sequence[str] = ("device_model", "algorithm", "delegate_norm", "vector_length"),
+    metrics: Sequence[str] = DEFAULT_METRICS,
+    **filters: Optional[Sequence[object]],
+) -> pd.DataFrame:
+    """Média, desvio amostral e contagem por `keys`, calculados no SQLite.
+
+    `filters` aceita os mesmos nomes de `select_runs` (devices, algorithms, ...).
+    """
+    names = {
+        "devices": "device_model",
+        "algorithms": "algorithm",
+        "delegates": "delegate_norm",
+        "vector_lengths": "vector_length",
+        "batch_modes": "batch_mode",
+        "campaigns": "campaign",
+    }
+    where, params = _where({names[k]: v for k, v in filters.items()})
+    key_sql = ", ".join(f'"{k}"' for k in keys)
+    columns = ", ".join([key_sql] + [f'"{m}"' for m in dict.fromkeys(metrics)])
+    # SQLite não tem STDDEV e E[x²] − E[x]² cancela quando o desvio é pequeno
+    # perto da média: a variância sai em duas passadas, médias por grupo e depois
+    # os desvios de cada linha a essa média (junção nas keys; IS casa NULL).
+    means = [key_sql]
+    parts = [", ".join(f'g."{k}"' for k in keys)]
+    for metric in metrics:
+        short = metric.removesuffix("_ms")
+        means.append(f'AVG("{metric}") AS "{short}_mean", COUNT("{metric}") AS "{short}_n"')
+        deviation = f'(r."{metric}" - g."{short}_mean")'
+        parts.append(f'MAX(g."{short}_mean") AS {short}_mean')
+        parts.append(
+            f'CASE WHEN MAX(g."{short}_n") > 1 THEN '
+            f'SUM({deviation} * {deviation}) / (MAX(g."{short}_n") - 1) END AS {short}_var'
+        )
+    means.append(f'COUNT("{metrics[0]}") AS "_n"')
+    parts.append('MAX(g."_n") AS n')
+    join = " AND ".join(f'r."{k}" IS g."{k}"' for k in keys)
+    group_sql = ", ".join(f'g."{k}"' for k in keys)
+    sql = (
+        f"WITH r AS (SELECT {columns} FROM {RUNS_TABLE}{where}), "
+        f"g AS (SELECT {', '.join(means)} FROM r GROUP BY {key_sql}) "
+        f"SELECT {', '.join(parts)} FROM r JOIN g ON {join} GROUP BY {group_sql} ORDER BY {group_sql}"
+    )
+    df = query(conn, sql, params)
+    for metric in metrics:
+        short = metric.removesuffix("_ms")
+        df[f"{short}_std"] = np.sqrt(df.pop(f"{short}_var").clip(lower=0))
+    return df
+
+
+def load_runs(
+    db_path: Path,
+    columns: Optional[Iterable[str]] = None,
+    devices: Optional[Sequence[str]] = None,
+    campaigns: Optional[Sequence[str]] = None,
+) -> pd.DataFrame:
+    """Usado por `benchmark_store.load_benchmarks` quando a fonte é um arquivo .sqlite."""
+    with connect(db_path) as conn:
+        return select_runs(conn, columns, devices=devices, campaigns=campaigns)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Cria um banco SQLite indexado com os benchmarks (e CSVs auxiliares)."
+    )
+    parser.add_argument(
+        "--source",
+        action="append",
+        default=[],
+        metavar="[LABEL=]CSV|STORE",
+        help="CSV de benchmarks (label opcional) ou diretório do store colunar. Pode ser repetido.",
+    )
+    parser.add_argument(
+        "--table",
+        action="append",
+        default=[],
+        metavar="NOME=CSV",
+        help="CSV auxiliar (ex.: energia, precisão) gravado como tabela própria.",
+    )
+    parser.add_argument(
+        "--db",
+        default=str(DEFAULT_DB_PATH),
+        help="Arquivo SQLite de saída (padrão: app/src/BANCHMARK/benchmarks.sqlite).",
+    )
+    args = parser.parse_args()
+
+    sources = parse_device_args(args.source)
+    if not sources:
+        sources = [(None, DEFAULT_BENCHMARK_DIR / ".store")]
+    tables: Dict[str, Path] = {}
+    for entry in args.table:
+        if "=" not in entry:
+            parser.error(f"--table espera NOME=CSV: {entry}")
+        name, path = entry.split("=", 1)
+        tables[name.strip()] = Path(path).expanduser()
+
+    db_path = Path(args.db)
+    rows = build_database(sources, db_path, tables)
+    print(f"Banco salvo em {db_path} ({rows} execuções, {len(tables)} tabelas auxiliares).")
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except Exception as exc:  # pragma: no cover
+        print(f"Erro: {exc}", file=sys.stderr)
+        sys.exit(1)
@@ -0,0 +1,390 @@
+#!/usr/bin/env python3
+"""
+Lê os logs textuais das campanhas (benchmark_results.txt e *_single/*_batch.txt).
+
+Formatos reconhecidos, todos em blocos iniciados por `===== <data/hora> =====`:
+
+- `benchmark_results.txt` (`Teste:`, `Modo: ... | Delegate: ...`, `Dados:`,
+  `Iterações: ... | Pacotes/batch: ...`, `Total: a±b ms (min=... / max=...)`).
+- Logs por cenário (`Cenário:`, `Escala: 1x (4096 pts)`, `Execuções: N | Pacotes: M`,
+  `Total(ms)/Transfer(ms)/Processamento(ms): a±b (min=... | max=...)`).
+- Logs legacy de 17/11 (`MAD TFLite (GPU) -> 7,597 ms`, `MAD CPU x10 -> média ...`,
+  `Média:/Desvio padrão:/Amostras:` do mad_benchmark.txt).
+
+Cada bloco vira uma linha no mesmo schema tipado do store colunar
+(`benchmark_schema.STORE_COLUMNS`); `notes` preserva as listas `Tempos: T=../P=..`
+para o `benchmark_notes.py`. A leitura é feita linha a linha e entregue em blocos
+de DataFrame, então arquivos grandes não são carregados inteiros.
+
+Exemplo:
+
+```bash
+python3 benchmark_logs.py app/src/BANCHMARK/meu-s21-27-11/mad_tflite_gpu_batch.txt --output /tmp/mad_gpu.csv
+python3 benchmark_logs.py --campaign-dir app/src/BANCHMARK/motog-04s --output /tmp/motog04s_logs.csv
+```
+"""
+
+from __future__ import annotations
+
+import argparse
+import re
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from benchmark_schema import DEVICE_TIMEZONE, STORE_COLUMNS, coerce_types, reindex_columns
+from merge_benchmarks import DEFAULT_CHUNK_ROWS, fallback_device_label
+
+LOG_TIMEZONE = DEVICE_TIMEZONE
+# Espelha BenchmarkExecutor.FFT_NUM_SENSORS, usado para reconstruir `Dados:` nos logs por cenário.
+FFT_NUM_SENSORS = 10
+# Arquivos que apenas concatenam os demais logs da pasta.
+AGGREGATE_LOGS = {"benchmarks_report.txt"}
+# Resumo que repete as execuções dos logs por cenário (*_single/*_batch), com o
+# horário só em segundos.
+SUMMARY_LOG = "benchmark_results.txt"
+LEGACY_TEST_NAMES = {"MAD CPU x10": "MAD CPU Kotlin x10"}
+
+NUM = r"-?\d+(?:[.,]\d+)?"
+BLOCK_HEADER = re.compile(r"^===== (\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}(?:\.\d+)?) =====$")
+SECTION_HEADER = re.compile(r"^===== .+ =====$")
+STATS = rf"({NUM})±({NUM})(?: ms)? \(min=({NUM}) [/|] max=({NUM})\)"
+
+FIELD_PATTERNS: List[Tuple[str, "re.Pattern[str]"]] = [
+    ("test", re.compile(r"^(?:Teste|Cenário): (.+)$")),
+    ("mode", re.compile(r"^Modo: (.*?) \| Delegate: (.*)$")),
+    ("delegate", re.compile(r"^Delegate: (.+)$")),
+    ("data", re.compile(r"^Dados: (.*) \((\d+) amostras\)$")),
+    ("runs", re.compile(r"^(?:Iterações|Execuções): (\d+) \| (?:Pacotes/batch|Pacotes): (\d+)$")),
+    ("scale", re.compile(r"^Escala: (\S+) \((\d+) pts\)$")),
+    ("duration_stats", re.compile(rf"^Total(?:\(ms\))?: {STATS}$")),
+    ("transfer_stats", re.compile(rf"^Transfer\(ms\): {STATS}$")),
+    ("compute_stats", re.compile(rf"^Processamento\(ms\): {STATS}$")),
+    ("split", re.compile(rf"^Transferência: ({NUM}) ms\s+\| Processamento: ({NUM}) ms$")),
+    ("legacy_duration", re.compile(rf"^Duração: ({NUM}) ms \| Throughput: ({NUM}) ops/s$")),
+    ("throughput", re.compile(rf"^Throughput: ({NUM}) ops/s$")),
+    ("energy", re.compile(r"^Impacto energético estimado: (.+)$")),
+    ("device", re.compile(r"^Dispositivo: (\S+) (.+) \(HW=(.*), Board=(.*), SDK=(\d+)\)$")),
+    ("power_save", re.compile(r"^Power saver ativo: (\w+)$")),
+    ("soc", re.compile(r"^SoC: (.+)$")),
+    ("temps_arrow", re.compile(r"^Temp Bateria: (.+)$")),
+    ("temps", re.compile(r"^Temperaturas: (.+)$")),
+    ("notes", re.compile(r"^Notas(?: \(média dos \d+ pacotes\))?: (.*)$")),
+    ("legacy_batch", re.compile(rf"^(.+?) -> média ({NUM}) ms \| min ({NUM}) \| max ({NUM})$")),
+    ("legacy_single", re.compile(rf"^((?:MAD|FFT) .+?) -> ({NUM}) ms$")),
+    ("legacy_mean", re.compile(rf"^Média: ({NUM})$")),
+    ("legacy_std", re.compile(rf"^Desvio padrão: ({NUM})$")),
+    ("legacy_minmax", re.compile(rf"^Min/Max: ({NUM}) / ({NUM})$")),
+    ("legacy_samples", re.compile(r"^(?:Amostras|Execuções): (.+)$")),
+]
+TEMP_ARROW = re.compile(rf"(Bateria|CPU|GPU):? ({NUM}|-)(?:°C)? → ({NUM}|-)")
+TEMP_PLAIN = re.compile(rf"(Bateria|CPU|GPU) ({NUM})°C -> ({NUM})°C")
+TEMP_PREFIX = {"Bateria": "battery", "CPU": "cpu", "GPU": "gpu"}
+
+
+def _num(text: str) -> Optional[float]:
+    if text in ("", "-"):
+        return None
+    return float(text.replace(",", "."))
+
+
+def _timestamp_ms(text: str) -> int:
+    fmt = "%Y-%m-%d %H:%M:%S.%f" if "." in text else "%Y-%m-%d %H:%M:%S"
+    moment = datetime.strptime(text, fmt).replace(tzinfo=LOG_TIMEZONE)
+    return int(round(moment.timestamp() * 1000))
+
+
+def iter_blocks(lines: Iterable[str]) -> Iterator[Tuple[str, List[str]]]:
+    """Agrupa as linhas em blocos (data/hora do cabeçalho, linhas do corpo)."""
+    stamp: Optional[str] = None
+    body: List[str] = []
+    for raw in lines:
+        line = raw.rstrip("\r\n")
+        header = BLOCK_HEADER.match(line)
+        if header or SECTION_HEADER.match(line):
+            if stamp is not None:
+                yield stamp, body
+            stamp = header.group(1) if header else None
+            body = []
+        elif stamp is not None:
+            body.append(line)
+    if stamp is not None:
+        yield stamp, body
+
+
+def _set_stats(record: Dict[str, object], prefix: str, match: "re.Match[str]") -> None:
+    mean, std, low, high = (_num(g) for g in match.groups())
+    record[f"{prefix}_ms"] = mean
+    record[f"{prefix}_std_ms"] = std
+    record[f"{prefix}_min_ms"] = low
+    record[f"{prefix}_max_ms"] = high
+
+
+def _set_temps(record: Dict[str, object], pattern: "re.Pattern[str]", text: str) -> None:
+    for sensor, start, end in pattern.findall(text):
+        prefix = TEMP_PREFIX[sensor]
+        record[f"{prefix}_temp_start_c"] = _num(start)
+        record[f"{prefix}_temp_end_c"] = _num(end)
+
+
+def _fill_derived(record: Dict[str, object]) -> None:
+    name = str(record.get("test_name", ""))
+    upper = name.upper()
+    if "delegate" not in record:
+        paren = re.search(r"\(([^)]+)\)", name)
+        if paren:
+            record["delegate"] = paren.group(1)
+        elif "TFLITE" in upper:
+            record["delegate"] = "TFLite " + name.split("TFLite", 1)[1].split()[0]
+        else:
+            record["delegate"] = "CPU Kotlin"
+    if "processing_mode" not in record:
+        tflite = "TFLITE" in upper or "BENCHMARK" in upper
+        record["processing_mode"] = "TensorFlow Lite" if tflite else "Kotlin"
+    if "data_description" not in record and "scale_points" in record:
+        points = int(record["scale_points"])
+        packets = int(record.get("batch_size") or 1)
+        sensors = FFT_NUM_SENSORS if upper.startswith("FFT") else 1
+        unit = "sensor" if sensors == 1 else "sensores"
+        record["data_description"] = f"{packets}×({sensors} {unit} × {points} amostras)"
+        record["input_size"] = packets * sensors * points
+    if "transfer_ms" in record and "compute_ms" in record and "duration_ms" not in record:
+        record["duration_ms"] = float(record["transfer_ms"]) + float(record["compute_ms"])
+
+
+def parse_block(stamp: str, body: List[str]) -> Optional[Dict[str, object]]:
+    """Converte um bloco em registro; blocos sem tempo medido (ex.: resultado MAD) retornam None."""
+    record: Dict[str, object] = {"timestamp": _timestamp_ms(stamp)}
+    notes: List[str] = []
+    in_notes = False
+    for line in body:
+        if not line.strip():
+            in_notes = False
+            continue
+        for key, pattern in FIELD_PATTERNS:
+            match = pattern.match(line)
+            if match:
+                break
+        else:
+            key, match = None, None
+
+        if key is None:
+            notes.append(line.strip())
+            continue
+        if in_notes and key not in ("temps", "temps_arrow"):
+            notes.append(line.strip())
+            continue
+        in_notes = False
+        groups = match.groups()
+        if key == "test":
+            record["test_name"] = groups[0].strip()
+        elif key == "mode":
+            record["processing_mode"], record["delegate"] = groups[0].strip(), groups[1].strip()
+        elif key == "delegate":
+            record["delegate"] = groups[0].strip()
+        elif key == "data":
+            record["data_description"], record["input_size"] = groups[0].strip(), int(groups[1])
+        elif key == "runs":
+            record["iterations"], record["batch_size"] = int(groups[0]), int(groups[1])
+        elif key == "scale":
+            record["scale_points"] = int(groups[1])
+        elif key == "duration_stats":
+            _set_stats(record, "duration", match)
+        elif key == "transfer_stats":
+            _set_stats(record, "transfer", match)
+        elif key == "compute_stats":
+            _set_stats(record, "compute", match)
+        elif key == "split":
+            record["transfer_ms"], record["compute_ms"] = _num(groups[0]), _num(groups[1])
+        elif key == "legacy_duration":
+            record["duration_ms"], record["throughput_ops_per_sec"] = _num(groups[0]), _num(groups[1])
+        elif key == "throughput":
+            record["throughput_ops_per_sec"] = _num(groups[0])
+        elif key == "energy":
+            record["estimated_energy"] = groups[0].strip()
+        elif key == "device":
+            (
+                record["manufacturer"],
+                record["model"],
+                record["hardware"],
+                record["board"],
+                record["sdk_int"],
+            ) = (groups[0], groups[1].strip(), groups[2], groups[3], int(groups[4]))
+        elif key == "power_save":
+            record["power_save"] = groups[0]
+        elif key == "soc":
+            record["soc"] = groups[0].strip()
+        elif key == "temps_arrow":
+            _set_temps(record, TEMP_ARROW, groups[0])
+        elif key == "temps":
+            _set_temps(record, TEMP_PLAIN, groups[0])
+        elif key == "notes":
+            notes.append(groups[0].strip())
+            in_notes = True
+        elif key == "legacy_batch":
+            name = groups[0].strip()
+            record.setdefault("test_name", LEGACY_TEST_NAMES.get(name, name))
+            record["duration_ms"] = _num(groups[1])
+            record["duration_min_ms"], record["duration_max_ms"] = _num(groups[2]), _num(groups[3])
+        elif key == "legacy_single":
+            record.setdefault("test_name", groups[0].strip())
+            record.setdefault("duration_ms", _num(groups[1]))
+        elif key == "legacy_mean":
+            record["duration_ms"] = _num(groups[0])
+        elif key == "legacy_std":
+            record["duration_std_ms"] = _num(groups[0])
+        elif key == "legacy_minmax":
+            record["duration_min_ms"], record["duration_max_ms"] = _num(groups[0]), _num(groups[1])
+        elif key == "legacy_samples":
+            notes.append(line.strip())
+            record.setdefault("iterations", len(groups[0].split(", ")))
+
+    if "duration_ms" not in record and "transfer_ms" not in record:
+        return None
+    if "test_name" not in record and "delegate" in record:
+        # mad_benchmark.txt: blocos com apenas `Delegate:` + estatísticas.
+        record["test_name"] = f"MAD Benchmark ({record['delegate']})"
+    if notes:
+        record["notes"] = " ".join(notes)
+    _fill_derived(record)
+    return record
+
+
+def iter_log_records(log_path: Path) -> Iterator[Dict[str, object]]:
+    with log_path.open(encoding="utf-8", errors="replace") as fp:
+        for stamp, body in iter_blocks(fp):
+            record = parse_block(stamp, body)
+            if record is not None:
+                record["source_csv"] = str(log_path)
+                yield record
+
+
+def _records_frame(
+    records: List[Dict[str, object]], label: Optional[str], campaign: str
+) -> pd.DataFrame:
+    df = pd.DataFrame.from_records(records)
+    df["device_model"] = label if label else fallback_device_label(df)
+    df["campaign"] = campaign
+    return reindex_columns(coerce_types(df), STORE_COLUMNS)
+
+
+def iter_log_chunks(
+    log_path: Path,
+    label: Optional[str] = None,
+    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+    defaults: Optional[Dict[str, object]] = None,
+) -> Iterator[pd.DataFrame]:
+    """Entrega o log em DataFrames tipados de até `chunk_rows` blocos.
+
+    `defaults` completa campos ausentes (ex.: metadados do aparelho nos logs por cenário).
+    """
+    campaign = log_path.parent.name
+    records: List[Dict[str, object]] = []
+    for record in iter_log_records(log_path):
+        if defaults:
+            for key, value in defaults.items():
+                record.setdefault(key, value)
+        records.append(record)
+        if len(records) >= chunk_rows:
+            yield _records_frame(records, label, campaign)
+            records = []
+    if records:
+        yield _records_frame(records, label, campaign)
+
+
+def device_defaults(campaign_dir: Path) -> Dict[str, object]:
+    """Metadados do aparelho lidos do primeiro bloco de benchmark_results.txt (se houver)."""
+    summary = campaign_dir / "benchmark_results.txt"
+    if not summary.exists():
+        return {}
+    keys = ["manufacturer", "model", "hardware", "board", "soc", "sdk_int", "power_save"]
+    for record in iter_log_records(summary):
+        if "model" in record:
+            return {k: record[k] for k in keys if k in record}
+    return {}
+
+
+def campaign_logs(campaign_dir: Path) -> List[Path]:
+    return sorted(
+        p for p in campaign_dir.glob("*.txt") if p.name not in AGGREGATE_LOGS
+    )
+
+
+def drop_duplicate_runs(df: pd.DataFrame) -> pd.DataFrame:
+    """Uma linha por execução quando o resumo e os logs por cenário são lidos juntos.
+
+    A chave é (timestamp em segundos, test_name, device_model): o resumo só tem
+    segundos e os logs por cenário legacy não trazem `input_size`. Cada coluna fica
+    com o primeiro valor não nulo, vindo antes do log por cenário (milissegundos)
+    e depois do resumo (tamanho e metadados do aparelho).
+    """
+    from_summary = df["source_csv"].astype("string").str.endswith(SUMMARY_LOG).fillna(False)
+    df = df.iloc[np.argsort(from_summary.to_numpy(), kind="stable")]
+    keys = [(df[column] // 1000 if column == "timestamp" else df[column]).rename(f"_{column}")
+            for column in ("timestamp", "test_name", "device_model")]
+    runs = df.groupby(keys, sort=False, dropna=False).first().reset_index(drop=True)
+    return runs.sort_values("timestamp", kind="stable", ignore_index=True)
+
+
+def load_logs(paths: Iterable[Path], label: Optional[str] = None) -> pd.DataFrame:
+    frames = []
+    for path in paths:
+        defaults = device_defaults(path.parent)
+        frames.extend(iter_log_chunks(path, label, defaults=defaults))
+    if not frames:
+        return reindex_columns(pd.DataFrame(), STORE_COLUMNS)
+    return drop_duplicate_runs(pd.concat(frames, ignore_index=True))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Converte logs benchmark_results.txt/*_single.txt/*_batch.txt para o schema do store."
+    )
+    parser.add_argument("logs", nargs="*", help="Arquivos .txt a converter.")
+    parser.add_argument(
+        "--campaign-dir",
+        action="append",
+        default=[],
+        help="Pasta de campanha: converte todos os .txt (exceto benchmarks_report.txt).",
+    )
+    parser.add_argument("--label", help="Valor de device_model (padrão: modelo do aparelho).")
+    parser.add_argument("--output", required=True, help="Arquivo de saída (.csv ou .parquet).")
+    args = parser.parse_args()
+
+    paths = [Path(p) for p in args.logs]
+    for directory in args.campaign_dir:
+        paths.extend(campaign_logs(Path(directory)))
+    if not paths:
+        parser.error("informe ao menos um log ou --campaign-dir")
+
+    output_path = Path(args.output)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    total = 0
+    if output_path.suffix == ".parquet":
+        df = load_logs(paths, args.label)
+        df.to_parquet(output_path, index=False)
+        total = len(df)
+    else:
+        with output_path.open("w", newline="") as out:
+            pd.DataFrame(columns=STORE_COLUMNS).to_csv(out, index=False)
+            # Uma campanha por vez: o resumo só é deduplicado contra os logs da mesma pasta.
+            campaigns: Dict[Path, List[Path]] = {}
+            for path in paths:
+                campaigns.setdefault(path.parent, []).append(path)
+            for campaign_paths in campaigns.values():
+                df = load_logs(campaign_paths, args.label)
+                df.to_csv(out, header=False, index=False)
+                total += len(df)
+    print(f"{total} registros de {len(paths)} logs salvos em {output_path}")
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except Exception as exc:  # pragma: no cover
+        print(f"Erro: {exc}", file=sys.stderr)
+        sys.exit(1)
@@ -0,0 +1,247 @@
+"""
+Normalizações compartilhadas pelos scripts de gráficos (todas vetorizadas).
+
+- `device_labels`: `device_model` → `deviceModel` → `deviceInfo` → `model` → "Dispositivo".
+- `normalize_delegates`: aliases (`cpu`, `gpu`, `nnapi`, ...) → CPU Kotlin / TFLite CPU/GPU/NNAPI;
+  com `test_names`, um teste "TFLite (CPU|GPU|NNAPI)" vence a coluna `delegate`
+  (campanhas antigas gravam `delegate=CPU` também no TFLite CPU).
+- `detect_algorithms`: MAD / FFT / Outro a partir de `test_name`.
+- `parse_data_description`: `"12×(10 sensores × 8192 amostras)"` → pacotes, sensores e
+  amostras por sensor.
+- `vector_lengths`: amostras por sensor de `data_description`; sem descrição,
+  `input_size / (batch_size × sensores)` com 10 sensores na FFT.
+- `throughput`: amostras/s e bytes/s a partir da layout de dados e do tempo medido.
+- `batch_flags`: batch por `batch_size > 1` ou pelo sufixo `x10` do teste.
+
+As funções de texto trabalham sobre as categorias (uma vez por valor distinto) e
+devolvem `category`. `normalize_frame` acrescenta todas as colunas de uma vez e
+marca o DataFrame em `df.attrs`, então chamadas repetidas sobre o mesmo frame
+carregado não refazem o trabalho.
+"""
+
+from __future__ import annotations
+
+from typing import Callable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+ALGORITHMS = ["MAD", "FFT"]
+DELEGATES = ["CPU Kotlin", "TFLite CPU", "TFLite GPU", "TFLite NNAPI"]
+TFLITE_DELEGATES = DELEGATES[1:]
+# Espelha BenchmarkExecutor.FFT_NUM_SENSORS; só usado quando data_description não existe.
+FFT_SENSORS = 10
+# Entradas dos modelos são float32.
+SAMPLE_BYTES = 4
+DEFAULT_DELEGATE = "CPU Kotlin"
+DEFAULT_DEVICE = "Dispositivo"
+DEVICE_COLUMNS = ["device_model", "deviceModel", "deviceInfo", "model"]
+DELEGATE_ALIASES = {
+    "cpu kotlin": "CPU Kotlin",
+    "kotlin cpu": "CPU Kotlin",
+    "kotlin": "CPU Kotlin",
+    "cpu": "CPU Kotlin",
+    "tflite cpu": "TFLite CPU",
+    "tflite gpu": "TFLite GPU",
+    "gpu": "TFLite GPU",
+    "tflite nnapi": "TFLite NNAPI",
+    "nnapi": "TFLite NNAPI",
+}
+DATA_DESCRIPTION_PATTERN = (
+    r"^\s*(?:(?P<packets>\d+)\s*[×xX]\s*\()?"
+    r"\s*(?P<sensors>\d+)\s*sensor(?:es)?\s*[×xX]\s*(?P<samples>\d+)\s*amostras\s*\)?\s*$"
+)
+LAYOUT_COLUMNS = ["packets", "sensors", "samples"]
+NORMALIZED_ATTR = "benchmark_normalize"
+
+
+def _text(series: pd.Series) -> pd.Series:
+    return series.astype("string").str.strip()
+
+
+def _map_categories(series: pd.Series, func: Callable[[pd.Series], pd.Series]) -> pd.Series:
+    """Aplica `func` (vetorizada) uma vez por valor distinto e devolve `category`."""
+    values = _categories(series)
+    codes = values.cat.codes.to_numpy()
+    # Última posição = resultado para valores ausentes (código -1).
+    lookup = pd.Series(list(values.cat.categories) + [pd.NA], dtype="string")
+    mapped = func(lookup).to_numpy(dtype=object)
+    return pd.Series(mapped[codes], index=series.index, name=series.name, dtype="category")
+
+
+def _categories(series: pd.Series) -> pd.Series:
+    return series if isinstance(series.dtype, pd.CategoricalDtype) else series.astype("category")
+
+
+def device_labels(df: pd.DataFrame) -> pd.Series:
+    """Primeiro valor não vazio entre DEVICE_COLUMNS, linha a linha."""
+    labels = pd.Series(pd.NA, index=df.index, dtype="string")
+    for column in DEVICE_COLUMNS:
+        if column in df.columns:
+            candidate = _text(df[column])
+            labels = labels.mask(labels.isna() | (labels == ""), candidate)
+    labels = labels.mask(labels.isna() | (labels == ""), DEFAULT_DEVICE)
+    return labels.astype("category")
+
+
+def _delegate_values(text: pd.Series) -> pd.Series:
+    text = text.str.strip()
+    normalized = text.str.lower().map(DELEGATE_ALIASES)
+    return normalized.fillna(text).mask(lambda s: s.isna() | (s == ""), DEFAULT_DELEGATE)
+
+
+def _test_delegate_values(text: pd.Series) -> pd.Series:
+    lower = text.fillna("").str.lower()
+    tflite = lower.str.contains("tflite", regex=False)
+    return pd.Series(
+        np.select(
+            [
+                tflite & lower.str.contains("nnapi", regex=False),
+                tflite & lower.str.contains("gpu", regex=False),
+                tflite & lower.str.contains("cpu", regex=False),
+            ],
+            ["TFLite NNAPI", "TFLite GPU", "TFLite CPU"],
+            default="",
+        ),
+        index=text.index,
+    ).replace("", pd.NA)
+
+
+def normalize_delegates(series: pd.Series, test_names: Optional[pd.Series] = None) -> pd.Series:
+    """Delegate normalizado; com `test_names`, o delegate TFLite nomeado no teste tem prioridade."""
+    delegates = _map_categories(series, _delegate_values)
+    if test_names is None:
+        return delegates
+    from_test = _map_categories(test_names, _test_delegate_values)
+    return from_test.astype(object).fillna(delegates.astype(object)).astype("category")
+
+
+def _algorithm_values(text: pd.Series) -> pd.Series:
+    upper = text.fillna("").str.upper()
+    return pd.Series(
+        np.select(
+            [upper.str.contains("MAD", regex=False), upper.str.contains("FFT", regex=False)],
+            ALGORITHMS,
+            default="Outro",
+        ),
+        index=text.index,
+    )
+
+
+def detect_algorithms(series: pd.Series) -> pd.Series:
+    return _map_categories(series, _algorithm_values)
+
+
+def parse_data_description(series: pd.Series) -> pd.DataFrame:
+    """`"P×(S sensores × N amostras)"` → colunas packets/sensors/samples (Int64).
+
+    O prefixo `P×(...)` é opcional (campanhas antigas gravam só `"S sensor × N amostras"`,
+    tratado como P=1); textos fora do formato viram <NA>.
+    """
+    values = _categories(series)
+    lookup = pd.Series(list(values.cat.categories), dtype="string")
+    parsed = lookup.str.extract(DATA_DESCRIPTION_PATTERN)
+    parsed = parsed.apply(pd.to_numeric).astype("Int64")
+    parsed.loc[parsed["sensors"].notna(), "packets"] = parsed["packets"].fillna(1)
+    # Última linha = valores ausentes (código -1).
+    parsed.loc[len(parsed)] = pd.NA
+    out = parsed.iloc[values.cat.codes.to_numpy()].reset_index(drop=True)
+    out.index = series.index
+    return out[LAYOUT_COLUMNS]
+
+
+def data_layout(df: pd.DataFrame, algorithm: pd.Series) -> pd.DataFrame:
+    """Pacotes, sensores e amostras por sensor (int64) de cada linha.
+
+    Usa `data_description` quando presente; senão reconstrói a partir de
+    `input_size`, `batch_size` e FFT_SENSORS (o mesmo cálculo de antes).
+    """
+    size = pd.to_numeric(df["input_size"], errors="coerce").fillna(0).astype("float64")
+    if "batch_size" in df.columns:
+        batch = pd.to_numeric(df["batch_size"], errors="coerce").fillna(1).astype("float64")
+        batch = batch.where(batch > 0, 1.0)
+    else:
+        batch = pd.Series(1.0, index=df.index)
+    sensors = pd.Series(np.where(np.asarray(algorithm == "FFT"), FFT_SENSORS, 1), index=df.index)
+    samples = (size / (batch * sensors)).round()
+    if "data_description" in df.columns:
+        parsed = parse_data_description(df["data_description"]).astype("float64")
+        batch = parsed["packets"].fillna(batch)
+        sensors = parsed["sensors"].fillna(sensors)
+        samples = parsed["samples"].fillna(samples)
+    return pd.DataFrame(
+        {"packets": batch, "sensors": sensors, "samples": samples.clip(lower=0)},
+        index=df.index,
+    ).astype("int64")
+
+
+def vector_lengths(df: pd.DataFrame, algorithm: pd.Series) -> pd.Series:
+    """Tamanho de um vetor (amostras por sensor)."""
+    return data_layout(df, algorithm)["samples"].rename("vector_length")
+
+
+def throughput(df: pd.DataFrame, metric: str = "duration_ms") -> pd.DataFrame:
+    """Amostras/s e bytes/s (float32) processados em `metric`, somando pacotes e sensores.
+
+    Espera as colunas de `normalize_frame` (packets, sensors, vector_length).
+    """
+    total = df["packets"].astype("float64") * df["sensors"] * df["vector_length"]
+    seconds = pd.to_numeric(df[metric], errors="coerce").astype("float64") / 1000.0
+    samples_per_s = (total / seconds.where(seconds > 0)).rename("samples_per_s")
+    return pd.DataFrame(
+        {"samples_per_s": samples_per_s, "bytes_per_s": samples_per_s * SAMPLE_BYTES},
+        index=df.index,
+    )
+
+
+def batch_flags(df: pd.DataFrame, by: str = "batch_size") -> pd.Series:
+    """`by="batch_size"`: batch_size > 1; `by="test_name"`: testes `x10`.
+
+    Sem a coluna (ex.: CSV legacy de 17 colunas), toda linha conta como batch 1.
+    """
+    if by not in df.columns:
+        return pd.Series(False, index=df.index, dtype=bool)
+    if by == "test_name":
+        return df["test_name"].astype("string").str.contains("x10", case=False, na=False).astype(bool)
+    batch = pd.to_numeric(df[by], errors="coerce").fillna(1)
+    return (batch > 1).astype(bool)
+
+
+def normalize_frame(df: pd.DataFrame, batch_by: str = "batch_size") -> pd.DataFrame:
+    """Acrescenta device_model, delegate_norm, algorithm, packets, sensors,
+    vector_length e is_batch.
+
+    O resultado fica marcado em `attrs`; repetir a chamada com o mesmo `batch_by`
+    devolve o próprio frame, e com outro `batch_by` só `is_batch` é recalculado
+    (um frame carregado uma vez serve a todos os scripts de gráficos).
+    """
+    normalized = df.attrs.get(NORMALIZED_ATTR)
+    if normalized == batch_by:
+        return df
+    df = df.copy()
+    if normalized is None:
+        df["device_model"] = device_labels(df)
+        delegate = df["delegate"] if "delegate" in df.columns else pd.Series(pd.NA, index=df.index, dtype="string")
+        df["delegate_norm"] = normalize_delegates(delegate, df["test_name"])
+        df["algorithm"] = detect_algorithms(df["test_name"])
+        layout = data_layout(df, df["algorithm"])
+        df["packets"] = layout["packets"]
+        df["sensors"] = layout["sensors"]
+        df["vector_length"] = layout["samples"]
+    df["is_batch"] = batch_flags(df, batch_by)
+    df.attrs[NORMALIZED_ATTR] = batch_by
+    return df
+
+
+def filter_known(
+    df: pd.DataFrame,
+    algorithms: List[str] = ALGORITHMS,
+    delegates: List[str] = DELEGATES,
+) -> pd.DataFrame:
+    """Mantém só algoritmos/delegates conhecidos e vetores com tamanho > 0."""
+    mask = (
+        df["algorithm"].isin(algorithms)
+        & df["delegate_norm"].isin(delegates)
+        & (df["vector_length"] > 0)
+    )
+    return df[mask]
@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+Extrai as amostras por iteração embutidas na coluna `notes` dos benchmarks.
+
+O `BenchmarkExecutor` grava cada iteração como `Tempos: T=0,57ms/P=0,13ms, ...`
+(vírgula decimal, locale do aparelho); os CSVs legacy de 17 colunas trazem apenas
+`Execuções: 10.911094, 10.754531, ...` (ponto decimal, tempo total). Ambos os
+formatos são convertidos em uma tabela longa com uma linha por iteração:
+
+| row_id | iteration | transfer_ms | compute_ms | duration_ms |
+
+`row_id` é o índice da linha de origem; `iteration` começa em 1. A extração usa
+`str.extractall` em uma única passada (sem loops por linha).
+
+Com `--summary`, as amostras são agregadas por célula (dispositivo, algoritmo,
+delegate, modo, tamanho; mais a campanha no store) com `benchmark_stats.tail_summary`:
+p50/p90/p95/p99, IQR e média aparada de `duration_ms`, `transfer_ms` e `compute_ms`.
+
+Exemplo:
+
+```bash
+python3 benchmark_notes.py --csv app/src/BANCHMARK/comparativo-09-12/benchmark_results.csv \
+  --output app/src/BANCHMARK/comparativo-09-12/iteration_samples.csv
+python3 benchmark_notes.py --csv app/src/BANCHMARK/.store --summary --output /tmp/tail_latency.csv
+```
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+from typing import List, Optional, Sequence
+
+import pandas as pd
+
+from benchmark_normalize import filter_known, normalize_frame
+from benchmark_stats import tail_summary
+from benchmark_store import load_benchmarks
+
+NUMBER = r"\d+(?:[.,]\d+)?"
+TIMING_PATTERN = rf"T=(?P<transfer_ms>{NUMBER})ms/P=(?P<compute_ms>{NUMBER})ms"
+LEGACY_RUNS_SEGMENT = r"(?:Execuções|Amostras):\s*(?P<runs>[^|]*)"
+LEGACY_RUN_VALUE = rf"(?P<duration_ms>{NUMBER})"
+
+SAMPLE_COLUMNS = ["row_id", "iteration", "transfer_ms", "compute_ms", "duration_ms"]
+DEFAULT_KEYS = [
+    "device_model",
+    "test_name",
+    "delegate",
+    "input_size",
+    "batch_size",
+    "data_description",
+]
+CELL_KEYS = ["device_model", "algorithm", "delegate_norm", "is_batch", "vector_length"]
+CELL_LOAD_COLUMNS = [
+    "campaign",
+    "device_model",
+    "deviceModel",
+    "deviceInfo",
+    "model",
+    "delegate",
+    "test_name",
+    "data_description",
+    "input_size",
+    "batch_size",
+]
+SAMPLE_METRICS = ["duration_ms", "transfer_ms", "compute_ms"]
+
+
+def _to_float(series: pd.Series) -> pd.Series:
+    """Aceita vírgula ou ponto como separador decimal."""
+    return pd.to_numeric(series.str.replace(",", ".", regex=False), errors="coerce")
+
+
+def _empty_samples() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "row_id": pd.Series(dtype="int64"),
+            "iteration": pd.Series(dtype="int64"),
+            "transfer_ms": pd.Series(dtype="float64"),
+            "compute_ms": pd.Series(dtype="float64"),
+            "duration_ms": pd.Series(dtype="float64"),
+        }
+    )
+
+
+def _from_matches(matches: pd.DataFrame) -> pd.DataFrame:
+    samples = matches.reset_index()
+    samples = samples.rename(columns={samples.columns[0]: "row_id"})
+    samples["iteration"] = samples["match"].astype("int64") + 1
+    return samples.drop(columns="match")
+
+
+def _timing_samples(notes: pd.Series) -> pd.DataFrame:
+    matches = notes.str.extractall(TIMING_PATTERN)
+    if matches.empty:
+        return _empty_samples()
+    samples = _from_matches(matches)
+    samples["transfer_ms"] = _to_float(samples["transfer_ms"])
+    samples["compute_ms"] = _to_float(samples["compute_ms"])
+    samples["duration_ms"] = samples["transfer_ms"] + samples["compute_ms"]
+    return samples[SAMPLE_COLUMNS]
+
+
+def _legacy_samples(notes: pd.Series) -> pd.DataFrame:
+    runs = notes.str.extract(LEGACY_RUNS_SEGMENT)["runs"].dropna()
+    if runs.empty:
+        return _empty_samples()
+    matches = runs.str.extractall(LEGACY_RUN_VALUE)
+    if matches.empty:
+        return _empty_samples()
+    samples = _from_matches(matches)
+    samples["duration_ms"] = _to_float(samples["duration_ms"])
+    samples["transfer_ms"] = float("nan")
+    samples["compute_ms"] = float("nan")
+    return samples[SAMPLE_COLUMNS]
+
+
+def explode_samples(
+    df: pd.DataFrame,
+    keys: Optional[Sequence[str]] = None,
+    notes_col: str = "notes",
+) -> pd.DataFrame:
+    """Converte `notes` em uma linha por iteração.
+
+    Linhas com `Tempos:` usam T/P; as demais caem no formato legacy
+    `Execuções:` (apenas `duration_ms`). `keys` anexa colunas da linha de origem.
+    """
+    if notes_col not in df.columns:
+        raise KeyError(f"Coluna '{notes_col}' ausente; carregue com include_notes=True.")
+    notes = df[notes_col].astype("string")
+    has_timing = notes.str.contains("T=", regex=False, na=False)
+    samples = pd.concat(
+        [_timing_samples(notes[has_timing]), _legacy_samples(notes[~has_timing])],
+        ignore_index=True,
+    )
+    samples = samples.sort_values(["row_id", "iteration"], kind="stable").reset_index(drop=True)
+    if keys:
+        available = [k for k in keys if k in df.columns]
+        samples = samples.join(df[available], on="row_id")
+    return samples
+
+
+def load_samples(
+    source: Path,
+    keys: Optional[Sequence[str]] = None,
+    *,
+    campaigns: Optional[List[str]] = None,
+) -> pd.DataFrame:
+    keys = list(keys) if keys is not None else DEFAULT_KEYS
+    df = load_benchmarks(source, keys, campaigns=campaigns, include_notes=True)
+    return explode_samples(df, keys)
+
+
+def load_cell_samples(source: Path, *, campaigns: Optional[List[str]] = None) -> pd.DataFrame:
+    """Amostras por iteração com as chaves normalizadas de `CELL_KEYS` (e `campaign`, se houver)."""
+    df = load_benchmarks(source, CELL_LOAD_COLUMNS, campaigns=campaigns, include_notes=True, compact=True)
+    df = filter_known(normalize_frame(df))
+    keys = (["campaign"] if "campaign" in df.columns else []) + CELL_KEYS
+    return explode_samples(df, keys)
+
+
+def summarize_samples(
+    samples: pd.DataFrame,
+    keys: Sequence[str],
+    metrics: Sequence[str] = SAMPLE_METRICS,
+) -> pd.DataFrame:
+    """`tail_summary` de cada métrica lado a lado (`duration_ms_p99`, `transfer_ms_iqr`, ...)."""
+    keys = list(keys)
+    table: Optional[pd.DataFrame] = None
+    for metric in metrics:
+        stats = tail_summary(samples, keys, metric)
+        stats = stats.rename(columns={c: f"{metric}_{c}" for c in stats.columns if c not in keys})
+        # Legacy (só duração) não tem T/P: as células ficam com NaN nessas colunas.
+        table = stats if table is None else table.merge(stats, on=keys, how="left")
+    for metric in metrics:
+        table[f"{metric}_n"] = table[f"{metric}_n"].astype("Int64")
+    return table
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Extrai as amostras por iteração (T/P) da coluna notes em formato longo."
+    )
+    parser.add_argument(
+        "--csv",
+        required=True,
+        help="Caminho para benchmark_results.csv ou diretório do store colunar.",
+    )
+    parser.add_argument(
+        "--campaign",
+        action="append",
+        help="Filtra campanhas do store colunar (nome da pasta). Pode ser repetido.",
+    )
+    parser.add_argument(
+        "--output",
+        required=True,
+        help="Arquivo de saída (.csv ou .parquet).",
+    )
+    parser.add_argument(
+        "--summary",
+        action="store_true",
+        help="Grava percentis (p50/p90/p95/p99), IQR e média aparada por célula em vez das amostras.",
+    )
+    args = parser.parse_args()
+
+    if args.summary:
+        samples = load_cell_samples(Path(args.csv), campaigns=args.campaign)
+        keys = [c for c in ["campaign"] + CELL_KEYS if c in samples.columns]
+        table = summarize_samples(samples, keys)
+    else:
+        table = samples = load_samples(Path(args.csv), campaigns=args.campaign)
+    output_path = Path(args.output)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    if output_path.suffix == ".parquet":
+        table.to_parquet(output_path, index=False)
+    else:
+        table.to_csv(output_path, index=False)
+    if args.summary:
+        print(f"{len(table)} células ({len(samples)} amostras) salvas em {output_path}")
+    else:
+        print(f"{len(samples)} amostras de {samples['row_id'].nunique()} linhas salvas em {output_path}")
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except Exception as exc:  # pragma: no cover
+        print(f"Erro: {exc}", file=sys.stderr)
+        sys.exit(1)
@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""
+Detecta regressões (e melhoras) de latência entre campanhas do mesmo aparelho.
+
+As campanhas repetidas (meu-s21-27-11 → 28-11 → 30-11 → s21-08-12 → s21-09-12;
+motog-84-30-11 → motog84-09-12) medem as mesmas células, mas nada dizia se um
+delegate ficou mais lento entre elas. Aqui as células são alinhadas por
+família do aparelho (`model` do Android, igual em todas as campanhas mesmo
+quando `device_model` traz a data), algoritmo, delegate, modo, pacotes do batch
+e tamanho, e cada par de campanhas é comparado nas amostras por iteração de
+`notes`:
+
+1. `benchmark_stats.mann_whitney` testa todas as células de todos os pares de
+   uma vez (uma ordenação global, sem laço por célula); os p-valores são
+   corrigidos por Benjamini-Hochberg (`q_value`) porque centenas de células
+   são testadas juntas;
+2. tamanho do efeito: variação da mediana (`change`, candidata/base − 1) e
+   rank-biserial (`effect`, > 0 quando a candidata é mais lenta);
+3. `status`: `regressão`/`melhora` quando q ≤ `--alpha`, |change| ≥
+   `--min-change` e |effect| ≥ `--min-effect`; senão `estável`.
+
+As campanhas consolidadas reaproveitam CSVs anteriores (motog84-09-12 contém as
+execuções de 30-11); execuções da candidata que já estão na base (mesmo
+timestamp) saem da comparação, senão a mudança é diluída.
+
+O relatório lista as regressões e melhoras ordenadas por `change`. Com mais de
+`--max-regressions` regressões o script sai com código 3, para travar upgrades
+de modelo/TFLite em CI:
+
+```bash
+python3 benchmark_regression.py --csv app/src/BANCHMARK/.store \
+  --campaign meu-s21-27-11 --campaign meu-s21-28-11 --campaign meu-s21-30-11 \
+  --campaign s21-08-12 --campaign s21-09-12 --output /tmp/regressions.csv
+python3 benchmark_regression.py --csv app/src/BANCHMARK/.store \
+  --campaign motog-84-30-11 --campaign motog84-09-12 --steady-state
+```
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+from typing import List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from benchmark_normalize import filter_known, normalize_frame
+from benchmark_notes import CELL_KEYS, CELL_LOAD_COLUMNS, SAMPLE_METRICS, explode_samples
+from benchmark_stats import benjamini_hochberg, mann_whitney, tail_summary
+from benchmark_store import load_benchmarks
+from benchmark_warmup import steady_samples
+
+LOAD_COLUMNS = CELL_LOAD_COLUMNS + ["timestamp"]
+# Células de CELL_KEYS sem o rótulo por campanha, mais os pacotes do batch
+# (4 em 08-12, 12 em 09-12: outra carga, não regressão).
+CELL_COLUMNS = CELL_KEYS[1:] + ["packets"]
+COMPARE_KEYS = ["device_family"] + CELL_COLUMNS
+PAIR_KEYS = ["device_family", "baseline", "candidate"]
+REFERENCES = ["previous", "first"]
+DEFAULT_METRIC = "duration_ms"
+DEFAULT_ALPHA = 0.01
+DEFAULT_MIN_CHANGE = 0.10
+DEFAULT_MIN_EFFECT = 0.3
+REGRESSION_EXIT_CODE = 3
+STATUS_REGRESSION = "regressão"
+STATUS_IMPROVEMENT = "melhora"
+STATUS_STABLE = "estável"
+
+
+def device_families(df: pd.DataFrame) -> pd.Series:
+    """`model` do aparelho (ex.: SM-G991B); sem ele, o rótulo `device_model`."""
+    family = df["device_model"].astype("string")
+    if "model" in df.columns:
+        family = df["model"].astype("string").str.strip().replace("", pd.NA).fillna(family)
+    return family.astype("category").rename("device_family")
+
+
+def load_campaign_samples(source: Path, campaigns: Optional[List[str]] = None) -> pd.DataFrame:
+    """Amostras por iteração com campaign, device_family, timestamp e as chaves das células."""
+    df = load_benchmarks(source, LOAD_COLUMNS, campaigns=campaigns, include_notes=True, compact=True)
+    if "campaign" not in df.columns:
+        raise ValueError("A comparação precisa da coluna campaign; use o store colunar (benchmark_store.py).")
+    df = filter_known(normalize_frame(df))
+    df = df.assign(device_family=device_families(df))
+    return explode_samples(df, ["campaign", "timestamp"] + COMPARE_KEYS)
+
+
+def campaign_order(samples: pd.DataFrame, campaigns: Optional[Sequence[str]] = None) -> List[str]:
+    """Ordem cronológica: a de `--campaign` ou, sem ela, pela execução mais recente de cada campanha."""
+    present = set(samples["campaign"].astype(str))
+    if campaigns:
+        return [c for c in dict.fromkeys(campaigns) if c in present]
+    latest = samples.groupby("campaign", observed=True)["timestamp"].max().sort_values(kind="stable")
+    return [str(c) for c in latest.index]
+
+
+def campaign_pairs(samples: pd.DataFrame, order: Sequence[str], reference: str = "previous") -> pd.DataFrame:
+    """Pares (família, base, candidata) entre campanhas consecutivas ou contra a primeira.
+
+    Campanhas que só repetem execuções de campanhas anteriores da mesma família
+    (comparativo-*, merge-*) ficam de fora: não trazem medição nova.
+    """
+    rank = {campaign: i for i, campaign in enumerate(order)}
+    runs = samples[["device_family", "campaign", "timestamp"]].drop_duplicates()
+    runs = runs.astype({"device_family": str, "campaign": str})
+    runs = runs[runs["campaign"].isin(rank)]
+    runs = runs.assign(rank=runs["campaign"].map(rank))
+    first_seen = runs.groupby(["device_family", "timestamp"], dropna=False)["rank"].transform("min")
+    present = runs[runs["rank"] == first_seen][["device_family", "campaign", "rank"]].drop_duplicates()
+    present = present.sort_values(["device_family", "rank"])
+    first = present.groupby("device_family")["campaign"].transform("first")
+    previous = present.groupby("device_family")["campaign"].shift()
+    present["baseline"] = first if reference == "first" else previous
+    pairs = present[present["baseline"].notna() & (present["baseline"] != present["campaign"])]
+    return pairs.rename(columns={"campaign": "candidate"})[PAIR_KEYS].reset_index(drop=True)
+
+
+def align_pairs(samples: pd.DataFrame, pairs: pd.DataFrame, metric: str = DEFAULT_METRIC) -> pd.DataFrame:
+    """Amostras de cada par com `side` (0 = base, 1 = candidata), sem execuções repetidas na candidata."""
+    data = samples.dropna(subset=[metric]).assign(
+        device_family=samples["device_family"].astype(str), campaign=samples["campaign"].astype(str)
+    )
+    sides = []
+    for side, column in enumerate(["baseline", "candidate"]):
+        part = pairs.merge(data, left_on=["device_family", column], right_on=["device_family", "campaign"])
+        sides.append(part.assign(side=side))
+    aligned = pd.concat(sides, ignore_index=True).drop(columns="campaign")
+    # A mesma execução (timestamp) nos dois lados: campanha consolidada reusando a base.
+    run_keys = PAIR_KEYS + CELL_COLUMNS + ["timestamp"]
+    in_baseline = aligned.groupby(run_keys, observed=True, dropna=False)["side"].transform("min") == 0
+    return aligned[~(in_baseline & (aligned["side"] == 1))]
+
+
+def compare_campaigns(
+    samples: pd.DataFrame,
+    pairs: pd.DataFrame,
+    metric: str = DEFAULT_METRIC,
+    alpha: float = DEFAULT_ALPHA,
+    min_change: float = DEFAULT_MIN_CHANGE,
+    min_effect: float = DEFAULT_MIN_EFFECT,
+) -> pd.DataFrame:
+    """Uma linha por célula × par de campanhas com medianas, efeito, p/q-valor e `status`."""
+    keys = PAIR_KEYS + CELL_COLUMNS
+    aligned = align_pairs(samples, pairs, metric)
+    tests = mann_whitney(aligned, keys, "side", metric)
+    tests = tests[(tests["n_ref"] > 0) & (tests["n_other"] > 0)].reset_index(drop=True)
+
+    medians = tail_summary(aligned, keys + ["side"], metric, percentiles=(50,))
+    medians = medians.pivot_table(index=keys, columns="side", values="p50", observed=True)
+    medians = medians.rename(columns={0: "baseline_p50", 1: "candidate_p50"}).reset_index()
+    report = tests.merge(medians, on=keys, how="left").rename(
+        columns={"n_ref": "n_baseline", "n_other": "n_candidate"}
+    )
+    report["change"] = report["candidate_p50"] / report["baseline_p50"] - 1
+    report["q_value"] = benjamini_hochberg(report["p_value"].to_numpy())
+    significant = (
+        (report["q_value"] <= alpha)
+        & (report["change"].abs() >= min_change)
+        & (report["effect"].abs() >= min_effect)
+    )
+    report["status"] = np.select(
+        [significant & (report["change"] > 0), significant & (report["change"] < 0)],
+        [STATUS_REGRESSION, STATUS_IMPROVEMENT],
+        STATUS_STABLE,
+    )
+    columns = keys + [
+        "n_baseline",
+        "n_candidate",
+        "baseline_p50",
+        "candidate_p50",
+        "change",
+        "effect",
+        "z",
+        "p_value",
+        "q_value",
+        "status",
+    ]
+    return report[columns].sort_values("change", ascending=False, kind="stable").reset_index(drop=True)
+
+
+def print_report(report: pd.DataFrame, top: int) -> None:
+    columns = PAIR_KEYS + CELL_COLUMNS + ["baseline_p50", "candidate_p50", "change", "effect", "q_value"]
+    formats = {
+        "baseline_p50": "{:.3f}".format,
+        "candidate_p50": "{:.3f}".format,
+        "change": "{:+.1%}".format,
+        "effect": "{:+.2f}".format,
+        "q_value": "{:.1e}".format,
+    }
+    regressions = report[report["status"] == STATUS_REGRESSION]
+    improvements = report[report["status"] == STATUS_IMPROVEMENT].sort_values("change", kind="stable")
+    for title, rows in [("Regressões", regressions), ("Melhoras", improvements)]:
+        print(f"\n{title}: {len(rows)}")
+        if not rows.empty and top > 0:
+            print(rows[columns].head(top).to_string(index=False, formatters=formats))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Compara células entre campanhas (Mann-Whitney nas iterações) e relata regressões de latência."
+    )
+    parser.add_argument(
+        "--csv",
+        required=True,
+        help="Diretório do store colunar (precisa da coluna campaign).",
+    )
+    parser.add_argument(
+        "--campaign",
+        action="append",
+        help="Campanhas comparadas, em ordem cronológica. Pode ser repetido (padrão: todas, pela data).",
+    )
+    parser.add_argument(
+        "--reference",
+        choices=REFERENCES,
+        default="previous",
+        help="Base de cada campanha: a anterior da mesma família (padrão) ou a primeira.",
+    )
+    parser.add_argument(
+        "--metric",
+        choices=SAMPLE_METRICS,
+        default=DEFAULT_METRIC,
+        help=f"Métrica comparada (padrão: {DEFAULT_METRIC} = T+P).",
+    )
+    parser.add_argument(
+        "--alpha",
+        type=float,
+        default=DEFAULT_ALPHA,
+        help=f"q-valor máximo (Benjamini-Hochberg) para contar a mudança (padrão: {DEFAULT_ALPHA}).",
+    )
+    parser.add_argument(
+        "--min-change",
+        type=float,
+        default=DEFAULT_MIN_CHANGE,
+        help=f"Variação relativa mínima da mediana (padrão: {DEFAULT_MIN_CHANGE} = 10%%).",
+    )
+    parser.add_argument(
+        "--min-effect",
+        type=float,
+        default=DEFAULT_MIN_EFFECT,
+        help=f"|rank-biserial| mínimo (padrão: {DEFAULT_MIN_EFFECT}).",
+    )
+    parser.add_argument(
+        "--max-regressions",
+        type=int,
+        default=0,
+        help=f"Regressões toleradas antes de sair com código {REGRESSION_EXIT_CODE} (padrão: 0).",
+    )
+    parser.add_argument(
+        "--steady-state",
+        action="store_true",
+        help="Compara só as iterações depois do aquecimento (benchmark_warmup.py).",
+    )
+    parser.add_argument("--output", help="CSV com todas as células comparadas.")
+    parser.add_argument("--top", type=int, default=20, help="Linhas impressas por lista (padrão: 20).")
+    args = parser.parse_args()
+
+    samples = load_campaign_samples(Path(args.csv), args.campaign)
+    if args.steady_state:
+        samples = steady_samples(samples)
+    order = campaign_order(samples, args.campaign)
+    pairs = campaign_pairs(samples, order, args.reference)
+    if pairs.empty:
+        raise ValueError("Nenhum par de campanhas com a mesma família de aparelho para comparar.")
+    report = compare_campaigns(samples, pairs, args.metric, args.alpha, args.min_change, args.min_effect)
+
+    for pair in pairs.itertuples(index=False):
+        print(f"{pair.device_family}: {pair.baseline} → {pair.candidate}")
+    counts = report["status"].value_counts()
+    print(
+        f"{len(report)} células comparadas: {counts.get(STATUS_REGRESSION, 0)} regressões, "
+        f"{counts.get(STATUS_IMPROVEMENT, 0)} melhoras."
+    )
+    print_report(report, args.top)
+    if args.output:
+        Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+        report.to_csv(args.output, index=False)
+        print(f"Salvo em {args.output}")
+
+    regressions = int(counts.get(STATUS_REGRESSION, 0))
+    if regressions > args.max_regressions:
+        print(
+            f"{regressions} regressões acima do limite ({args.max_regressions}).",
+            file=sys.stderr,
+        )
+        sys.exit(REGRESSION_EXIT_CODE)
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except Exception as exc:
+        print(f"Erro: {exc}", file=sys.stderr)
+        sys.exit(1)
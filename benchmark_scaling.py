@@ -0,0 +1,350 @@
+#!/usr/bin/env python3
+"""
+Ajusta leis de escala da latência por dispositivo/delegate e prevê cruzamentos.
+
+Os benchmarks medem tamanhos discretos (512 … 524288 amostras por sensor), mas
+a pergunta de produção é contínua: a partir de que janela a TFLite GPU passa a
+vencer a TFLite CPU ou o CPU Kotlin neste SoC, e quanto custa um tamanho que
+não foi medido. Para cada grupo (campanha, dispositivo, algoritmo, delegate,
+modo, pacotes) e métrica (`transfer_ms`, `compute_ms` e `duration_ms`):
+
+    latência(N) = overhead + custo por amostra · N  (+ c · N·log2 N na FFT)
+
+1. as linhas viram médias por tamanho (cada tamanho pesa igual, por mais
+   execuções que tenha);
+2. mínimos quadrados relativos (peso 1/y², o erro de 0,5 ms não pesa igual em
+   1 ms e em 1 s) para todos os grupos de uma vez: as equações normais saem de
+   `np.bincount` por grupo e são resolvidas numa pilha `grupos × p × p`
+   (colunas escaladas para o condicionamento), sem laço por grupo. Os
+   coeficientes são restritos a ≥ 0 (overhead, custo por amostra e termo
+   N·log N negativos fariam a curva cair a ≤ 0 ms fora dos tamanhos medidos):
+   com p ≤ 3 cada subconjunto de coeficientes livres é resolvido na pilha e
+   fica a solução viável de menor erro, que é o ótimo do NNLS;
+3. resíduos relativos por tamanho (`rmse_pct`, `max_residual_pct`) dizem se o
+   modelo serve (tamanhos que estouram cache, por exemplo, aparecem aqui).
+
+Grupos com menos tamanhos distintos que parâmetros ficam sem ajuste.
+Cruzamentos: para cada par de delegates no mesmo contexto, o primeiro N em que
+as curvas ajustadas de `--metric` se cruzam (grade log + bisseção vetorizada),
+com o delegate vencedor abaixo/acima. Cruzamentos e `--predict` ficam dentro
+dos tamanhos medidos pelos grupos; `--extrapolate` procura em `CROSSOVER_RANGE`
+e prevê fora da faixa (`in_range` marca o que foi medido).
+
+Exemplo:
+
+```bash
+python3 benchmark_scaling.py --csv app/src/BANCHMARK/.store --campaign s21-09-12 \
+  --output /tmp/scaling_coefs.csv --crossover-output /tmp/crossovers.csv --predict 3000
+```
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+from typing import List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from benchmark_normalize import DELEGATES, filter_known, normalize_frame
+from benchmark_notes import CELL_LOAD_COLUMNS, SAMPLE_METRICS
+from benchmark_store import load_benchmarks
+from benchmark_warmup import add_steady_state_argument, exclude_warmup
+
+LOAD_COLUMNS = CELL_LOAD_COLUMNS + SAMPLE_METRICS
+GROUP_KEYS = ["device_model", "algorithm", "delegate_norm", "is_batch", "packets"]
+# Algoritmos com termo N·log2 N (a FFT); os demais são lineares em N.
+NLOGN_ALGORITHMS = ["FFT"]
+DEFAULT_METRIC = "duration_ms"
+# Faixa (amostras por sensor) dos cruzamentos com --extrapolate.
+CROSSOVER_RANGE = (64, 1 << 23)
+CROSSOVER_GRID = 512
+BISECTION_STEPS = 40
+COEFFICIENT_COLUMNS = ["overhead_ms", "per_sample_us", "nlogn_ns"]
+
+
+def size_means(df: pd.DataFrame, keys: Sequence[str], metrics: Sequence[str] = SAMPLE_METRICS) -> pd.DataFrame:
+    """Média de cada métrica por grupo e tamanho (`vector_length`), com o número de linhas."""
+    grouped = df.groupby(list(keys) + ["vector_length"], observed=True, sort=True)
+    points = grouped[[m for m in metrics if m in df.columns]].mean().astype("float64")
+    points["rows"] = grouped.size()
+    return points.reset_index()
+
+
+def _design(sizes: np.ndarray, nlogn: np.ndarray) -> np.ndarray:
+    """Colunas [1, N, N·log2 N] (a última zerada fora da FFT)."""
+    n = sizes.astype("float64")
+    return np.column_stack([np.ones_like(n), n, np.where(nlogn, n * np.log2(n), 0.0)])
+
+
+def _nonnegative_solve(normal: np.ndarray, rhs: np.ndarray) -> np.ndarray:
+    """Mínimo de cᵀAc − 2bᵀc com c ≥ 0 para uma pilha de equações normais (A, b).
+
+    Enumera os subconjuntos de coeficientes livres (2^p, p ≤ 3), resolve cada um
+    com os demais fixos em zero e escolhe a solução viável de menor objetivo.
+    """
+    groups, params = rhs.shape
+    best = np.zeros((groups, params))
+    best_objective = np.zeros(groups)
+    for mask in range(1, 1 << params):
+        free = np.array([(mask >> j) & 1 for j in range(params)], dtype=bool)
+        system = np.where(free[:, None] & free[None, :], normal, np.diag((~free).astype("float64")))
+        with np.errstate(all="ignore"):
+            solution = np.linalg.solve(system, np.where(free, rhs, 0.0)[..., None])[..., 0]
+            objective = np.einsum("gi,gij,gj->g", solution, normal, solution) - 2 * (rhs * solution).sum(axis=1)
+        better = (solution >= 0).all(axis=1) & (objective < best_objective) & np.isfinite(objective)
+        best[better], best_objective[better] = solution[better], objective[better]
+    return best
+
+
+def fit_scaling(points: pd.DataFrame, keys: Sequence[str], value: str) -> pd.DataFrame:
+    """Ajusta `value` ~ overhead + a·N (+ b·N·log2 N), coeficientes ≥ 0, em todos os grupos de `keys`.
+
+    Retorna keys, metric, sizes, min_size, max_size, overhead_ms, per_sample_us,
+    nlogn_ns, rmse_pct e max_residual_pct; coeficientes NaN quando o grupo tem
+    menos tamanhos que parâmetros.
+    """
+    keys = list(keys)
+    data = points[points[value] > 0].dropna(subset=[value])
+    grouped = data.groupby(keys, observed=True, sort=True)
+    group = grouped.ngroup().to_numpy()
+    groups = grouped.ngroups
+    out = grouped.size().index.to_frame(index=False) if groups else pd.DataFrame(columns=keys)
+    out["metric"] = value
+    if not groups:
+        return out.assign(**{c: pd.Series(dtype="float64") for c in COEFFICIENT_COLUMNS})
+
+    nlogn_group = out["algorithm"].isin(NLOGN_ALGORITHMS).to_numpy()
+    sizes = data["vector_length"].to_numpy()
+    y = data[value].to_numpy(dtype="float64")
+    design = _design(sizes, nlogn_group[group])
+    # Escala por coluna: N·log2 N chega a ~10⁷ e deixaria XᵀWX mal condicionada.
+    scale = np.where(design.max(axis=0) > 0, design.max(axis=0), 1.0)
+    x = design / scale
+    weight = 1 / y**2
+    params = design.shape[1]
+    normal = np.zeros((groups, params, params))
+    rhs = np.zeros((groups, params))
+    for j in range(params):
+        rhs[:, j] = np.bincount(group, weights=weight * x[:, j] * y, minlength=groups)
+        for k in range(j, params):
+            products = np.bincount(group, weights=weight * x[:, j] * x[:, k], minlength=groups)
+            normal[:, j, k] = normal[:, k, j] = products
+    # Sem o termo N·log2 N a última equação vira coef = 0.
+    normal[~nlogn_group, 2, 2] = 1.0
+    rhs[~nlogn_group, 2] = 0.0
+
+    distinct = grouped["vector_length"].nunique().to_numpy()
+    fitted = distinct >= np.where(nlogn_group, 3, 2)
+    coef = np.full((groups, params), np.nan)
+    if fitted.any():
+        coef[fitted] = _nonnegative_solve(normal[fitted], rhs[fitted]) / scale
+
+    relative = (y - (design * coef[group]).sum(axis=1)) / y
+    counts = np.bincount(group, minlength=groups)
+    out["sizes"] = distinct
+    out["min_size"] = grouped["vector_length"].min().to_numpy()
+    out["max_size"] = grouped["vector_length"].max().to_numpy()
+    out["overhead_ms"] = coef[:, 0]
+    out["per_sample_us"] = coef[:, 1] * 1e3
+    out["nlogn_ns"] = np.where(nlogn_group, coef[:, 2] * 1e6, np.nan)
+    out["rmse_pct"] = np.sqrt(np.bincount(group, weights=relative**2, minlength=groups) / counts) * 100
+    out["max_residual_pct"] = (
+        pd.Series(np.abs(relative)).groupby(group).max().reindex(range(groups)).to_numpy() * 100
+    )
+    return out
+
+
+def _curve(overhead: np.ndarray, per_sample_us: np.ndarray, nlogn_ns: np.ndarray, n: np.ndarray) -> np.ndarray:
+    return overhead + per_sample_us / 1e3 * n + np.nan_to_num(nlogn_ns) / 1e6 * n * np.log2(n)
+
+
+def _columns(coefficients: pd.DataFrame) -> List[np.ndarray]:
+    return [coefficients[c].to_numpy(dtype="float64")[:, None] for c in COEFFICIENT_COLUMNS]
+
+
+def predict(coefficients: pd.DataFrame, sizes: Sequence[float], extrapolate: bool = False) -> np.ndarray:
+    """Latência prevista (ms), matriz grupos × `sizes`; NaN fora dos tamanhos medidos sem `extrapolate`."""
+    n = np.asarray(sizes, dtype="float64")[None, :]
+    predicted = _curve(*_columns(coefficients), n)
+    if extrapolate:
+        return predicted
+    low = coefficients["min_size"].to_numpy(dtype="float64")[:, None]
+    high = coefficients["max_size"].to_numpy(dtype="float64")[:, None]
+    return np.where((n >= low) & (n <= high), predicted, np.nan)
+
+
+def residual_table(points: pd.DataFrame, coefficients: pd.DataFrame, keys: Sequence[str]) -> pd.DataFrame:
+    """Observado × previsto por grupo, métrica e tamanho (resíduo relativo em %)."""
+    tables = []
+    for metric, coefs in coefficients.groupby("metric", sort=False):
+        merged = points.merge(coefs, on=list(keys), how="inner").dropna(subset=[metric, "overhead_ms"])
+        observed = merged[metric].to_numpy()
+        n = merged["vector_length"].to_numpy(dtype="float64")
+        predicted = _curve(*[col[:, 0] for col in _columns(merged)], n)
+        tables.append(
+            merged[list(keys) + ["metric", "vector_length", "rows"]].assign(
+                observed_ms=observed,
+                predicted_ms=predicted,
+                residual_pct=(observed - predicted) / observed * 100,
+            )
+        )
+    return pd.concat(tables, ignore_index=True) if tables else pd.DataFrame()
+
+
+def crossovers(
+    coefficients: pd.DataFrame, keys: Sequence[str], by: str = "delegate_norm", extrapolate: bool = False
+) -> pd.DataFrame:
+    """Primeiro cruzamento das curvas de cada par de `by` no mesmo contexto (keys sem `by`).
+
+    A diferença entre as curvas é avaliada numa grade log para todos os pares: entre
+    os tamanhos medidos pelos dois grupos ou, com `extrapolate`, em `CROSSOVER_RANGE`;
+    a primeira troca de sinal é refinada por bisseção (em log N). Retorna contexto,
+    delegate_a, delegate_b, crossover_n (NaN sem cruzamento na faixa), faster_below,
+    faster_above e in_range (dentro dos tamanhos medidos).
+    """
+    context = [k for k in keys if k != by] + ["metric"]
+    fitted = coefficients.dropna(subset=["overhead_ms"])
+    order = {delegate: i for i, delegate in enumerate(DELEGATES)}
+    fitted = fitted.assign(_order=fitted[by].astype(str).map(order).fillna(len(order)))
+    pairs = fitted.merge(fitted, on=context, suffixes=("_a", "_b"))
+    pairs = pairs[pairs["_order_a"] < pairs["_order_b"]].reset_index(drop=True)
+    columns = context + ["delegate_a", "delegate_b", "crossover_n", "faster_below", "faster_above", "in_range"]
+    if pairs.empty:
+        return pd.DataFrame(columns=columns)
+
+    side_a = [pairs[f"{c}_a"].to_numpy(dtype="float64")[:, None] for c in COEFFICIENT_COLUMNS]
+    side_b = [pairs[f"{c}_b"].to_numpy(dtype="float64")[:, None] for c in COEFFICIENT_COLUMNS]
+
+    def gap(n: np.ndarray) -> np.ndarray:
+        return _curve(*side_a, n) - _curve(*side_b, n)
+
+    tested_min = np.maximum(pairs["min_size_a"], pairs["min_size_b"]).to_numpy(dtype="float64")
+    tested_max = np.minimum(pairs["max_size_a"], pairs["max_size_b"]).to_numpy(dtype="float64")
+    if extrapolate:
+        log_low = np.full(len(pairs), np.log2(CROSSOVER_RANGE[0]))
+        log_high = np.full(len(pairs), np.log2(CROSSOVER_RANGE[1]))
+    else:
+        # Sem tamanhos medidos em comum a faixa fica vazia e o par, sem cruzamento.
+        log_low, log_high = np.log2(tested_min), np.log2(np.maximum(tested_max, tested_min))
+    grid = log_low[:, None] + (log_high - log_low)[:, None] * np.linspace(0, 1, CROSSOVER_GRID)[None, :]
+    rows = np.arange(len(pairs))
+    sign = np.sign(gap(np.exp2(grid)))
+    change = (sign[:, 1:] * sign[:, :-1]) < 0
+    found = change.any(axis=1)
+    first = np.argmax(change, axis=1)
+    low, high = grid[rows, first][:, None], grid[rows, first + 1][:, None]
+    low_sign = sign[rows, first][:, None]
+    for _ in range(BISECTION_STEPS):
+        middle = (low + high) / 2
+        same = np.sign(gap(np.exp2(middle))) == low_sign
+        low, high = np.where(same, middle, low), np.where(same, high, middle)
+    crossing = np.where(found, np.exp2((low[:, 0] + high[:, 0]) / 2), np.nan)
+
+    # Sinal antes do cruzamento (ou em toda a faixa, sem cruzamento): > 0 = b mais rápido.
+    below = np.where(found, low_sign[:, 0], sign[:, 0])
+    out = pairs[context].copy()
+    out["delegate_a"] = pairs[f"{by}_a"].astype(str).to_numpy()
+    out["delegate_b"] = pairs[f"{by}_b"].astype(str).to_numpy()
+    out["crossover_n"] = np.round(crossing)
+    out["faster_below"] = np.where(below > 0, out["delegate_b"], out["delegate_a"])
+    above = np.where(below > 0, out["delegate_a"], out["delegate_b"])
+    out["faster_above"] = np.where(found, above, out["faster_below"])
+    out["in_range"] = found & (crossing >= tested_min) & (crossing <= tested_max)
+    return out[columns]
+
+
+def load_rows(source: Path, campaigns: Optional[List[str]] = None, steady_state: bool = False) -> pd.DataFrame:
+    df = load_benchmarks(source, LOAD_COLUMNS, campaigns=campaigns, include_notes=steady_state, compact=True)
+    if steady_state:
+        df = exclude_warmup(df)
+        print(f"Aquecimento excluído das médias em {df.attrs['warmup_rows']} execuções.")
+    return filter_known(normalize_frame(df))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Ajusta latência(N) = overhead + custo por amostra (+ N·log N na FFT) e prevê cruzamentos."
+    )
+    parser.add_argument(
+        "--csv",
+        required=True,
+        help="Caminho para benchmark_results.csv ou diretório do store colunar.",
+    )
+    parser.add_argument(
+        "--campaign",
+        action="append",
+        help="Filtra campanhas do store colunar (nome da pasta). Pode ser repetido.",
+    )
+    parser.add_argument(
+        "--metric",
+        choices=SAMPLE_METRICS,
+        default=DEFAULT_METRIC,
+        help=f"Métrica dos cruzamentos (padrão: {DEFAULT_METRIC} = T+P).",
+    )
+    parser.add_argument(
+        "--predict",
+        type=int,
+        action="append",
+        metavar="N",
+        help="Tamanho (amostras por sensor) para prever a latência. Pode ser repetido.",
+    )
+    parser.add_argument(
+        "--extrapolate",
+        action="store_true",
+        help="Prevê e procura cruzamentos fora dos tamanhos medidos (padrão: só dentro da faixa medida).",
+    )
+    parser.add_argument("--output", help="CSV com os coeficientes por grupo e métrica.")
+    parser.add_argument("--residuals-output", help="CSV com observado × previsto por tamanho.")
+    parser.add_argument("--crossover-output", help="CSV com os cruzamentos entre delegates.")
+    add_steady_state_argument(
+        parser,
+        help="Exclui as iterações de aquecimento (benchmark_warmup.py) das médias por tamanho antes do "
+        "ajuste; muda coeficientes, previsões e cruzamentos. Lê `notes`.",
+    )
+    args = parser.parse_args()
+
+    df = load_rows(Path(args.csv), args.campaign, args.steady_state)
+    keys = (["campaign"] if "campaign" in df.columns else []) + GROUP_KEYS
+    points = size_means(df, keys)
+    metrics = [m for m in SAMPLE_METRICS if m in points.columns]
+    coefficients = pd.concat([fit_scaling(points, keys, m) for m in metrics], ignore_index=True)
+    for size in args.predict or []:
+        coefficients[f"at_{size}_ms"] = predict(coefficients, [size], args.extrapolate)[:, 0]
+    crossings = crossovers(coefficients[coefficients["metric"] == args.metric], keys, extrapolate=args.extrapolate)
+
+    fitted = coefficients.dropna(subset=["overhead_ms"])
+    print(
+        f"{len(fitted)} de {len(coefficients)} curvas ajustadas "
+        f"(RMSE relativo mediano: {fitted['rmse_pct'].median():.1f}%)."
+    )
+    found = crossings.dropna(subset=["crossover_n"])
+    print(f"\nCruzamentos em {args.metric}: {len(found)} de {len(crossings)} pares")
+    if not found.empty:
+        print(found.drop(columns="metric").to_string(index=False, float_format=lambda v: f"{v:.0f}"))
+    if args.predict:
+        shown = keys + [f"at_{size}_ms" for size in args.predict]
+        scope = "" if args.extrapolate else "; NaN fora dos tamanhos medidos, veja --extrapolate"
+        print(f"\nPrevisão de {args.metric} (ms{scope}):")
+        table = fitted[fitted["metric"] == args.metric][shown]
+        print(table.to_string(index=False, float_format=lambda v: f"{v:.3f}"))
+    outputs = [
+        (args.output, lambda: coefficients),
+        (args.residuals_output, lambda: residual_table(points, coefficients, keys)),
+        (args.crossover_output, lambda: crossings),
+    ]
+    for path, table in outputs:
+        if path:
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+            table().to_csv(path, index=False)
+            print(f"Salvo em {path}")
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except Exception as exc:
+        print(f"Erro: {exc}", file=sys.stderr)
+        sys.exit(1)
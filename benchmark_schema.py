@@ -0,0 +1,216 @@
+"""
+Layouts conhecidos do benchmark_results.csv e tipos canônicos de cada coluna.
+
+O `BenchmarkReporter` mudou de formato ao longo das campanhas:
+
+- 17 colunas (legacy, até 17/11): sem desvios/min/max nem transfer/compute.
+- 30 colunas: estatísticas completas de total/transferência/processamento.
+- 36 colunas: acrescenta as leituras térmicas de bateria/CPU/GPU.
+
+Os CSVs consolidados pelo `merge_benchmarks.py` ainda carregam `device_model` e
+`source_csv`; o store colunar acrescenta `campaign`.
+
+`compact_types` gera a representação compacta usada pelos gráficos: dimensões de
+texto repetitivas viram `category`, métricas viram `float32` e contadores `Int32`
+(`timestamp` continua em 64 bits). `widen_types` desfaz isso nas tabelas já
+agregadas, e `memory_report` mostra o ganho por coluna.
+"""
+
+from __future__ import annotations
+
+from datetime import timedelta, timezone
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+# Horário de Brasília (sem horário de verão desde 2019): relógio local dos aparelhos.
+DEVICE_TIMEZONE = timezone(timedelta(hours=-3))
+
+LEGACY_COLUMNS = [
+    "timestamp",
+    "test_name",
+    "processing_mode",
+    "delegate",
+    "data_description",
+    "input_size",
+    "duration_ms",
+    "throughput_ops_per_sec",
+    "estimated_energy",
+    "manufacturer",
+    "model",
+    "hardware",
+    "board",
+    "soc",
+    "sdk_int",
+    "power_save",
+    "notes",
+]
+
+BASE_COLUMNS = [
+    "timestamp",
+    "test_name",
+    "processing_mode",
+    "delegate",
+    "data_description",
+    "input_size",
+    "duration_ms",
+    "duration_std_ms",
+    "duration_min_ms",
+    "duration_max_ms",
+    "transfer_ms",
+    "transfer_std_ms",
+    "transfer_min_ms",
+    "transfer_max_ms",
+    "compute_ms",
+    "compute_std_ms",
+    "compute_min_ms",
+    "compute_max_ms",
+    "throughput_ops_per_sec",
+    "iterations",
+    "batch_size",
+    "estimated_energy",
+    "manufacturer",
+    "model",
+    "hardware",
+    "board",
+    "soc",
+    "sdk_int",
+    "power_save",
+    "notes",
+]
+
+TEMPERATURE_COLUMNS = [
+    "battery_temp_start_c",
+    "battery_temp_end_c",
+    "cpu_temp_start_c",
+    "cpu_temp_end_c",
+    "gpu_temp_start_c",
+    "gpu_temp_end_c",
+]
+
+THERMAL_COLUMNS = BASE_COLUMNS + TEMPERATURE_COLUMNS
+
+MERGE_COLUMNS = ["device_model", "source_csv"]
+
+STORE_COLUMNS = THERMAL_COLUMNS + MERGE_COLUMNS + ["campaign"]
+
+INT_COLUMNS = ["timestamp", "input_size", "iterations", "batch_size", "sdk_int"]
+BOOL_COLUMNS = ["power_save"]
+STRING_COLUMNS = [
+    "test_name",
+    "processing_mode",
+    "delegate",
+    "data_description",
+    "estimated_energy",
+    "manufacturer",
+    "model",
+    "hardware",
+    "board",
+    "soc",
+    "notes",
+    "device_model",
+    "source_csv",
+    "campaign",
+]
+FLOAT_COLUMNS = [
+    c
+    for c in STORE_COLUMNS
+    if c not in INT_COLUMNS and c not in BOOL_COLUMNS and c not in STRING_COLUMNS
+]
+
+# Dimensões de texto com poucos valores distintos (notes é texto livre e fica de fora).
+CATEGORY_COLUMNS = [c for c in STRING_COLUMNS if c != "notes"]
+COMPACT_INT_COLUMNS = ["input_size", "iterations", "batch_size", "sdk_int"]
+
+COLUMN_TYPES: Dict[str, str] = {
+    **{c: "Int64" for c in INT_COLUMNS},
+    **{c: "boolean" for c in BOOL_COLUMNS},
+    **{c: "string" for c in STRING_COLUMNS},
+    **{c: "float64" for c in FLOAT_COLUMNS},
+}
+
+
+def coerce_types(df: pd.DataFrame) -> pd.DataFrame:
+    """Converte as colunas conhecidas para os tipos canônicos (valores inválidos viram NA)."""
+    df = df.copy()
+    df.columns = [str(c).strip() for c in df.columns]
+    for col in df.columns:
+        kind = COLUMN_TYPES.get(col)
+        if kind is None:
+            continue
+        if kind == "string":
+            text = df[col].astype("string").str.strip()
+            df[col] = text.mask(text == "")
+        elif kind == "boolean":
+            text = df[col].astype("string").str.strip().str.lower()
+            df[col] = text.map({"true": True, "false": False}).astype("boolean")
+        elif kind == "Int64":
+            df[col] = pd.to_numeric(df[col], errors="coerce").round().astype("Int64")
+        else:
+            df[col] = pd.to_numeric(df[col], errors="coerce").astype("float64")
+    return df
+
+
+def reindex_columns(df: pd.DataFrame, columns: List[str]) -> pd.DataFrame:
+    """Garante exatamente `columns` (na ordem), criando as ausentes com NA tipado."""
+    missing = [c for c in columns if c not in df.columns]
+    if missing:
+        df = df.copy()
+        for col in missing:
+            df[col] = pd.Series(index=df.index, dtype=COLUMN_TYPES.get(col, "object"))
+    return df[columns]
+
+
+def compact_types(df: pd.DataFrame) -> pd.DataFrame:
+    """Versão compacta: categóricas para dimensões de texto, float32/Int32 para métricas.
+
+    Colunas fora do schema (ex.: `deviceInfo` de CSVs antigos) ficam como estão.
+    """
+    df = df.copy()
+    for col in df.columns:
+        if col in CATEGORY_COLUMNS:
+            if not isinstance(df[col].dtype, pd.CategoricalDtype):
+                text = df[col].astype("string").str.strip()
+                df[col] = text.mask(text == "").astype("category")
+        elif col in COMPACT_INT_COLUMNS:
+            df[col] = pd.to_numeric(df[col], errors="coerce").round().astype("Int32")
+        elif col in FLOAT_COLUMNS:
+            df[col] = pd.to_numeric(df[col], errors="coerce").astype("float32")
+    return df
+
+
+def widen_types(df: pd.DataFrame) -> pd.DataFrame:
+    """Desfaz a representação compacta (categóricas → texto, float32 → float64).
+
+    Usado nas tabelas já agregadas (pequenas) antes de plotar/imprimir: o seaborn usa
+    todas as categorias do dtype como eixos/legenda, mesmo as ausentes do subconjunto.
+    """
+    df = df.copy()
+    for col in df.columns:
+        if isinstance(df[col].dtype, pd.CategoricalDtype):
+            df[col] = df[col].astype(object)
+        elif df[col].dtype == "float32":
+            df[col] = df[col].astype("float64")
+    return df
+
+
+def memory_report(df: pd.DataFrame, baseline: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+    """Bytes por coluna (`memory_usage(deep=True)`), com a linha TOTAL no fim.
+
+    Com `baseline`, acrescenta os bytes da outra representação e a razão entre elas.
+    """
+    def usage(frame: pd.DataFrame) -> pd.Series:
+        return frame.memory_usage(deep=True, index=False)
+
+    report = pd.DataFrame({"dtype": df.dtypes.astype(str), "bytes": usage(df)})
+    if baseline is not None:
+        report["baseline_dtype"] = baseline.dtypes.astype(str).reindex(report.index)
+        report["baseline_bytes"] = usage(baseline).reindex(report.index)
+    total = {"dtype": "", "bytes": report["bytes"].sum()}
+    if baseline is not None:
+        total.update(baseline_dtype="", baseline_bytes=report["baseline_bytes"].sum())
+    report.loc["TOTAL"] = total
+    if baseline is not None:
+        report["ratio"] = (report["baseline_bytes"] / report["bytes"]).round(2)
+    report.index.name = "column"
+    return report
@@ -0,0 +1,444 @@
+"""
+Estatísticas agregadas para os gráficos (média + intervalo), sem bootstrap por figura.
+
+O `sns.lineplot` sobre linhas brutas refaz um bootstrap de 1000 amostras para
+cada grupo hue/x em cada figura. Aqui o agregado é calculado uma vez para o
+frame inteiro e os scripts plotam a média com `errorbar=None`, desenhando o
+intervalo pré-calculado com `fill_intervals`.
+
+- `interval="t"` (padrão): média ± t·s/√n (Student com scipy; normal sem ele).
+- `interval="bootstrap"`: percentis de `n_boot` médias reamostradas, todas as
+  combinações de uma vez (uma matriz `n_boot × linhas` + `np.add.reduceat`), com
+  resultado em cache em disco (`.cache/bootstrap/`), chaveado pelo conteúdo.
+- `interval=None`: só média e contagem.
+
+`tail_summary` trabalha sobre as amostras por iteração (`benchmark_notes`):
+percentis, IQR e média aparada por grupo, com uma ordenação global
+(`np.lexsort` por grupo/valor) e índices calculados para todos os grupos de uma
+vez, sem `apply` por grupo. Médias de médias escondem execuções bimodais (ex.:
+metade das iterações com T≈2,3 ms e metade com T≈0,6 ms); os percentis não.
+`bootstrap_speedup` dá o intervalo do speedup (CPU Kotlin / delegate) reamostrando
+as iterações de todos os grupos numa única matriz, como o bootstrap de `summarize`
+(~0,6 s para 4000 grupos × 12 iterações com as 1000 rodadas padrão).
+`mann_whitney` compara dois lados em todos os grupos com a mesma ordenação
+única (postos médios nos empates, aproximação normal) e `benjamini_hochberg`
+corrige os p-valores das muitas células comparadas de uma vez.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from pathlib import Path
+from statistics import NormalDist
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+INTERVALS = ["t", "bootstrap", "none"]
+DEFAULT_CONFIDENCE = 0.95
+DEFAULT_BOOTSTRAP_SAMPLES = 1000
+DEFAULT_SEED = 0
+CACHE_DIR = Path(__file__).parent / ".cache" / "bootstrap"
+# Incrementar quando o formato/cálculo do bootstrap mudar (invalida o cache).
+CACHE_VERSION = 3
+# Blocos da matriz de reamostragem (n_boot × linhas): ~4 MB por matriz float32/int32,
+# que cabem em cache (blocos maiores ficam ~15% mais lentos).
+BOOTSTRAP_CELLS = 1_000_000
+# Grupos até este tamanho sorteiam com 16 bits (`(u16 · n) >> 16`): viés ≤ n/2¹⁶
+# (0,4% em 256 amostras) e ~2× mais rápido que `rng.random` + conversão.
+SHORT_DRAW_MAX_COUNT = 256
+DEFAULT_PERCENTILES = (50, 90, 95, 99)
+# Fração descartada em cada ponta na média aparada (como scipy.stats.trim_mean).
+DEFAULT_TRIM = 0.1
+
+
+def _critical_values(n: np.ndarray, confidence: float) -> np.ndarray:
+    try:
+        from scipy import stats
+    except ImportError:  # pragma: no cover
+        return np.full(len(n), NormalDist().inv_cdf(0.5 + confidence / 2))
+    dof = np.maximum(n - 1, 1)
+    return stats.t.ppf(0.5 + confidence / 2, dof)
+
+
+def bootstrap_means(
+    values: np.ndarray,
+    starts: np.ndarray,
+    counts: np.ndarray,
+    n_boot: int,
+    seed: int,
+) -> np.ndarray:
+    """Médias reamostradas (`n_boot × grupos`) de grupos contíguos em `values`.
+
+    Cada rodada sorteia, com reposição, `n` posições dentro de cada grupo; todas
+    as rodadas/grupos saem de uma matriz de índices e um `np.add.reduceat`
+    (em blocos de `BOOTSTRAP_CELLS` células).
+    """
+    rng = np.random.default_rng(seed)
+    group_of_row = np.repeat(np.arange(len(counts)), counts)
+    # float32/int32 na matriz de sorteios: metade da memória e ~2× mais rápido;
+    # médias de poucas dezenas de amostras não precisam de mais precisão.
+    row_starts = starts[group_of_row].astype(np.int32)
+    row_last = (starts + counts - 1)[group_of_row].astype(np.int32)
+    short = len(counts) > 0 and counts.max() <= SHORT_DRAW_MAX_COUNT
+    row_counts = counts[group_of_row].astype(np.uint32 if short else np.float32)
+    values = values.astype(np.float32)
+    step = max(1, BOOTSTRAP_CELLS // max(len(values), 1))
+    means: List[np.ndarray] = []
+    for done in range(0, n_boot, step):
+        size = min(step, n_boot - done)
+        if short:
+            # Bits crus do gerador: 4 sorteios de 16 bits por palavra de 64.
+            words = rng.bit_generator.random_raw(-(-size * len(values) // 4))
+            draws = words.view(np.uint16)[: size * len(values)].reshape(size, len(values))
+            picks = np.multiply(draws, row_counts, dtype=np.uint32)
+            picks >>= 16
+            picks = picks.view(np.int32)
+            picks += row_starts
+        else:
+            draws = rng.random((size, len(values)), dtype=np.float32)
+            draws *= row_counts
+            picks = draws.astype(np.int32)
+            picks += row_starts
+            # Arredondamento em float32 pode dar `n` exato: não invade o grupo seguinte.
+            np.minimum(picks, row_last, out=picks)
+        sums = np.add.reduceat(values[picks], starts, axis=1)
+        means.append(sums / counts)
+    return np.vstack(means)
+
+
+def _bootstrap_bounds(
+    values: np.ndarray,
+    starts: np.ndarray,
+    counts: np.ndarray,
+    confidence: float,
+    n_boot: int,
+    seed: int,
+) -> np.ndarray:
+    """Percentis das médias reamostradas de cada grupo (linhas contíguas por grupo)."""
+    return _percentile_bounds(bootstrap_means(values, starts, counts, n_boot, seed), confidence)
+
+
+def _percentile_bounds(replicates: np.ndarray, confidence: float) -> np.ndarray:
+    """Percentis por coluna (`2 × grupos`); `nanquantile` só nas colunas com NaN.
+
+    `np.nanquantile` percorre coluna a coluna; `np.quantile` ordena a matriz inteira.
+    """
+    alpha = (1 - confidence) / 2
+    bounds = np.full((2, replicates.shape[1]), np.nan)
+    finite = np.isfinite(replicates).all(axis=0)
+    if finite.any():
+        bounds[:, finite] = np.quantile(replicates[:, finite], [alpha, 1 - alpha], axis=0)
+    partial = ~finite & np.isfinite(replicates).any(axis=0)
+    if partial.any():
+        masked = np.where(np.isfinite(replicates[:, partial]), replicates[:, partial], np.nan)
+        bounds[:, partial] = np.nanquantile(masked, [alpha, 1 - alpha], axis=0)
+    return bounds
+
+
+def _cache_key(df: pd.DataFrame, keys: Sequence[str], value: str, params: Dict[str, object]) -> str:
+    digest = hashlib.sha256()
+    digest.update(repr((list(keys), value, sorted(params.items()))).encode())
+    frame = df[list(keys) + [value]]
+    digest.update(pd.util.hash_pandas_object(frame, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def summarize(
+    df: pd.DataFrame,
+    keys: Sequence[str],
+    value: str,
+    interval: Optional[str] = "t",
+    *,
+    confidence: float = DEFAULT_CONFIDENCE,
+    n_boot: int = DEFAULT_BOOTSTRAP_SAMPLES,
+    seed: int = DEFAULT_SEED,
+    cache_dir: Optional[Path] = CACHE_DIR,
+) -> pd.DataFrame:
+    """Uma linha por combinação de `keys`: mean, std, n, low e high (NaN sem intervalo)."""
+    keys = list(keys)
+    data = df[keys + [value]].dropna(subset=[value])
+    data = data.assign(**{value: data[value].astype("float64")})
+
+    cache_path: Optional[Path] = None
+    if interval == "bootstrap" and cache_dir is not None:
+        params = {"confidence": confidence, "n_boot": n_boot, "seed": seed, "version": CACHE_VERSION}
+        cache_path = Path(cache_dir) / f"{_cache_key(data, keys, value, params)}.pkl"
+        if cache_path.exists():
+            return pd.read_pickle(cache_path)
+
+    grouped = data.groupby(keys, observed=True, sort=True)[value]
+    out = grouped.agg(mean="mean", std="std", n="count").reset_index()
+    out["low"] = np.nan
+    out["high"] = np.nan
+
+    if interval == "t":
+        n = out["n"].to_numpy()
+        half = _critical_values(n, confidence) * out["std"].to_numpy() / np.sqrt(n)
+        out["low"] = out["mean"] - half
+        out["high"] = out["mean"] + half
+    elif interval == "bootstrap" and len(out):
+        codes = grouped.ngroup().to_numpy()
+        order = np.argsort(codes, kind="stable")
+        counts = out["n"].to_numpy()
+        starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+        bounds = _bootstrap_bounds(
+            data[value].to_numpy()[order], starts, counts, confidence, n_boot, seed
+        )
+        out["low"], out["high"] = bounds[0], bounds[1]
+    elif interval not in (None, "none"):
+        raise ValueError(f"Intervalo desconhecido: {interval} (use {', '.join(INTERVALS)})")
+
+    if cache_path is not None:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        out.to_pickle(cache_path)
+    return out
+
+
+def _sorted_groups(
+    data: pd.DataFrame, keys: Sequence[str], value: str
+) -> Tuple[pd.DataFrame, np.ndarray, np.ndarray, np.ndarray]:
+    """Chaves dos grupos, valores ordenados por (grupo, valor), início e tamanho de cada grupo."""
+    grouped = data.groupby(list(keys), observed=True, sort=True)
+    codes = grouped.ngroup().to_numpy()
+    values = data[value].to_numpy(dtype="float64")
+    order = np.lexsort((values, codes))
+    counts = np.bincount(codes, minlength=grouped.ngroups)
+    starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+    index = grouped.size().index.to_frame(index=False)
+    return index, values[order], starts, counts
+
+
+def group_quantiles(
+    values: np.ndarray, starts: np.ndarray, counts: np.ndarray, quantiles: Sequence[float]
+) -> np.ndarray:
+    """Quantis (interpolação linear, como `np.quantile`) de grupos contíguos já ordenados.
+
+    Retorna uma matriz `len(quantiles) × grupos`.
+    """
+    position = starts + np.outer(quantiles, counts - 1)
+    low = np.floor(position).astype(np.int64)
+    high = np.minimum(low + 1, starts + counts - 1)
+    frac = position - low
+    return values[low] + (values[high] - values[low]) * frac
+
+
+def tail_summary(
+    samples: pd.DataFrame,
+    keys: Sequence[str],
+    value: str = "duration_ms",
+    percentiles: Sequence[float] = DEFAULT_PERCENTILES,
+    trim: float = DEFAULT_TRIM,
+) -> pd.DataFrame:
+    """Uma linha por combinação de `keys`: n, mean, std, min, p<q>..., max, iqr e trim_mean.
+
+    `samples` é a tabela longa por iteração (`benchmark_notes.explode_samples`);
+    amostras sem `value` são ignoradas. `iqr` = p75 − p25 e `trim_mean` descarta
+    `trim` das amostras em cada ponta (`⌊trim·n⌋`).
+    """
+    if not 0 <= trim < 0.5:
+        raise ValueError(f"trim deve estar em [0, 0.5): {trim}")
+    keys = list(keys)
+    data = samples[keys + [value]].dropna(subset=[value])
+    columns = ["n", "mean", "std", "min"] + [f"p{q:g}" for q in percentiles] + ["max", "iqr", "trim_mean"]
+    if data.empty:
+        return pd.DataFrame(columns=keys + columns)
+    out, values, starts, counts = _sorted_groups(data, keys, value)
+    ends = starts + counts
+
+    sums = np.add.reduceat(values, starts)
+    mean = sums / counts
+    squares = np.add.reduceat((values - np.repeat(mean, counts)) ** 2, starts)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        std = np.sqrt(squares / (counts - 1))
+    quantiles = group_quantiles(values, starts, counts, [q / 100 for q in percentiles] + [0.25, 0.75])
+
+    cut = np.floor(trim * counts).astype(np.int64)
+    cumsum = np.concatenate([[0.0], np.cumsum(values)])
+    trimmed = (cumsum[ends - cut] - cumsum[starts + cut]) / (counts - 2 * cut)
+
+    out["n"] = counts
+    out["mean"] = mean
+    out["std"] = np.where(counts > 1, std, np.nan)
+    out["min"] = values[starts]
+    for i, q in enumerate(percentiles):
+        out[f"p{q:g}"] = quantiles[i]
+    out["max"] = values[ends - 1]
+    out["iqr"] = quantiles[-1] - quantiles[-2]
+    out["trim_mean"] = trimmed
+    return out
+
+
+def bootstrap_speedup(
+    samples: pd.DataFrame,
+    keys: Sequence[str],
+    by: str = "delegate_norm",
+    baseline: str = "CPU Kotlin",
+    value: str = "duration_ms",
+    *,
+    confidence: float = DEFAULT_CONFIDENCE,
+    n_boot: int = DEFAULT_BOOTSTRAP_SAMPLES,
+    seed: int = DEFAULT_SEED,
+) -> pd.DataFrame:
+    """Speedup (média do `baseline` / média de cada valor de `by`) com IC por bootstrap.
+
+    `samples` é a tabela por iteração; `keys` define a célula comparada (ex.:
+    dispositivo, algoritmo, tamanho) e `by` a coluna do delegate. As médias de
+    todos os grupos são reamostradas juntas (`bootstrap_means`) e cada rodada
+    divide a média do baseline da célula pela do grupo, então os percentis saem
+    de uma matriz `n_boot × grupos`. Retorna keys + by, n, speedup,
+    speedup_low e speedup_high (NaN sem baseline na célula).
+    """
+    keys = list(keys)
+    data = samples[keys + [by, value]].dropna(subset=[value])
+    columns = keys + [by, "n", "speedup", "speedup_low", "speedup_high"]
+    if data.empty:
+        return pd.DataFrame(columns=columns)
+    out, values, starts, counts = _sorted_groups(data, keys + [by], value)
+    means = np.add.reduceat(values, starts) / counts
+    boot = bootstrap_means(values, starts, counts, n_boot, seed)
+
+    # Coluna do baseline da mesma célula para cada grupo (-1 quando não existe).
+    cell = out.groupby(keys, observed=True, sort=False).ngroup().to_numpy()
+    base_of_cell = np.full(cell.max() + 1, -1)
+    is_base = (out[by].astype(str) == baseline).to_numpy()
+    base_of_cell[cell[is_base]] = np.flatnonzero(is_base)
+    base = base_of_cell[cell]
+    has_base = base >= 0
+
+    speedup = np.full(len(out), np.nan)
+    bounds = np.full((2, len(out)), np.nan)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        speedup[has_base] = means[base[has_base]] / means[has_base]
+        ratios = boot[:, base[has_base]] / boot[:, has_base]
+    bounds[:, has_base] = _percentile_bounds(ratios, confidence)
+    out["n"] = counts
+    out["speedup"] = speedup
+    out["speedup_low"], out["speedup_high"] = bounds[0], bounds[1]
+    return out[columns]
+
+
+def _normal_sf(z: np.ndarray) -> np.ndarray:
+    try:
+        from scipy.special import ndtr
+    except ImportError:  # pragma: no cover
+        return np.array([1 - NormalDist().cdf(v) if np.isfinite(v) else np.nan for v in z])
+    return ndtr(-z)
+
+
+def mann_whitney(
+    samples: pd.DataFrame,
+    keys: Sequence[str],
+    by: str,
+    value: str = "duration_ms",
+) -> pd.DataFrame:
+    """Teste de Mann-Whitney bicaudal entre os dois lados de `by` em cada grupo de `keys`.
+
+    `by` é 0/1 (ou booleano): 0 = referência, 1 = comparado. Os postos saem de
+    uma ordenação única (grupo, valor), com posto médio nos empates; o p-valor
+    usa a aproximação normal com correção de empates e de continuidade (como
+    `scipy.stats.mannwhitneyu(method="asymptotic")`). Retorna keys, n_ref,
+    n_other, u (pares com comparado > referência, empates valem ½), z, p_value e
+    effect = 2u/(n_ref·n_other) − 1 (rank-biserial: > 0 quando o lado 1 é maior).
+    """
+    keys = list(keys)
+    data = samples[keys + [by, value]].dropna(subset=[value])
+    columns = keys + ["n_ref", "n_other", "u", "z", "p_value", "effect"]
+    if data.empty:
+        return pd.DataFrame(columns=columns)
+    grouped = data.groupby(keys, observed=True, sort=True)
+    codes = grouped.ngroup().to_numpy()
+    order = np.lexsort((data[value].to_numpy(dtype="float64"), codes))
+    values = data[value].to_numpy(dtype="float64")[order]
+    group = codes[order]
+    other = data[by].to_numpy(dtype="float64")[order]
+    counts = np.bincount(group, minlength=grouped.ngroups)
+    starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+
+    # Blocos de empate: mesmo grupo e mesmo valor recebem o posto médio do bloco.
+    new_block = np.ones(len(values), dtype=bool)
+    new_block[1:] = (group[1:] != group[:-1]) | (values[1:] != values[:-1])
+    block_start = np.flatnonzero(new_block)
+    block_size = np.diff(np.append(block_start, len(values))).astype("float64")
+    position = np.arange(len(values)) - starts[group] + 1
+    ranks = (position[block_start] + (block_size - 1) / 2)[np.cumsum(new_block) - 1]
+
+    n = counts.astype("float64")
+    n_other = np.bincount(group, weights=other, minlength=len(counts))
+    n_ref = n - n_other
+    pairs = n_ref * n_other
+    u = np.bincount(group, weights=ranks * other, minlength=len(counts)) - n_other * (n_other + 1) / 2
+    ties = np.bincount(group[block_start], weights=block_size**3 - block_size, minlength=len(counts))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sigma = np.sqrt(pairs / 12 * ((n + 1) - ties / (n * (n - 1))))
+        diff = u - pairs / 2
+        z = np.sign(diff) * np.maximum(np.abs(diff) - 0.5, 0) / sigma
+        effect = np.where(pairs > 0, 2 * u / pairs - 1, np.nan)
+    z = np.where((pairs > 0) & (sigma > 0), z, np.where(pairs > 0, 0.0, np.nan))
+    out = grouped.size().index.to_frame(index=False)
+    out["n_ref"] = n_ref.astype(np.int64)
+    out["n_other"] = n_other.astype(np.int64)
+    out["u"] = np.where(pairs > 0, u, np.nan)
+    out["z"] = z
+    out["p_value"] = np.minimum(2 * _normal_sf(np.abs(z)), 1.0)
+    out["effect"] = effect
+    return out[columns]
+
+
+def benjamini_hochberg(p_values: np.ndarray) -> np.ndarray:
+    """q-valores de Benjamini-Hochberg (taxa de falsas descobertas); NaN fica NaN."""
+    p_values = np.asarray(p_values, dtype="float64")
+    q_values = np.full(len(p_values), np.nan)
+    valid = np.flatnonzero(~np.isnan(p_values))
+    if len(valid) == 0:
+        return q_values
+    order = valid[np.argsort(p_values[valid], kind="stable")]
+    scaled = p_values[order] * len(valid) / np.arange(1, len(valid) + 1)
+    q_values[order] = np.minimum(np.minimum.accumulate(scaled[::-1])[::-1], 1.0)
+    return q_values
+
+
+def add_interval_arguments(parser) -> None:
+    """Opções `--ci`/`--bootstrap-samples` compartilhadas pelos scripts de gráficos."""
+    parser.add_argument(
+        "--ci",
+        choices=INTERVALS,
+        default="t",
+        help="Faixa em torno da média: t (analítico, padrão), bootstrap (em cache) ou none.",
+    )
+    parser.add_argument(
+        "--bootstrap-samples",
+        type=int,
+        default=DEFAULT_BOOTSTRAP_SAMPLES,
+        help=f"Reamostragens do bootstrap (--ci bootstrap e IC do speedup; padrão: {DEFAULT_BOOTSTRAP_SAMPLES}).",
+    )
+
+
+def fill_intervals(
+    ax,
+    agg: pd.DataFrame,
+    x: str,
+    hue: str,
+    palette: Dict[str, str],
+    by: Optional[Sequence[str]] = None,
+    alpha: float = 0.2,
+) -> None:
+    """Faixa low–high por linha (mesma aparência da banda de CI do seaborn).
+
+    `by` lista colunas extras que separam linhas de mesma cor (ex.: `style`).
+    """
+    if agg["low"].isna().all():
+        return
+    group_cols = [hue] + list(by or [])
+    for key, line in agg.groupby(group_cols, observed=True, sort=False):
+        color_key = key[0] if isinstance(key, tuple) else key
+        line = line.sort_values(x)
+        ax.fill_between(
+            line[x],
+            line["low"],
+            line["high"],
+            color=palette.get(color_key),
+            alpha=alpha,
+            linewidth=0,
+        )
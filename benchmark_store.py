@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""
+Store colunar (Parquet) com todas as campanhas de app/src/BANCHMARK.
+
+Cada `app/src/BANCHMARK/<campanha>/benchmark_results.csv` é convertido uma única
+vez para Parquet tipado, particionado por `device_model` e `campaign`. Os scripts
+de gráficos usam `load_benchmarks`, que lê apenas as colunas e partições pedidas
+(e, quando recebe um CSV, ignora a coluna `notes` via `usecols`).
+
+Exemplo:
+
+```bash
+python3 benchmark_store.py                                   # todas as campanhas
+python3 benchmark_store.py --campaign s21-09-12 --campaign motog84-09-12
+python3 generate_charts.py --csv app/src/BANCHMARK/.store --campaign comparativo-09-12 \
+  --output app/src/BANCHMARK/comparativo-09-12/charts
+```
+
+Requer `pyarrow` apenas para o store; CSVs continuam funcionando sem ele.
+"""
+
+from __future__ import annotations
+
+import argparse
+import shutil
+import sys
+from pathlib import Path
+from typing import Iterable, List, Optional, Sequence
+from urllib.parse import unquote
+
+import pandas as pd
+
+from benchmark_db import is_database, load_runs
+from benchmark_schema import (
+    COLUMN_TYPES,
+    STORE_COLUMNS,
+    coerce_types,
+    compact_types,
+    memory_report,
+    reindex_columns,
+)
+from merge_benchmarks import (
+    DEFAULT_CHUNK_ROWS,
+    infer_device_label,
+    iter_labeled_chunks,
+    load_with_label,
+    read_header,
+)
+
+BASE_DIR = Path(__file__).parent
+DEFAULT_BENCHMARK_DIR = BASE_DIR / "app" / "src" / "BANCHMARK"
+DEFAULT_STORE_DIR = DEFAULT_BENCHMARK_DIR / ".store"
+PARTITION_COLUMNS = ["device_model", "campaign"]
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow.parquet as pq
+    except ImportError as exc:  # pragma: no cover
+        raise RuntimeError(
+            "pyarrow não está instalado; rode `pip install pyarrow` para usar o store colunar."
+        ) from exc
+    return pq
+
+
+def arrow_schema():
+    import pyarrow as pa
+
+    arrow_types = {
+        "Int64": pa.int64(),
+        "boolean": pa.bool_(),
+        "string": pa.string(),
+        "float64": pa.float64(),
+    }
+    return pa.schema([(col, arrow_types[COLUMN_TYPES[col]]) for col in STORE_COLUMNS])
+
+
+def discover_campaign_csvs(base_dir: Path, campaigns: Optional[Sequence[str]] = None) -> List[Path]:
+    paths = sorted(base_dir.glob("*/benchmark_results.csv"))
+    paths = [p for p in paths if not p.parent.name.startswith(".")]
+    if campaigns:
+        wanted = set(campaigns)
+        paths = [p for p in paths if p.parent.name in wanted]
+    return paths
+
+
+def _store_frame(df: pd.DataFrame, campaign: str) -> pd.DataFrame:
+    df["campaign"] = campaign
+    return reindex_columns(coerce_types(df), STORE_COLUMNS)
+
+
+def drop_campaign(store_dir: Path, campaign: str) -> None:
+    """Remove as partições de uma campanha (de todos os dispositivos)."""
+    for partition in store_dir.glob("device_model=*/campaign=*"):
+        if unquote(partition.name.split("=", 1)[1]) == campaign:
+            shutil.rmtree(partition)
+
+
+def ingest_campaign(csv_path: Path, store_dir: Path, chunk_rows: int = DEFAULT_CHUNK_ROWS) -> int:
+    """Regrava as partições da campanha lendo o CSV em blocos (memória constante)."""
+    pq = _require_pyarrow()
+    import pyarrow as pa
+
+    campaign = csv_path.parent.name
+    schema = arrow_schema()
+    drop_campaign(store_dir, campaign)
+    rows = 0
+    for index, chunk in enumerate(iter_labeled_chunks(csv_path, None, chunk_rows)):
+        table = pa.Table.from_pandas(_store_frame(chunk, campaign), schema=schema, preserve_index=False)
+        pq.write_to_dataset(
+            table,
+            root_path=str(store_dir),
+            partition_cols=PARTITION_COLUMNS,
+            basename_template=f"{campaign}-{index}-{{i}}.parquet",
+            existing_data_behavior="overwrite_or_ignore",
+        )
+        rows += len(chunk)
+    return rows
+
+
+def _wanted_columns(columns: Optional[Iterable[str]], include_notes: bool) -> Optional[List[str]]:
+    if columns is None:
+        if include_notes:
+            return None
+        return [c for c in STORE_COLUMNS if c != "notes"]
+    wanted = list(dict.fromkeys(columns))
+    if include_notes and "notes" not in wanted:
+        wanted.append("notes")
+    return wanted
+
+
+def _load_store(
+    store_dir: Path,
+    columns: Optional[List[str]],
+    devices: Optional[Sequence[str]],
+    campaigns: Optional[Sequence[str]],
+) -> pd.DataFrame:
+    _require_pyarrow()
+    filters = []
+    if devices:
+        filters.append(("device_model", "in", list(devices)))
+    if campaigns:
+        filters.append(("campaign", "in", list(campaigns)))
+    if columns is not None:
+        columns = [c for c in columns if c in STORE_COLUMNS]
+    df = pd.read_parquet(
+        store_dir,
+        engine="pyarrow",
+        columns=columns,
+        filters=filters or None,
+    )
+    # Colunas de partição voltam como categóricas; mantemos texto simples como no CSV.
+    for col in PARTITION_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].astype(str)
+    return df
+
+
+def _load_csv(
+    csv_path: Path,
+    columns: Optional[List[str]],
+    devices: Optional[Sequence[str]],
+    campaigns: Optional[Sequence[str]],
+) -> pd.DataFrame:
+    """CSV avulso com as mesmas colunas que o store devolveria.
+
+    CSVs de campanha (sem `device_model`) misturam larguras de linha (17 e 30
+    colunas em motog04s-28-11) e são lidos como na ingestão do store
+    (`load_with_label`: layout por largura, label de `model` ou da pasta). Colunas
+    do schema que o arquivo não tem (ex.: `batch_size` no legacy) voltam como NA
+    tipado, como em `_store_frame`.
+    """
+    if columns is None:
+        usecols = None
+    else:
+        wanted = set(columns)
+        usecols = lambda name: str(name).strip() in wanted  # noqa: E731
+    if "device_model" not in read_header(csv_path):
+        df = load_with_label(csv_path, None)
+        if "device_model" in df.columns:
+            df["device_model"] = df["device_model"].replace("Dispositivo", infer_device_label(csv_path))
+        df = df[[c for c in df.columns if usecols is None or usecols(c)]]
+    else:
+        try:
+            df = pd.read_csv(csv_path, usecols=usecols)
+        except pd.errors.ParserError:
+            df = load_with_label(csv_path, None)
+            df = df[[c for c in df.columns if usecols is None or usecols(c)]]
+    df.columns = [str(c).strip() for c in df.columns]
+    if columns is not None:
+        # `campaign` só existe no store; sem ela os scripts tratam o CSV como uma campanha.
+        schema = [c for c in STORE_COLUMNS if c != "campaign"]
+        df = reindex_columns(df, [c for c in columns if c in df.columns or c in schema])
+    if devices and "device_model" in df.columns:
+        df = df[df["device_model"].astype(str).str.strip().isin(devices)]
+    if campaigns and csv_path.parent.name not in campaigns:
+        df = df.iloc[0:0]
+    return df.reset_index(drop=True)
+
+
+def load_benchmarks(
+    source: Path,
+    columns: Optional[Iterable[str]] = None,
+    *,
+    devices: Optional[Sequence[str]] = None,
+    campaigns: Optional[Sequence[str]] = None,
+    include_notes: bool = False,
+    compact: bool = False,
+) -> pd.DataFrame:
+    """Lê benchmarks de um CSV, do store colunar (diretório) ou do banco SQLite.
+
+    `columns` lista as colunas desejadas (ausentes são ignoradas); `notes` só é
+    carregada quando `include_notes=True` ou quando pedida explicitamente.
+    `compact=True` devolve categóricas/float32 (`benchmark_schema.compact_types`).
+    """
+    source = Path(source)
+    if not source.exists():
+        raise FileNotFoundError(f"Fonte de benchmarks não encontrada: {source}")
+    wanted = _wanted_columns(columns, include_notes)
+    if is_database(source):
+        df = load_runs(source, wanted, devices, campaigns)
+    elif source.is_dir():
+        df = _load_store(source, wanted, devices, campaigns)
+    else:
+        df = _load_csv(source, wanted, devices, campaigns)
+    return compact_types(df) if compact else df
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Converte os benchmark_results.csv das campanhas para um store Parquet particionado."
+    )
+    parser.add_argument(
+        "--base",
+        default=str(DEFAULT_BENCHMARK_DIR),
+        help="Diretório com as pastas de campanha (padrão: app/src/BANCHMARK).",
+    )
+    parser.add_argument(
+        "--store",
+        default=str(DEFAULT_STORE_DIR),
+        help="Diretório de saída do store colunar.",
+    )
+    parser.add_argument(
+        "--campaign",
+        action="append",
+        help="Ingere apenas a campanha indicada (nome da pasta). Pode ser repetido.",
+    )
+    parser.add_argument(
+        "--memory-report",
+        metavar="FONTE",
+        help="Só compara a memória por coluna (padrão × compacta) ao carregar FONTE (CSV, store ou .sqlite).",
+    )
+    args = parser.parse_args()
+
+    if args.memory_report:
+        source = Path(args.memory_report)
+        baseline = load_benchmarks(source, campaigns=args.campaign)
+        compact = load_benchmarks(source, campaigns=args.campaign, compact=True)
+        with pd.option_context("display.max_rows", None, "display.width", 160):
+            print(memory_report(compact, baseline))
+        return
+
+    base_dir = Path(args.base)
+    store_dir = Path(args.store)
+    csv_paths = discover_campaign_csvs(base_dir, args.campaign)
+    if not csv_paths:
+        raise FileNotFoundError(f"Nenhum benchmark_results.csv encontrado em {base_dir}")
+
+    store_dir.mkdir(parents=True, exist_ok=True)
+    total = 0
+    for csv_path in csv_paths:
+        rows = ingest_campaign(csv_path, store_dir)
+        total += rows
+        print(f"{csv_path.parent.name}: {rows} linhas")
+    print(f"Store colunar atualizado em {store_dir} ({total} linhas, {len(csv_paths)} campanhas).")
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except Exception as exc:  # pragma: no cover
+        print(f"Erro: {exc}", file=sys.stderr)
+        sys.exit(1)
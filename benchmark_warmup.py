@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""
+Detecta aquecimento (warm-up) nas séries por iteração de cada execução.
+
+Muitas execuções têm um patamar inicial lento seguido de um regime estável mais
+rápido (primeiros invokes do delegate GPU, ou iterações 1–6 vs 7–12 no S21), e a
+média da linha mistura os dois. Para cada execução (`row_id` de
+`benchmark_notes.explode_samples`) o detector procura uma única mudança de nível:
+
+1. as séries (log do tempo, para comparar razões) viram uma matriz
+   execuções × iterações; somas acumuladas dão, para todo corte `k` de uma vez,
+   o erro quadrático de dois patamares (iterações `1..k` e `k+1..n`);
+2. o melhor corte é o de menor erro com pelo menos `min_steady` iterações depois;
+3. ele só vale como aquecimento se o patamar inicial for mais lento: estatística
+   t (diferença das médias sobre o desvio do regime estável) ≥ `threshold` e
+   razão das médias geométricas ≥ `min_ratio`.
+
+Por execução: `onset` (primeira iteração estável; 1 = sem aquecimento), médias de
+duração/transferência/processamento no aquecimento e no regime estável, e
+`warmup_cost_ms` (tempo extra pago no aquecimento em relação ao regime estável).
+Por célula (dispositivo, algoritmo, delegate, modo, tamanho): fração de execuções
+com aquecimento, iterações de aquecimento (mediana/máximo) e custo médio — o
+número de invokes de aquecimento que o app deveria fazer antes de servir.
+
+`exclude_warmup` troca, nas linhas com aquecimento detectado, `duration_ms`,
+`transfer_ms` e `compute_ms` pelas médias do regime estável; os scripts de
+gráficos usam isso com `--steady-state` (speedup sem o custo do primeiro invoke),
+e `steady_samples` faz o mesmo nas amostras por iteração (IC do speedup).
+
+Exemplo:
+
+```bash
+python3 benchmark_warmup.py --csv app/src/BANCHMARK/.store --output /tmp/warmup_cells.csv \
+  --runs-output /tmp/warmup_runs.csv
+python3 generate_charts.py --csv app/src/BANCHMARK/comparativo-09-12/benchmark_results.csv \
+  --output /tmp/charts --steady-state
+```
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+from typing import List, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from benchmark_notes import CELL_KEYS, SAMPLE_METRICS, explode_samples, load_cell_samples
+
+DEFAULT_METRIC = "duration_ms"
+DEFAULT_THRESHOLD = 4.0
+DEFAULT_MIN_RATIO = 1.1
+DEFAULT_MIN_STEADY = 3
+# Piso (ms) antes do log: as notas têm 2 casas e T=0,00ms é comum na CPU.
+LOG_FLOOR_MS = 0.005
+
+
+def _run_matrix(samples: pd.DataFrame, value: str) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """`row_id`s, matriz execuções × iterações de `value` (NaN após o fim) e tamanhos."""
+    data = samples.dropna(subset=[value])
+    row_ids = np.unique(data["row_id"].to_numpy())
+    counts = data.groupby("row_id", sort=True)["iteration"].max().to_numpy(dtype=np.int64)
+    width = int(counts.max()) if len(counts) else 0
+    return row_ids, _aligned(data, value, row_ids, width), counts
+
+
+def _masked_mean(matrix: np.ndarray, mask: np.ndarray) -> np.ndarray:
+    values = np.where(mask & ~np.isnan(matrix), matrix, 0.0)
+    count = (mask & ~np.isnan(matrix)).sum(axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(count > 0, values.sum(axis=1) / count, np.nan)
+
+
+def detect_warmup(
+    samples: pd.DataFrame,
+    value: str = DEFAULT_METRIC,
+    threshold: float = DEFAULT_THRESHOLD,
+    min_ratio: float = DEFAULT_MIN_RATIO,
+    min_steady: int = DEFAULT_MIN_STEADY,
+) -> pd.DataFrame:
+    """Uma linha por execução (`row_id`) com o início do regime estável em `value`.
+
+    Colunas: iterations, onset, warmup_iterations, statistic, ratio,
+    warmup_<métrica>/steady_<métrica> (médias em ms) e warmup_cost_ms. Colunas de
+    chave presentes em `samples` (ex.: CELL_KEYS) são mantidas.
+    """
+    row_ids, matrix, counts = _run_matrix(samples, value)
+    runs, width = matrix.shape
+    out = pd.DataFrame({"row_id": row_ids, "iterations": counts})
+    if runs == 0 or width < 2:
+        for column in ["onset", "warmup_iterations", "statistic", "ratio", "warmup_cost_ms"]:
+            out[column] = pd.Series(dtype="float64")
+        return out
+
+    logs = np.log(np.clip(np.nan_to_num(matrix, nan=1.0), LOG_FLOOR_MS, None))
+    logs[np.isnan(matrix)] = 0.0
+    cum = np.cumsum(logs, axis=1)
+    cum_sq = np.cumsum(logs**2, axis=1)
+    total = cum[np.arange(runs), counts - 1]
+    total_sq = cum_sq[np.arange(runs), counts - 1]
+
+    # Coluna j = corte depois da iteração j+1 (prefixo com n1 = j+1 iterações).
+    n1 = np.arange(1, width, dtype="float64")[None, :]
+    n2 = counts[:, None] - n1
+    s1, q1 = cum[:, :-1], cum_sq[:, :-1]
+    s2, q2 = total[:, None] - s1, total_sq[:, None] - q1
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sse2 = q2 - s2**2 / n2
+        sse = (q1 - s1**2 / n1) + sse2
+    valid = n2 >= min_steady
+    best = np.argmin(np.where(valid, sse, np.inf), axis=1)
+    has_split = valid.any(axis=1)
+
+    pick = (np.arange(runs), best)
+    k = n1[0, best]
+    rest = n2[pick]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        diff = s1[pick] / k - s2[pick] / rest
+        steady_var = np.clip(sse2[pick], 0, None) / (rest - 1)
+        scale = np.sqrt(steady_var * (1 / k + 1 / rest))
+        statistic = np.where(scale > 0, diff / scale, np.where(diff > 0, np.inf, 0.0))
+        ratio = np.exp(diff)
+    detected = has_split & (statistic >= threshold) & (ratio >= min_ratio)
+    warmup = np.where(detected, k, 0).astype(np.int64)
+
+    out["onset"] = warmup + 1
+    out["warmup_iterations"] = warmup
+    out["statistic"] = np.where(has_split, statistic, np.nan)
+    out["ratio"] = np.where(has_split, ratio, np.nan)
+
+    column = np.arange(width)[None, :]
+    warm_mask = column < warmup[:, None]
+    steady_mask = ~warm_mask
+    for metric in [m for m in SAMPLE_METRICS if m in samples.columns]:
+        metric_matrix = matrix if metric == value else _aligned(samples, metric, row_ids, width)
+        out[f"warmup_{metric}"] = np.where(detected, _masked_mean(metric_matrix, warm_mask), np.nan)
+        out[f"steady_{metric}"] = _masked_mean(metric_matrix, steady_mask)
+    out["warmup_cost_ms"] = np.where(
+        detected, (out[f"warmup_{value}"] - out[f"steady_{value}"]) * warmup, 0.0
+    )
+
+    keys = [c for c in samples.columns if c not in ["row_id", "iteration"] + SAMPLE_METRICS]
+    if keys:
+        out = out.join(samples.drop_duplicates("row_id").set_index("row_id")[keys], on="row_id")
+    return out
+
+
+def _aligned(samples: pd.DataFrame, metric: str, row_ids: np.ndarray, width: int) -> np.ndarray:
+    """Matriz de `metric` nas mesmas linhas/colunas da métrica detectada.
+
+    As colunas seguem `iteration` (não a posição entre valores válidos): T/P ausentes
+    nos CSVs legacy ficam NaN em vez de deslocar a série.
+    """
+    data = samples[["row_id", "iteration", metric]]
+    data = data[data["row_id"].isin(row_ids)]
+    matrix = np.full((len(row_ids), width), np.nan)
+    rows = np.searchsorted(row_ids, data["row_id"].to_numpy())
+    cols = data["iteration"].to_numpy() - 1
+    keep = cols < width
+    matrix[rows[keep], cols[keep]] = data[metric].to_numpy(dtype="float64")[keep]
+    return matrix
+
+
+def summarize_warmup(runs: pd.DataFrame, keys: Sequence[str]) -> pd.DataFrame:
+    """Por célula: execuções, quantas com aquecimento, iterações de aquecimento e custos."""
+    grouped = runs.assign(has_warmup=runs["warmup_iterations"] > 0).groupby(
+        list(keys), observed=True, sort=True
+    )
+    cells = grouped.agg(
+        runs=("row_id", "size"),
+        warmup_runs=("has_warmup", "sum"),
+        warmup_iterations_median=("warmup_iterations", "median"),
+        warmup_iterations_max=("warmup_iterations", "max"),
+        warmup_cost_ms=("warmup_cost_ms", "mean"),
+        warmup_duration_ms=("warmup_duration_ms", "mean"),
+        steady_duration_ms=("steady_duration_ms", "mean"),
+        steady_transfer_ms=("steady_transfer_ms", "mean"),
+        steady_compute_ms=("steady_compute_ms", "mean"),
+    ).reset_index()
+    cells["warmup_share"] = cells["warmup_runs"] / cells["runs"]
+    return cells
+
+
+def exclude_warmup(df: pd.DataFrame, notes_col: str = "notes", **options) -> pd.DataFrame:
+    """Troca duração/transferência/processamento pelo regime estável nas linhas com aquecimento.
+
+    Linhas sem aquecimento detectado (ou sem amostras em `notes`) ficam intactas;
+    `options` são repassadas a `detect_warmup`. Usado pelo `--steady-state` dos gráficos.
+    """
+    runs = detect_warmup(explode_samples(df, notes_col=notes_col), **options)
+    runs = runs[runs["warmup_iterations"] > 0].set_index("row_id")
+    df = df.copy()
+    for metric in SAMPLE_METRICS:
+        steady = f"steady_{metric}"
+        if metric not in df.columns or steady not in runs.columns:
+            continue
+        values = runs[steady].dropna()
+        # Colunas compactas são float32; o valor estável cabe no mesmo dtype.
+        df.loc[values.index, metric] = values.astype(df[metric].dtype).to_numpy()
+    df.attrs["warmup_rows"] = len(runs)
+    return df
+
+
+def steady_samples(samples: pd.DataFrame, **options) -> pd.DataFrame:
+    """Só as iterações do regime estável (a partir de `onset`) de cada execução."""
+    runs = detect_warmup(samples, **options)
+    onset = samples["row_id"].map(runs.set_index("row_id")["onset"]).fillna(1)
+    return samples[samples["iteration"] >= onset]
+
+
+STEADY_STATE_HELP = (
+    "Exclui as iterações de aquecimento (benchmark_warmup.py) das médias e do speedup; lê `notes`."
+)
+
+
+def add_steady_state_argument(parser: argparse.ArgumentParser, help: str = STEADY_STATE_HELP) -> None:
+    """Opção `--steady-state` compartilhada pelos scripts; `help` descreve o efeito no script."""
+    parser.add_argument("--steady-state", action="store_true", help=help)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Detecta aquecimento por execução e resume o custo por célula."
+    )
+    parser.add_argument(
+        "--csv",
+        required=True,
+        help="Caminho para benchmark_results.csv, diretório do store colunar ou banco SQLite.",
+    )
+    parser.add_argument(
+        "--campaign",
+        action="append",
+        help="Filtra campanhas do store colunar (nome da pasta). Pode ser repetido.",
+    )
+    parser.add_argument(
+        "--metric",
+        choices=SAMPLE_METRICS,
+        default=DEFAULT_METRIC,
+        help=f"Série usada na detecção (padrão: {DEFAULT_METRIC} = T+P).",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help=f"Estatística t mínima entre aquecimento e regime estável (padrão: {DEFAULT_THRESHOLD}).",
+    )
+    parser.add_argument(
+        "--min-ratio",
+        type=float,
+        default=DEFAULT_MIN_RATIO,
+        help=f"Quanto o aquecimento precisa ser mais lento, em razão (padrão: {DEFAULT_MIN_RATIO}).",
+    )
+    parser.add_argument(
+        "--min-steady",
+        type=int,
+        default=DEFAULT_MIN_STEADY,
+        help=f"Iterações mínimas no regime estável (padrão: {DEFAULT_MIN_STEADY}).",
+    )
+    parser.add_argument("--output", help="CSV com o resumo por célula.")
+    parser.add_argument("--runs-output", help="CSV com o resultado por execução.")
+    parser.add_argument("--top", type=int, default=15, help="Células mais caras impressas (padrão: 15).")
+    args = parser.parse_args()
+
+    samples = load_cell_samples(Path(args.csv), campaigns=args.campaign)
+    runs = detect_warmup(samples, args.metric, args.threshold, args.min_ratio, args.min_steady)
+    keys: List[str] = [c for c in ["campaign"] + CELL_KEYS if c in runs.columns]
+    cells = summarize_warmup(runs, keys)
+
+    detected = int((runs["warmup_iterations"] > 0).sum())
+    print(f"{detected} de {len(runs)} execuções com aquecimento ({detected / max(len(runs), 1):.0%}).")
+    top = cells[cells["warmup_runs"] > 0].sort_values("warmup_cost_ms", ascending=False).head(args.top)
+    if not top.empty:
+        columns = keys + ["runs", "warmup_runs", "warmup_iterations_max", "warmup_cost_ms", "steady_duration_ms"]
+        print(top[columns].to_string(index=False, float_format=lambda v: f"{v:.2f}"))
+    for path, table in [(args.output, cells), (args.runs_output, runs)]:
+        if path:
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+            table.to_csv(path, index=False)
+            print(f"Salvo em {path}")
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except Exception as exc:
+        print(f"Erro: {exc}", file=sys.stderr)
+        sys.exit(1)
@@ -0,0 +1,674 @@
+#!/usr/bin/env python3
+"""
+Gráficos por campanha (MAD/FFT) guiados por `campaign.json`.
+
+Substitui as cópias de `generate_benchmarks_charts.py` em cada pasta de
+`app/src/BANCHMARK/<campanha>/`, que só diferiam em rótulo do dispositivo,
+rótulos de batch, paleta e no formato do CSV. Cada campanha descreve isso num
+`campaign.json` pequeno:
+
+```json
+{
+  "device_label": "Moto G04s (30-11)",
+  "loader": "positional",
+  "split_x10": true
+}
+```
+
+Campos opcionais: `csv` (padrão `benchmark_results.csv`), `output` (`charts`),
+`loader` (`header`: CSV com cabeçalho e colunas obrigatórias; `positional`:
+layout completo do app lido por posição, com colunas ausentes preenchidas),
+`split_x10` (separa as execuções x10 em gráficos próprios), `batch_labels` e
+`palette`.
+
+O speedup vs CPU Kotlin leva o IC por bootstrap das iterações de `notes`
+(T/P ou `Execuções:`, via `benchmark_stats.bootstrap_speedup`) como barras de
+erro; células sem iterações ficam sem barra e `--speedup-ci none` desliga o IC.
+
+Todas as campanhas são renderizadas num único processo (tema, fontes e caches do
+Matplotlib carregados uma vez) ou num pool com `--workers N`; cada pasta
+`charts/` guarda um manifesto de figuras e só o que mudou é redesenhado.
+
+Uso:
+    python3 campaign_charts.py                      # todas as campanhas com campaign.json
+    python3 campaign_charts.py meu-s21-27-11 motog-84-30-11 --workers 4
+    python3 campaign_charts.py --plan
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from benchmark_normalize import detect_algorithms, normalize_delegates
+from benchmark_notes import explode_samples
+from benchmark_stats import DEFAULT_BOOTSTRAP_SAMPLES, bootstrap_speedup
+from chart_jobs import MANIFEST_NAME, ChartJob, lazy_import, plan_jobs, print_plan, run_jobs
+from chart_output import add_render_arguments, profile_from_args, save_figure, write_thumbnails
+from merge_benchmarks import DEFAULT_BENCHMARK_DIR
+
+# Stack de plot importado só ao desenhar a primeira figura (`--help`/`--plan` rápidos).
+plt = lazy_import("matplotlib.pyplot")
+sns = lazy_import("seaborn")
+mcontainer = lazy_import("matplotlib.container")
+
+CAMPAIGN_FILE = "campaign.json"
+LOADERS = ["header", "positional"]
+ALGORITHMS = ["MAD", "FFT"]
+TFLITE_DELEGATES = ["TFLite CPU", "TFLite GPU", "TFLite NNAPI"]
+SPEEDUP_INTERVALS = ["bootstrap", "none"]
+
+# Paleta neutra
+DEFAULT_PALETTE = {
+    "CPU Kotlin": "#4C6EF5",      # azul
+    "TFLite CPU": "#38A169",      # verde
+    "TFLite GPU": "#F6AD55",      # laranja
+    "TFLite NNAPI": "#718096",    # cinza
+}
+
+DEFAULT_BATCH_LABELS = {
+    1: "1 execução",
+    4: "Média de 4 execuções sequenciais (batch ≠ paralelismo)",
+}
+
+REQUIRED_COLUMNS = {
+    "test_name",
+    "delegate",
+    "input_size",
+    "duration_ms",
+    "duration_std_ms",
+    "transfer_ms",
+    "compute_ms",
+    "throughput_ops_per_sec",
+    "batch_size",
+    "iterations",
+}
+
+POSITIONAL_COLUMNS = [
+    "timestamp",
+    "test_name",
+    "processing_mode",
+    "delegate",
+    "data_description",
+    "input_size",
+    "duration_ms",
+    "duration_std_ms",
+    "duration_min_ms",
+    "duration_max_ms",
+    "transfer_ms",
+    "transfer_std_ms",
+    "transfer_min_ms",
+    "transfer_max_ms",
+    "compute_ms",
+    "compute_std_ms",
+    "compute_min_ms",
+    "compute_max_ms",
+    "throughput_ops_per_sec",
+    "iterations",
+    "batch_size",
+    "estimated_energy",
+    "manufacturer",
+    "model",
+    "hardware",
+    "board",
+    "soc",
+    "sdk_int",
+    "power_save",
+    "notes",
+]
+
+# (só TFLite, filtro x10, sufixo do arquivo, sufixo do título) com `split_x10`.
+X10_TIME_VARIANTS = [
+    (False, False, "", " (sem x10)"),
+    (False, True, "_x10", " (x10)"),
+    (True, False, "_tflite", " (TFLite, sem x10)"),
+    (True, True, "_tflite_x10", " (TFLite, x10)"),
+]
+
+
+class Campaign(NamedTuple):
+    name: str
+    device_label: str
+    csv_path: Path
+    charts_dir: Path
+    loader: str
+    split_x10: bool
+    batch_labels: Dict[int, str]
+    palette: Dict[str, str]
+
+
+def load_campaign(directory: Path) -> Campaign:
+    """Lê `<pasta>/campaign.json`, completando os campos opcionais."""
+    config_path = directory / CAMPAIGN_FILE
+    if not config_path.exists():
+        raise FileNotFoundError(f"{CAMPAIGN_FILE} não encontrado em {directory}")
+    config = json.loads(config_path.read_text(encoding="utf-8"))
+    if "device_label" not in config:
+        raise ValueError(f"{config_path}: campo obrigatório 'device_label' ausente")
+    loader = config.get("loader", "header")
+    if loader not in LOADERS:
+        raise ValueError(f"{config_path}: loader desconhecido {loader!r} (use {', '.join(LOADERS)})")
+    batch_labels = config.get("batch_labels")
+    return Campaign(
+        name=directory.name,
+        device_label=config["device_label"],
+        csv_path=directory / config.get("csv", "benchmark_results.csv"),
+        charts_dir=directory / config.get("output", "charts"),
+        loader=loader,
+        split_x10=bool(config.get("split_x10", False)),
+        batch_labels=(
+            {int(k): v for k, v in batch_labels.items()} if batch_labels else dict(DEFAULT_BATCH_LABELS)
+        ),
+        palette={**DEFAULT_PALETTE, **config.get("palette", {})},
+    )
+
+
+def discover_campaigns(root: Path = DEFAULT_BENCHMARK_DIR) -> List[Path]:
+    return sorted(path.parent for path in root.glob(f"*/{CAMPAIGN_FILE}"))
+
+
+def resolve_campaign(spec: str, root: Path = DEFAULT_BENCHMARK_DIR) -> Path:
+    """Aceita o nome da pasta (relativo a `root`) ou um caminho."""
+    path = Path(spec)
+    if (path / CAMPAIGN_FILE).exists():
+        return path
+    if (root / spec / CAMPAIGN_FILE).exists():
+        return root / spec
+    raise FileNotFoundError(f"Campanha sem {CAMPAIGN_FILE}: {spec}")
+
+
+def _read_header(path: Path) -> pd.DataFrame:
+    df = pd.read_csv(path)
+    missing = REQUIRED_COLUMNS.difference(df.columns)
+    if missing:
+        raise ValueError(f"CSV faltando colunas: {missing}")
+    return df
+
+
+def _read_positional(path: Path) -> pd.DataFrame:
+    df = pd.read_csv(path, names=POSITIONAL_COLUMNS, skiprows=1, engine="python")
+    df.columns = [c.strip() for c in df.columns]
+
+    # Preenche colunas que podem nao existir (dados simples do Moto G04s)
+    defaults = {
+        "duration_std_ms": 0.0,
+        "transfer_ms": 0.0,
+        "compute_ms": 0.0,
+        "throughput_ops_per_sec": 0.0,
+        "batch_size": 1,
+        "iterations": 1,
+    }
+    for col, value in defaults.items():
+        if col not in df.columns:
+            df[col] = value
+
+    numeric_cols = [
+        "input_size",
+        "duration_ms",
+        "duration_std_ms",
+        "transfer_ms",
+        "transfer_std_ms",
+        "compute_ms",
+        "compute_std_ms",
+        "throughput_ops_per_sec",
+        "batch_size",
+        "iterations",
+    ]
+    for col in numeric_cols:
+        df[col] = pd.to_numeric(df[col], errors="coerce")
+    df["batch_size"] = df["batch_size"].fillna(1).astype(int)
+    df["iterations"] = df["iterations"].fillna(1).astype(int)
+    return df
+
+
+def load_data(campaign: Campaign) -> pd.DataFrame:
+    df = _read_positional(campaign.csv_path) if campaign.loader == "positional" else _read_header(campaign.csv_path)
+    # Mesma normalização do store (benchmark_normalize); o nome do teste TFLite
+    # vence `delegate` nas campanhas antigas que gravam `delegate=CPU`.
+    df["delegate"] = normalize_delegates(df["delegate"], df["test_name"]).astype(object)
+    df["algorithm"] = detect_algorithms(df["test_name"]).astype(object)  # MAD, FFT ou Outro
+    df["is_x10"] = df["test_name"].str.contains("x10")
+    # Mantemos batch=1 e 4
+    df = df[df["batch_size"].isin([1, 4])]
+
+    labels = df["batch_size"].map(lambda size: campaign.batch_labels.get(size, f"batch={size}"))
+    if campaign.split_x10:
+        labels = labels.where(~df["is_x10"], "x10 (" + labels + ")")
+    return df.assign(batch_label=labels)
+
+
+def _group_keys(campaign: Campaign) -> List[str]:
+    keys = ["algorithm", "input_size", "batch_size", "batch_label"]
+    return keys + ["is_x10"] if campaign.split_x10 else keys
+
+
+def aggregate(df: pd.DataFrame, campaign: Campaign) -> pd.DataFrame:
+    keys = _group_keys(campaign)
+    return (
+        df.groupby(keys[:1] + ["delegate"] + keys[1:])
+        .agg(
+            duration_mean=("duration_ms", "mean"),
+            duration_std=("duration_ms", "std"),
+            transfer_mean=("transfer_ms", "mean"),
+            transfer_std=("transfer_ms", "std"),
+            compute_mean=("compute_ms", "mean"),
+        )
+        .reset_index()
+    )
+
+
+def speedup_intervals(
+    raw: pd.DataFrame, campaign: Campaign, n_boot: int = DEFAULT_BOOTSTRAP_SAMPLES
+) -> Optional[pd.DataFrame]:
+    """IC do speedup por célula, reamostrando as iterações de `notes` (None sem `notes`)."""
+    if "notes" not in raw.columns:
+        return None
+    keys = _group_keys(campaign)
+    samples = explode_samples(raw, keys + ["delegate"]).dropna(subset=keys + ["delegate"])
+    intervals = bootstrap_speedup(samples, keys, by="delegate", n_boot=n_boot)
+    return intervals[keys + ["delegate", "speedup_low", "speedup_high"]]
+
+
+def compute_speedup(
+    df: pd.DataFrame, campaign: Campaign, intervals: Optional[pd.DataFrame] = None
+) -> pd.DataFrame:
+    keys = _group_keys(campaign)
+    cpu = df[df["delegate"] == "CPU Kotlin"][keys + ["duration_mean"]].rename(
+        columns={"duration_mean": "cpu_duration"}
+    )
+    merged = df.merge(cpu, on=keys)
+    merged["speedup"] = merged["cpu_duration"] / merged["duration_mean"]
+    merged = merged[merged["delegate"] != "CPU Kotlin"]
+    if intervals is not None:
+        merged = merged.merge(intervals, on=keys + ["delegate"], how="left")
+    return merged
+
+
+def ensure_colors(delegates: Iterable[str], palette: Dict[str, str]) -> dict:
+    return {d: palette.get(d, "#333333") for d in delegates}
+
+
+def plot_time_lines(data: pd.DataFrame, campaign: Campaign, algorithm: str, title_suffix: str, output: Path) -> None:
+    colors = ensure_colors(data["delegate"].unique(), campaign.palette)
+    plt.figure(figsize=(11, 5))
+    ax = sns.lineplot(
+        data=data,
+        x="input_size",
+        y="duration_mean",
+        hue="delegate",
+        style="batch_label",
+        markers=True,
+        dashes=False,
+        palette=colors,
+        linewidth=2,
+        markersize=8,
+    )
+    for (_, _), sub in data.groupby(["delegate", "batch_label"]):
+        ax.errorbar(
+            sub["input_size"],
+            sub["duration_mean"],
+            yerr=sub["duration_std"],
+            fmt="none",
+            ecolor="black",
+            alpha=0.2,
+            capsize=4,
+        )
+    ax.set_title(
+        f"{algorithm} — Tempo total médio vs tamanho (ms) — {campaign.device_label}{title_suffix}",
+        fontsize=13,
+        weight="bold",
+    )
+    ax.set_xlabel("Tamanho em pontos")
+    ax.set_ylabel("Tempo total médio (ms)")
+    ax.grid(True, linestyle="--", alpha=0.4)
+    ax.legend(
+        title="Delegate / Execuções",
+        bbox_to_anchor=(1.02, 0.5),
+        loc="center left",
+        borderaxespad=0,
+    )
+    plt.tight_layout()
+    save_figure(plt, output)
+    plt.close()
+
+
+def plot_transfer(data: pd.DataFrame, campaign: Campaign, algorithm: str, output: Path) -> None:
+    data = data.copy()
+    # CPU e TFLite CPU sem custo de transferencia
+    data.loc[data["delegate"].isin(["CPU Kotlin", "TFLite CPU"]), "transfer_mean"] = 0.0
+    data["transfer_ratio"] = np.where(
+        data["duration_mean"] > 0,
+        data["transfer_mean"] / data["duration_mean"],
+        0.0,
+    )
+    colors = ensure_colors(data["delegate"].unique(), campaign.palette)
+    size_order = sorted(data["input_size"].unique())
+    hue_order = list(colors)
+    g = sns.catplot(
+        data=data,
+        x="input_size",
+        y="transfer_mean",
+        hue="delegate",
+        col="batch_label",
+        kind="bar",
+        order=size_order,
+        hue_order=hue_order,
+        palette=colors,
+        height=4,
+        aspect=1.1,
+    )
+    g.set_axis_labels("Tamanho em pontos", "Tempo de transferência (ms)")
+    g.fig.suptitle(
+        f"{algorithm} — Custo de transferência (GPU/NNAPI) — {campaign.device_label}",
+        y=1.05,
+        fontsize=13,
+        weight="bold",
+    )
+    g.set_titles("{col_name}")
+
+    # Anota porcentagem usando as barras (evita distorcer limites do eixo):
+    # um bar_label por delegate. Os containers seguem hue_order; cada barra é
+    # ligada ao seu tamanho pela posição no eixo x (categorias 0..n-1).
+    for batch_label, ax in g.axes_dict.items():
+        ratios = (
+            data[data["batch_label"] == batch_label]
+            .pivot_table(index="input_size", columns="delegate", values="transfer_ratio")
+            .reindex(index=size_order, columns=hue_order)
+        )
+        for container, delegate in zip(ax.containers, hue_order):
+            bars = [bar for bar in container if bar is not None]
+            if not bars:
+                continue
+            positions = np.rint([bar.get_x() + bar.get_width() / 2 for bar in bars]).astype(int)
+            heights = np.array([bar.get_height() for bar in bars])
+            ratio = ratios[delegate].to_numpy()[positions] * 100
+            labels = [f"{r:.1f}%" if h > 0 else "" for r, h in zip(ratio, heights)]
+            ax.bar_label(
+                mcontainer.BarContainer(bars, datavalues=heights, orientation="vertical"),
+                labels=labels,
+                padding=2,
+                fontsize=9,
+                color="black",
+            )
+        ax.grid(True, axis="y", linestyle="--", alpha=0.4)
+
+    if g._legend:
+        g._legend.set_bbox_to_anchor((1.02, 0.5))
+        g._legend.set_loc("center left")
+        g._legend.set_title("Delegate")
+
+    plt.tight_layout()
+    save_figure(g, output)
+    plt.close(g.fig)
+
+
+def speedup_errorbars(ax, data: pd.DataFrame, size_order: List, hue_order: List[str]) -> None:
+    """Barras de erro do IC (`speedup_low`/`speedup_high`) sobre as barras de um painel.
+
+    Como no rótulo de `plot_transfer`: um container por delegate (`hue_order`) e
+    cada barra ligada ao seu tamanho pela posição no eixo x; um `errorbar` por painel.
+    """
+    bounds = data.set_index(["input_size", "delegate"])[["speedup_low", "speedup_high"]]
+    x: List[float] = []
+    y: List[float] = []
+    low: List[float] = []
+    high: List[float] = []
+    for container, delegate in zip(ax.containers, hue_order):
+        for bar in container:
+            center = bar.get_x() + bar.get_width() / 2
+            key = (size_order[int(round(center))], delegate)
+            if key not in bounds.index:
+                continue
+            lo, hi = bounds.loc[key]
+            if pd.isna(lo):
+                continue
+            height = bar.get_height()
+            x.append(center)
+            y.append(height)
+            low.append(max(height - lo, 0.0))
+            high.append(max(hi - height, 0.0))
+    if x:
+        ax.errorbar(x, y, yerr=[low, high], fmt="none", ecolor="black", elinewidth=0.8, capsize=3)
+
+
+def plot_speedup(data: pd.DataFrame, campaign: Campaign, algorithm: str, output: Path) -> None:
+    colors = ensure_colors(data["delegate"].unique(), campaign.palette)
+    size_order = sorted(data["input_size"].unique())
+    hue_order = list(colors)
+    g = sns.catplot(
+        data=data,
+        x="input_size",
+        y="speedup",
+        hue="delegate",
+        col="batch_label",
+        kind="bar",
+        order=size_order,
+        hue_order=hue_order,
+        palette=colors,
+        height=4,
+        aspect=1.1,
+    )
+    g.set_axis_labels("Tamanho em pontos", "Speedup vs CPU Kotlin (×)")
+    g.fig.suptitle(
+        f"{algorithm} — Speedup vs CPU Kotlin — {campaign.device_label}",
+        y=1.05,
+        fontsize=13,
+        weight="bold",
+    )
+    g.set_titles("{col_name}")
+    with_ci = "speedup_low" in data.columns and data["speedup_low"].notna().any()
+    for batch_label, ax in g.axes_dict.items():
+        if with_ci:
+            speedup_errorbars(ax, data[data["batch_label"] == batch_label], size_order, hue_order)
+        ax.grid(True, axis="y", linestyle="--", alpha=0.4)
+    if g._legend:
+        g._legend.set_bbox_to_anchor((1.02, 0.5))
+        g._legend.set_loc("center left")
+        g._legend.set_title("Delegate")
+    plt.tight_layout()
+    save_figure(g, output)
+    plt.close(g.fig)
+
+
+def plot_stacked_fft(subset: pd.DataFrame, campaign: Campaign, batch_label: str, output: Path) -> None:
+    colors = ensure_colors(subset["delegate"].unique(), campaign.palette)
+    # Ordena por input_size e garante alinhamento por delegate.
+    input_sizes = sorted(subset["input_size"].unique())
+    delegates = ["CPU Kotlin"] + TFLITE_DELEGATES
+    delegates = [d for d in delegates if d in subset["delegate"].unique()]
+    width = 0.18
+    x = np.arange(len(input_sizes))
+    fig, ax = plt.subplots(figsize=(10, 5))
+    for i, delegate in enumerate(delegates):
+        sub = subset[subset["delegate"] == delegate].set_index("input_size")
+        transfer_vals = [sub.loc[size, "transfer_mean"] if size in sub.index else 0 for size in input_sizes]
+        compute_vals = [sub.loc[size, "compute_mean"] if size in sub.index else 0 for size in input_sizes]
+        ax.bar(
+            x + i * width,
+            transfer_vals,
+            width=width,
+            label=f"{delegate} - Transferência",
+            color="#CBD5E0",
+        )
+        ax.bar(
+            x + i * width,
+            compute_vals,
+            width=width,
+            bottom=transfer_vals,
+            label=f"{delegate} - Processamento",
+            color=colors.get(delegate, "#333333"),
+        )
+    ax.set_xticks(x + width * (len(delegates) - 1) / 2)
+    ax.set_xticklabels(input_sizes)
+    ax.set_xlabel("Tamanho em pontos")
+    ax.set_ylabel("Tempo (ms)")
+    ax.set_title(
+        f"FFT — Tempo empilhado (transferência + processamento)\n{batch_label} — {campaign.device_label}",
+        fontsize=13,
+        weight="bold",
+    )
+    ax.grid(True, axis="y", linestyle="--", alpha=0.4)
+    ax.legend(bbox_to_anchor=(1.02, 0.5), loc="center left")
+    plt.tight_layout()
+    save_figure(plt, output)
+    plt.close(fig)
+
+
+def print_summary(df: pd.DataFrame, campaign: Campaign) -> None:
+    cols = [
+        "algorithm",
+        "delegate",
+        "input_size",
+        "batch_label",
+        "duration_mean",
+        "duration_std",
+        "transfer_mean",
+        "compute_mean",
+    ]
+    summary = df[cols].sort_values(["algorithm", "input_size", "delegate", "batch_label"])
+    print(f"\nResumo (ms) — {campaign.device_label}:")
+    print(summary.to_string(index=False, float_format=lambda x: f"{x:,.3f}"))
+
+
+def campaign_jobs(
+    campaign: Campaign, df: pd.DataFrame, intervals: Optional[pd.DataFrame] = None
+) -> List[ChartJob]:
+    """Um job por figura da campanha, a partir do agregado (`aggregate`) e do IC do speedup."""
+    out = campaign.charts_dir
+    jobs: List[ChartJob] = []
+    for algo in ALGORITHMS:
+        data = df[df["algorithm"] == algo]
+        if campaign.split_x10:
+            variants = X10_TIME_VARIANTS
+        else:
+            variants = [(False, None, "", "")]
+        for only_tflite, only_x10, filename_suffix, title_suffix in variants:
+            subset = data
+            if only_tflite:
+                subset = subset[subset["delegate"].isin(TFLITE_DELEGATES)]
+            if only_x10 is not None:
+                subset = subset[subset["is_x10"] == only_x10]
+            if subset.empty:
+                continue
+            jobs.append(
+                ChartJob(
+                    plot_time_lines,
+                    (subset, campaign, algo, title_suffix, out / f"{algo.lower()}_tempo{filename_suffix}.png"),
+                    out / f"{algo.lower()}_tempo{filename_suffix}.png",
+                )
+            )
+        jobs.append(
+            ChartJob(plot_transfer, (data, campaign, algo, out / f"{algo.lower()}_transfer.png"),
+                     out / f"{algo.lower()}_transfer.png")
+        )
+
+    speed = compute_speedup(df, campaign, intervals)
+    for algo in ALGORITHMS:
+        jobs.append(
+            ChartJob(plot_speedup, (speed[speed["algorithm"] == algo], campaign, algo, out / f"{algo.lower()}_speedup.png"),
+                     out / f"{algo.lower()}_speedup.png")
+        )
+
+    for batch_label, subset in df[df["algorithm"] == "FFT"].groupby("batch_label"):
+        name = f"fft_empilhado_{batch_label.replace(' ', '_').replace('execuções', 'exec')}.png"
+        jobs.append(ChartJob(plot_stacked_fft, (subset, campaign, batch_label, out / name), out / name))
+    return jobs
+
+
+def init_worker() -> None:
+    sns.set_theme(context="talk", style="whitegrid")
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Gera os gráficos por campanha (MAD/FFT) descritos em campaign.json."
+    )
+    parser.add_argument(
+        "campaigns",
+        nargs="*",
+        help=f"Pastas de campanha (nome em --root ou caminho). Sem argumentos: todas com {CAMPAIGN_FILE}.",
+    )
+    parser.add_argument(
+        "--root",
+        default=str(DEFAULT_BENCHMARK_DIR),
+        help="Diretório com as pastas de campanha.",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help=f"Processos para renderizar os gráficos em paralelo (ex.: {os.cpu_count() or 1}).",
+    )
+    parser.add_argument(
+        "--plan",
+        action="store_true",
+        help="Só lista as figuras (novas, alteradas, atuais, obsoletas), sem desenhar nem importar o Matplotlib.",
+    )
+    parser.add_argument(
+        "--quiet",
+        action="store_true",
+        help="Não imprime a tabela de resumo de cada campanha.",
+    )
+    parser.add_argument(
+        "--speedup-ci",
+        choices=SPEEDUP_INTERVALS,
+        default="bootstrap",
+        help="IC do speedup: bootstrap das iterações de notes (padrão) ou none.",
+    )
+    parser.add_argument(
+        "--bootstrap-samples",
+        type=int,
+        default=DEFAULT_BOOTSTRAP_SAMPLES,
+        help=f"Reamostragens do IC do speedup (padrão: {DEFAULT_BOOTSTRAP_SAMPLES}).",
+    )
+    add_render_arguments(parser)
+    args = parser.parse_args(argv)
+
+    root = Path(args.root)
+    directories = [resolve_campaign(spec, root) for spec in args.campaigns] or discover_campaigns(root)
+    if not directories:
+        raise FileNotFoundError(f"Nenhuma campanha com {CAMPAIGN_FILE} em {root}")
+
+    profile = profile_from_args(args)
+    jobs: List[ChartJob] = []
+    manifests: List[Path] = []
+    for directory in directories:
+        campaign = load_campaign(directory)
+        raw = load_data(campaign)
+        df = aggregate(raw, campaign)
+        intervals = (
+            speedup_intervals(raw, campaign, args.bootstrap_samples) if args.speedup_ci == "bootstrap" else None
+        )
+        if not (args.quiet or args.plan):
+            print_summary(df, campaign)
+        jobs.extend(campaign_jobs(campaign, df, intervals))
+        manifests.append(campaign.charts_dir / MANIFEST_NAME)
+
+    if args.plan:
+        print_plan(plan_jobs(jobs, manifests, profile))
+        return
+    rendered = run_jobs(jobs, args.workers, init_worker, manifest=manifests, profile=profile)
+    print(
+        f"\n{len(directories)} campanha(s): {rendered} figuras renderizadas com "
+        f"{max(args.workers, 1)} processo(s); {len(jobs) - rendered} inalteradas."
+    )
+    if args.thumbnails:
+        for manifest in manifests:
+            sheet = write_thumbnails([job.output for job in jobs], manifest.parent, profile)
+            if sheet:
+                print(f"Miniaturas em {sheet}")
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except Exception as exc:
+        print(f"Erro: {exc}", file=sys.stderr)
+        sys.exit(1)
@@ -0,0 +1,354 @@
+"""
+Renderização paralela de gráficos: cada figura vira um `ChartJob` independente.
+
+Um job guarda a função de plot (nível de módulo, para ser serializável), os
+argumentos já recortados (apenas as linhas agregadas daquela figura) e o arquivo
+de saída. `run_jobs` executa em série com `workers <= 1` e, caso contrário, num
+pool de processos; cada processo desenha e salva suas figuras sem compartilhar
+estado do Matplotlib.
+
+Com `manifest`, cada figura registra uma impressão digital (SHA-256) dos dados
+recortados, dos demais argumentos e do código-fonte do script que a desenha
+(onde ficam paleta, títulos e dpi) e dos módulos do repositório de que ele
+depende (ex.: `benchmark_normalize`, `benchmark_stats`, `chart_output`). Ao rodar de novo, jobs com a mesma impressão
+digital e arquivo ainda presente são pulados, e figuras que deixaram de existir
+(ex.: dispositivo removido) são apagadas.
+
+O stack de plot (Matplotlib/seaborn) é importado sob demanda via `lazy_import`:
+montar jobs, calcular impressões digitais e `plan_jobs` (o `--plan` dos scripts)
+não o carregam; só a primeira figura desenhada paga a importação.
+
+Exemplo:
+
+```python
+jobs = [ChartJob(plot_speedup, (subset, device, "FFT", out_dir), out_dir / "speedup_FFT.png")]
+run_jobs(jobs, workers=4, initializer=init_worker)
+```
+"""
+
+from __future__ import annotations
+
+import hashlib
+import importlib
+import inspect
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from chart_output import RenderProfile, output_path, use_profile
+
+REPO_DIR = Path(__file__).resolve().parent
+MPL_CACHE = Path(__file__).parent / ".matplotlib"
+MANIFEST_NAME = ".charts.manifest.json"
+# Agregados de colunas float32 variam na 7ª casa conforme os demais grupos do
+# frame; a impressão digital usa 6 algarismos significativos (muito além do que
+# aparece num gráfico).
+FINGERPRINT_DIGITS = 6
+
+
+def configure_matplotlib() -> None:
+    """Cache local do Matplotlib (evita escrita em ~/.matplotlib) e backend Agg."""
+    os.environ.setdefault("MPLCONFIGDIR", str(MPL_CACHE))
+    Path(os.environ["MPLCONFIGDIR"]).mkdir(parents=True, exist_ok=True)
+    import matplotlib
+
+    matplotlib.use("Agg")
+
+
+class LazyModule:
+    """Módulo importado no primeiro acesso a atributo (ex.: `plt.figure`)."""
+
+    def __init__(self, name: str) -> None:
+        self._name = name
+        self._module: Any = None
+
+    def __getattr__(self, attr: str) -> Any:
+        if self._module is None:
+            if self._name.split(".")[0] in ("matplotlib", "seaborn"):
+                configure_matplotlib()
+            self._module = importlib.import_module(self._name)
+        return getattr(self._module, attr)
+
+    def __repr__(self) -> str:
+        state = "carregado" if self._module is not None else "pendente"
+        return f"<LazyModule {self._name} ({state})>"
+
+
+def lazy_import(name: str) -> LazyModule:
+    return LazyModule(name)
+
+
+class ChartJob(NamedTuple):
+    func: Callable[..., None]
+    args: Tuple[Any, ...]
+    output: Path
+
+
+def render(job: ChartJob, profile: Optional[RenderProfile] = None) -> Path:
+    """Desenha o job no perfil de saída dado (chart_output.py; padrão: PNG 300 dpi)."""
+    use_profile(profile)
+    job.output.parent.mkdir(parents=True, exist_ok=True)
+    job.func(*job.args)
+    return output_path(job.output, profile)
+
+
+@lru_cache(maxsize=None)
+def _source_digest(path: str) -> str:
+    return hashlib.sha256(Path(path).read_bytes()).hexdigest()
+
+
+def _repo_module(obj: Any) -> Optional[str]:
+    """Nome do módulo do repositório que define `obj` (módulo, função ou classe)."""
+    if inspect.ismodule(obj):
+        name = obj.__name__
+    elif inspect.isfunction(obj) or inspect.isclass(obj):
+        name = obj.__module__
+    else:
+        return None
+    path = getattr(sys.modules.get(name), "__file__", None)
+    return name if path and Path(path).resolve().parent == REPO_DIR else None
+
+
+@lru_cache(maxsize=None)
+def _dependency_digest(module_name: str) -> str:
+    """Fontes do módulo e dos módulos do repositório que ele usa (fecho transitivo).
+
+    Segue os globais de cada módulo (imports de módulo, funções e classes); objetos
+    como `LazyModule` não são tocados, então o Matplotlib continua sem importar.
+    """
+    seen = {module_name}
+    pending = [module_name]
+    while pending:
+        module = sys.modules[pending.pop()]
+        for value in list(vars(module).values()):
+            name = _repo_module(value)
+            if name is not None and name not in seen:
+                seen.add(name)
+                pending.append(name)
+    digest = hashlib.sha256()
+    for path in sorted(str(Path(sys.modules[name].__file__).resolve()) for name in seen):
+        digest.update(Path(path).name.encode())
+        digest.update(_source_digest(path).encode())
+    return digest.hexdigest()
+
+
+def _significant(values: pd.Series) -> pd.Series:
+    data = values.to_numpy(dtype="float64", na_value=np.nan)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        scale = 10.0 ** (np.floor(np.log10(np.abs(data))) - (FINGERPRINT_DIGITS - 1))
+        rounded = np.where(np.isfinite(scale) & (scale > 0), np.round(data / scale) * scale, data)
+    return pd.Series(rounded, index=values.index, name=values.name)
+
+
+def _update(digest: Any, value: Any) -> None:
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        frame = value.to_frame() if isinstance(value, pd.Series) else value
+        floats = frame.select_dtypes("floating").columns
+        if len(floats):
+            frame = frame.assign(**{str(c): _significant(frame[c]) for c in floats})
+        digest.update(repr(list(frame.columns)).encode())
+        digest.update(pd.util.hash_pandas_object(frame, index=False).to_numpy().tobytes())
+    elif isinstance(value, np.ndarray):
+        # `repr` de arrays grandes é truncado ("..."): usa os bytes.
+        data = np.ascontiguousarray(value)
+        if data.dtype.kind == "f":
+            data = _significant(pd.Series(data.ravel())).to_numpy().reshape(data.shape)
+        digest.update(repr((data.dtype.str, data.shape)).encode())
+        digest.update(data.tobytes() if data.dtype != object else repr(data.tolist()).encode())
+    elif isinstance(value, pd.Index):
+        digest.update(pd.util.hash_pandas_object(value).to_numpy().tobytes())
+    elif isinstance(value, dict):
+        for key, item in value.items():
+            _update(digest, key)
+            _update(digest, item)
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            _update(digest, item)
+    else:
+        digest.update(repr(value).encode())
+    digest.update(b"\0")
+
+
+def job_fingerprint(job: ChartJob, profile: Optional[RenderProfile] = None) -> str:
+    digest = hashlib.sha256()
+    if profile is not None:
+        digest.update(repr(tuple(profile)).encode())
+    # Os arquivos-fonte identificam o código: `__module__` vira "__main__" quando o
+    # script roda direto e o nome real quando importado (ex.: por charts.py), mas
+    # o conjunto de arquivos é o mesmo nos dois casos.
+    digest.update(job.func.__qualname__.encode())
+    digest.update(_dependency_digest(job.func.__module__).encode())
+    _update(digest, job.args)
+    return digest.hexdigest()
+
+
+def load_manifest(path: Path) -> Dict[str, str]:
+    if not path.exists():
+        return {}
+    try:
+        return json.loads(path.read_text(encoding="utf-8")).get("figures", {})
+    except (OSError, ValueError):
+        return {}
+
+
+def save_manifest(path: Path, figures: Dict[str, str]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + ".tmp")
+    tmp_path.write_text(json.dumps({"figures": figures}, indent=2, sort_keys=True), encoding="utf-8")
+    tmp_path.replace(path)
+
+
+def _remove_stale(root: Path, path: Path) -> None:
+    """Apaga a figura e as pastas que ficarem vazias até `root`."""
+    path.unlink(missing_ok=True)
+    parent = path.parent
+    while parent != root and parent.is_dir() and not any(parent.iterdir()):
+        parent.rmdir()
+        parent = parent.parent
+
+
+def _owner(job: ChartJob, manifests: Sequence[Path]) -> Optional[Path]:
+    """Manifesto mais específico cuja pasta contém a saída do job."""
+    for manifest in manifests:
+        if job.output.is_relative_to(manifest.parent):
+            return manifest
+    return None
+
+
+class _Plan(NamedTuple):
+    manifests: List[Path]
+    previous: Dict[Path, Dict[str, str]]
+    current: Dict[Path, Dict[str, str]]
+    # (manifesto dono, chave relativa, job, situação)
+    entries: List[Tuple[Optional[Path], str, ChartJob, str]]
+    stale: List[Tuple[Path, str]]
+
+
+def _classify(
+    jobs: Sequence[ChartJob],
+    manifest: Union[Path, Sequence[Path], None],
+    profile: Optional[RenderProfile],
+) -> _Plan:
+    if manifest is None:
+        manifests: List[Path] = []
+    elif isinstance(manifest, Path):
+        manifests = [manifest]
+    else:
+        manifests = sorted(manifest, key=lambda m: len(m.parent.parts), reverse=True)
+
+    previous = {m: load_manifest(m) for m in manifests}
+    current: Dict[Path, Dict[str, str]] = {m: {} for m in manifests}
+    entries: List[Tuple[Optional[Path], str, ChartJob, str]] = []
+    for job in jobs:
+        owner = _owner(job, manifests)
+        output = output_path(job.output, profile)
+        if owner is None:
+            entries.append((None, str(output), job, "sem manifesto"))
+            continue
+        key = str(output.relative_to(owner.parent))
+        current[owner][key] = job_fingerprint(job, profile)
+        if key not in previous[owner] or not output.exists():
+            status = "nova"
+        elif previous[owner][key] != current[owner][key]:
+            status = "alterada"
+        else:
+            status = "atual"
+        entries.append((owner, key, job, status))
+    # Só figuras do formato atual ficam obsoletas: gerar SVG não apaga os PNGs.
+    suffix = output_path(Path("x"), profile).suffix
+    stale = [
+        (m, key)
+        for m in manifests
+        for key in sorted(previous[m].keys() - current[m].keys())
+        if Path(key).suffix == suffix
+    ]
+    return _Plan(manifests, previous, current, entries, stale)
+
+
+def plan_jobs(
+    jobs: Sequence[ChartJob],
+    manifest: Union[Path, Sequence[Path], None] = None,
+    profile: Optional[RenderProfile] = None,
+) -> List[Tuple[str, Path]]:
+    """Situação de cada figura sem renderizar nada (nem importar o Matplotlib).
+
+    `nova`/`alterada`/`sem manifesto` seriam desenhadas por `run_jobs`, `atual`
+    seria pulada e `obsoleta` (no manifesto, sem job) seria apagada.
+    """
+    plan = _classify(jobs, manifest, profile)
+    rows = [(status, output_path(job.output, profile)) for _, _, job, status in plan.entries]
+    rows += [("obsoleta", m.parent / key) for m, key in plan.stale]
+    return rows
+
+
+def print_plan(rows: Sequence[Tuple[str, Path]]) -> None:
+    for status, path in rows:
+        print(f"{status:<13} {path}")
+    counts: Dict[str, int] = {}
+    for status, _ in rows:
+        counts[status] = counts.get(status, 0) + 1
+    print(", ".join(f"{n} {status}" for status, n in sorted(counts.items())) or "Nenhuma figura.")
+
+
+def run_jobs(
+    jobs: Sequence[ChartJob],
+    workers: int = 1,
+    initializer: Optional[Callable[[], None]] = None,
+    manifest: Union[Path, Sequence[Path], None] = None,
+    profile: Optional[RenderProfile] = None,
+) -> int:
+    """Renderiza os jobs; retorna quantas figuras foram (re)desenhadas.
+
+    `initializer` roda uma vez por processo (ex.: `sns.set_theme`), já que o tema
+    configurado no processo principal não é herdado quando o pool usa `spawn`.
+    Com `manifest` (um ou vários, ex.: um por família de gráficos), só entram
+    jobs cuja impressão digital mudou; cada job pertence ao manifesto mais
+    específico que contém sua saída e os caminhos são guardados relativos à
+    pasta dele. Jobs fora de qualquer manifesto sempre são renderizados.
+    `profile` (chart_output.RenderProfile) escolhe formato/dpi; entradas do
+    manifesto em outros formatos são preservadas.
+    """
+    plan = _classify(jobs, manifest, profile)
+    pending = [(owner, key, job) for owner, key, job, status in plan.entries if status != "atual"]
+    for m, key in plan.stale:
+        _remove_stale(m.parent, m.parent / key)
+
+    # Mantém entradas ainda válidas e as de outros formatos (ex.: PNG ao gerar SVG).
+    suffix = output_path(Path("x"), profile).suffix
+    done = {
+        m: {
+            k: v
+            for k, v in plan.previous[m].items()
+            if k in plan.current[m] or Path(k).suffix != suffix
+        }
+        for m in plan.manifests
+    }
+
+    def _record(owner: Optional[Path], key: str) -> None:
+        if owner is not None:
+            done[owner][key] = plan.current[owner][key]
+
+    try:
+        if workers <= 1 or len(pending) <= 1:
+            if initializer is not None and pending:
+                initializer()
+            for owner, key, job in pending:
+                render(job, profile)
+                _record(owner, key)
+        else:
+            with ProcessPoolExecutor(max_workers=workers, initializer=initializer) as pool:
+                futures = {pool.submit(render, job, profile): (owner, key) for owner, key, job in pending}
+                for future in as_completed(futures):
+                    future.result()
+                    _record(*futures[future])
+    finally:
+        for m in plan.manifests:
+            save_manifest(m, done[m])
+    return len(pending)
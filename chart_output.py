@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Perfis de saída dos gráficos: formato, dpi e pós-processamento.
+
+Os scripts salvam as figuras com `save_figure(fig, caminho)` em vez de
+`savefig(..., dpi=300)`; o perfil ativo decide o formato (a extensão do caminho
+é trocada), o dpi e se o PNG passa por otimização sem perdas:
+
+- `print` (padrão): PNG a 300 dpi, como antes.
+- `preview`: PNG a 80 dpi, para iterar rápido (mesmos nomes de arquivo).
+- `svg` / `pdf`: saída vetorial para os documentos do TCC, sem data embutida
+  (arquivos reprodutíveis).
+
+`--optimize-png` recomprime cada PNG sem perda (descarta o canal alfa quando a
+figura é opaca e usa Pillow `optimize=True`) e `--thumbnails` grava uma folha de miniaturas
+(`thumbnails.png`) por pasta de saída. `run_jobs` (chart_jobs.py) aplica o perfil
+em cada processo do pool.
+
+Também funciona sobre PNGs já existentes (ex.: `Figuras/`):
+    python3 chart_output.py optimize Figuras app/src/BANCHMARK/merge-30-11-08-12/charts
+    python3 chart_output.py thumbnails app/src/BANCHMARK/merge-30-11-08-12/charts
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+from typing import Any, Iterable, List, NamedTuple, Optional, Sequence
+
+PROFILE_NAMES = ["print", "preview", "svg", "pdf"]
+DEFAULT_PROFILE = "print"
+THUMBNAIL_SHEET = "thumbnails.png"
+THUMBNAIL_WIDTH = 360
+THUMBNAIL_COLUMNS = 4
+
+
+class RenderProfile(NamedTuple):
+    name: str
+    format: str
+    dpi: int
+    optimize: bool = False
+
+
+PROFILES = {
+    "print": RenderProfile("print", "png", 300),
+    "preview": RenderProfile("preview", "png", 80),
+    "svg": RenderProfile("svg", "svg", 300),
+    "pdf": RenderProfile("pdf", "pdf", 300),
+}
+
+_active = PROFILES[DEFAULT_PROFILE]
+
+
+def use_profile(profile: Optional[RenderProfile]) -> None:
+    global _active
+    _active = profile or PROFILES[DEFAULT_PROFILE]
+
+
+def active_profile() -> RenderProfile:
+    return _active
+
+
+def output_path(path: Path, profile: Optional[RenderProfile] = None) -> Path:
+    """Caminho real da figura no perfil (troca só a extensão)."""
+    return path.with_suffix(f".{(profile or _active).format}")
+
+
+def save_figure(figure: Any, path: Path, **kwargs: Any) -> Path:
+    """`savefig` com o perfil ativo; `figure` pode ser Figure, FacetGrid ou `plt`."""
+    profile = _active
+    target = output_path(Path(path), profile)
+    kwargs.setdefault("dpi", profile.dpi)
+    if profile.format in ("svg", "pdf"):
+        # Sem data de criação: o mesmo gráfico gera o mesmo arquivo.
+        kwargs.setdefault("metadata", {"Date": None} if profile.format == "svg" else {"CreationDate": None})
+    if profile.format == "svg":
+        import matplotlib
+
+        # Os ids de clipPath/path do SVG saem de um hash com sal aleatório.
+        with matplotlib.rc_context({"svg.hashsalt": "benchmarks"}):
+            figure.savefig(target, **kwargs)
+    else:
+        figure.savefig(target, **kwargs)
+    if profile.optimize and profile.format == "png":
+        optimize_png(target)
+    return target
+
+
+def optimize_png(path: Path) -> int:
+    """Recomprime o PNG sem perdas; retorna os bytes economizados (0 se não ganhar)."""
+    from PIL import Image
+
+    before = path.stat().st_size
+    tmp_path = path.with_name(path.name + ".tmp")
+    with Image.open(path) as image:
+        image.load()
+        # O Matplotlib grava RGBA mesmo com fundo opaco; sem o canal alfa o
+        # arquivo encolhe ~9% com os mesmos pixels.
+        if image.mode == "RGBA" and image.getextrema()[3][0] == 255:
+            image = image.convert("RGB")
+        image.save(tmp_path, format="PNG", optimize=True)
+    after = tmp_path.stat().st_size
+    if after < before:
+        tmp_path.replace(path)
+        return before - after
+    tmp_path.unlink()
+    return 0
+
+
+def write_contact_sheet(
+    images: Sequence[Path],
+    target: Path,
+    columns: int = THUMBNAIL_COLUMNS,
+    width: int = THUMBNAIL_WIDTH,
+) -> Optional[Path]:
+    """Folha de miniaturas (grade com o caminho relativo abaixo de cada figura)."""
+    from PIL import Image, ImageDraw
+
+    images = [p for p in images if p.suffix == ".png" and p.exists() and p.name != THUMBNAIL_SHEET]
+    if not images:
+        return None
+    thumbs: List[Image.Image] = []
+    for path in images:
+        with Image.open(path) as image:
+            image = image.convert("RGB")
+            image.thumbnail((width, width), Image.Resampling.LANCZOS)
+            thumbs.append(image)
+    caption = 14
+    cell_h = max(t.height for t in thumbs) + caption + 8
+    cell_w = width + 8
+    rows = -(-len(thumbs) // columns)
+    sheet = Image.new("RGB", (cell_w * min(columns, len(thumbs)), cell_h * rows), "white")
+    draw = ImageDraw.Draw(sheet)
+    for i, (path, thumb) in enumerate(zip(images, thumbs)):
+        x, y = (i % columns) * cell_w + 4, (i // columns) * cell_h + 4
+        sheet.paste(thumb, (x, y))
+        try:
+            label = str(path.relative_to(target.parent))
+        except ValueError:
+            label = path.name
+        draw.text((x, y + thumb.height + 2), label[-60:], fill="black")
+    target.parent.mkdir(parents=True, exist_ok=True)
+    sheet.save(target, optimize=True)
+    return target
+
+
+def add_render_arguments(parser: argparse.ArgumentParser) -> None:
+    """Opções `--profile`/`--optimize-png`/`--thumbnails` compartilhadas pelos scripts de gráficos."""
+    parser.add_argument(
+        "--profile",
+        choices=PROFILE_NAMES,
+        default=DEFAULT_PROFILE,
+        help="print: PNG 300 dpi (padrão); preview: PNG 80 dpi; svg/pdf: vetorial.",
+    )
+    parser.add_argument(
+        "--optimize-png",
+        action="store_true",
+        help="Recomprime os PNGs gerados sem perdas (menor no repositório, mais lento).",
+    )
+    parser.add_argument(
+        "--thumbnails",
+        action="store_true",
+        help=f"Grava uma folha de miniaturas ({THUMBNAIL_SHEET}) em cada pasta de saída (perfis PNG).",
+    )
+
+
+def profile_from_args(args: argparse.Namespace) -> RenderProfile:
+    return PROFILES[args.profile]._replace(optimize=args.optimize_png)
+
+
+def write_thumbnails(outputs: Iterable[Path], root: Path, profile: RenderProfile) -> Optional[Path]:
+    """Folha de miniaturas das figuras de `root` (só para perfis PNG)."""
+    if profile.format != "png":
+        print(f"Miniaturas ignoradas: o perfil {profile.name} não gera PNG.")
+        return None
+    images = sorted(output_path(p, profile) for p in outputs if p.is_relative_to(root))
+    return write_contact_sheet(images, root / THUMBNAIL_SHEET)
+
+
+def _collect_pngs(paths: Iterable[str]) -> List[Path]:
+    found: List[Path] = []
+    for spec in paths:
+        path = Path(spec)
+        if path.is_dir():
+            found.extend(sorted(p for p in path.rglob("*.png") if p.name != THUMBNAIL_SHEET))
+        elif path.suffix == ".png":
+            found.append(path)
+        else:
+            raise FileNotFoundError(f"PNG ou pasta não encontrado: {path}")
+    return found
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Pós-processa PNGs já gerados (otimização e miniaturas).")
+    sub = parser.add_subparsers(dest="command", required=True)
+    optimize = sub.add_parser("optimize", help="Recomprime PNGs sem perdas.")
+    optimize.add_argument("paths", nargs="+", help="Arquivos PNG ou pastas (recursivo).")
+    thumbs = sub.add_parser("thumbnails", help=f"Grava {THUMBNAIL_SHEET} com as figuras de uma pasta.")
+    thumbs.add_argument("directory", help="Pasta com os PNGs (recursivo).")
+    thumbs.add_argument("--output", help=f"Arquivo da folha (padrão: <pasta>/{THUMBNAIL_SHEET}).")
+    args = parser.parse_args()
+
+    if args.command == "optimize":
+        files = _collect_pngs(args.paths)
+        before = sum(p.stat().st_size for p in files)
+        saved = sum(optimize_png(p) for p in files)
+        print(f"{len(files)} PNGs: {before / 1e6:.1f} MB → {(before - saved) / 1e6:.1f} MB.")
+    else:
+        directory = Path(args.directory)
+        target = Path(args.output) if args.output else directory / THUMBNAIL_SHEET
+        sheet = write_contact_sheet(_collect_pngs([str(directory)]), target)
+        print(f"Miniaturas em {sheet}" if sheet else "Nenhum PNG encontrado.")
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except Exception as exc:
+        print(f"Erro: {exc}", file=sys.stderr)
+        sys.exit(1)
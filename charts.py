@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Ponto de entrada único para todas as famílias de gráficos.
+
+Em vez de rodar generate_charts.py, generate_overview_charts.py,
+generate_transfer_overview.py, generate_transfer_compute_summary.py e
+generate_thermal_energy_charts.py em sequência (cada um relendo o CSV/store e
+renormalizando), o dataset é carregado uma vez com a união das colunas e
+normalizado uma vez; cada família só aplica o próprio recorte (`prepare_frame`)
+e devolve seus jobs (`build_jobs`). Todos os jobs selecionados vão para um único
+pool (`--workers`), com um manifesto de figuras por família.
+
+Uso:
+    python3 charts.py all --csv app/src/BANCHMARK/.store --output docs/charts/comparativo-09-12 --workers 4
+    python3 charts.py overview transfer --csv benchmark_results.csv --output /tmp/charts
+
+Cada família grava numa subpasta de `--output` (ver `FAMILY_DIRS`). `--plan` lista
+as figuras que seriam geradas e quais estão desatualizadas, sem importar o
+Matplotlib (o stack de plot só é carregado ao desenhar). `--steady-state` tira o
+aquecimento detectado (benchmark_warmup.py) das médias de todas as famílias.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+from pathlib import Path
+from typing import Callable, Dict, List
+
+import pandas as pd
+
+import generate_charts
+import generate_overview_charts
+import generate_thermal_energy_charts
+import generate_transfer_compute_summary
+import generate_transfer_overview
+from benchmark_db import is_database
+from benchmark_normalize import normalize_frame
+from benchmark_stats import add_interval_arguments, summarize
+from benchmark_store import load_benchmarks
+from benchmark_warmup import add_steady_state_argument, exclude_warmup
+from chart_jobs import MANIFEST_NAME, ChartJob, plan_jobs, print_plan, run_jobs
+from chart_output import add_render_arguments, profile_from_args, write_thumbnails
+
+FAMILY_DIRS = {
+    "charts": "devices",
+    "overview": "overview",
+    "transfer": "transfer",
+    "transfer-summary": "transfer_compute",
+    "thermal": "thermal_energy",
+}
+FAMILIES = list(FAMILY_DIRS)
+LOAD_COLUMNS = list(
+    dict.fromkeys(
+        generate_charts.LOAD_COLUMNS
+        + generate_overview_charts.LOAD_COLUMNS
+        + generate_transfer_overview.LOAD_COLUMNS
+        + generate_transfer_compute_summary.LOAD_COLUMNS
+        + generate_thermal_energy_charts.LOAD_COLUMNS
+    )
+)
+
+
+def charts_jobs(df: pd.DataFrame, output_dir: Path, args: argparse.Namespace) -> List[ChartJob]:
+    raw = generate_charts.prepare_frame(df)
+    csv_path = Path(args.csv)
+    if is_database(csv_path) and not args.steady_state:
+        # Médias no SQLite (GROUP BY indexado); `raw` só serve ao IC do speedup.
+        agg = generate_charts.aggregate_database(csv_path, args.campaign)
+    else:
+        agg = generate_charts.aggregate_metrics(raw)
+    intervals = None
+    if args.speedup_ci == "bootstrap":
+        intervals = generate_charts.speedup_intervals(raw, args.steady_state, args.bootstrap_samples)
+    speedup_df = generate_charts.compute_speedup(agg, intervals)
+    return generate_charts.build_jobs(agg, speedup_df, output_dir, args.summary_layout)
+
+
+def overview_jobs(df: pd.DataFrame, output_dir: Path, args: argparse.Namespace) -> List[ChartJob]:
+    raw = generate_overview_charts.prepare_frame(df)
+    data = summarize(raw, generate_overview_charts.SUMMARY_KEYS, "duration_ms", args.ci, n_boot=args.bootstrap_samples)
+    return generate_overview_charts.build_jobs(data, output_dir)
+
+
+def transfer_jobs(df: pd.DataFrame, output_dir: Path, args: argparse.Namespace) -> List[ChartJob]:
+    raw = generate_transfer_overview.prepare_frame(df)
+    data = summarize(raw, generate_transfer_overview.SUMMARY_KEYS, "transfer_ms", args.ci, n_boot=args.bootstrap_samples)
+    return generate_transfer_overview.build_jobs(data, output_dir)
+
+
+def transfer_summary_jobs(df: pd.DataFrame, output_dir: Path, args: argparse.Namespace) -> List[ChartJob]:
+    return generate_transfer_compute_summary.build_jobs(generate_transfer_compute_summary.prepare_frame(df), output_dir)
+
+
+def thermal_jobs(df: pd.DataFrame, output_dir: Path, args: argparse.Namespace) -> List[ChartJob]:
+    return generate_thermal_energy_charts.build_jobs(generate_thermal_energy_charts.prepare_frame(df), output_dir)
+
+
+FAMILY_JOBS: Dict[str, Callable[[pd.DataFrame, Path, argparse.Namespace], List[ChartJob]]] = {
+    "charts": charts_jobs,
+    "overview": overview_jobs,
+    "transfer": transfer_jobs,
+    "transfer-summary": transfer_summary_jobs,
+    "thermal": thermal_jobs,
+}
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Gera todas as famílias de gráficos a partir de um único carregamento do dataset."
+    )
+    parser.add_argument(
+        "families",
+        nargs="+",
+        choices=FAMILIES + ["all"],
+        metavar="FAMILIA",
+        help=f"Famílias a gerar: {', '.join(FAMILIES)} ou all.",
+    )
+    parser.add_argument(
+        "--csv",
+        required=True,
+        help="Caminho para benchmark_results.csv consolidado ou diretório do store colunar.",
+    )
+    parser.add_argument(
+        "--campaign",
+        action="append",
+        help="Filtra campanhas do store colunar (nome da pasta). Pode ser repetido.",
+    )
+    parser.add_argument(
+        "--output",
+        default="charts",
+        help="Diretório raiz; cada família grava numa subpasta.",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help=f"Processos para renderizar os gráficos em paralelo (ex.: {os.cpu_count() or 1}).",
+    )
+    parser.add_argument(
+        "--summary-layout",
+        choices=generate_charts.SUMMARY_LAYOUTS,
+        default="files",
+        help="Layout de summary/ da família charts (ver generate_charts.py).",
+    )
+    parser.add_argument(
+        "--speedup-ci",
+        choices=generate_charts.SPEEDUP_INTERVALS,
+        default="bootstrap",
+        help="IC do speedup da família charts: bootstrap das iterações de notes (padrão) ou none.",
+    )
+    parser.add_argument(
+        "--plan",
+        action="store_true",
+        help="Só lista as figuras (novas, alteradas, atuais, obsoletas), sem desenhar nem importar o Matplotlib.",
+    )
+    add_interval_arguments(parser)
+    add_steady_state_argument(parser)
+    add_render_arguments(parser)
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    families = FAMILIES if "all" in args.families else list(dict.fromkeys(args.families))
+    csv_path = Path(args.csv)
+    if not csv_path.exists():
+        raise FileNotFoundError(f"CSV não encontrado em {csv_path}")
+    output_dir = Path(args.output)
+
+    # `notes` só quando alguém usa as iterações (aquecimento ou IC do speedup).
+    with_notes = args.steady_state or ("charts" in families and args.speedup_ci == "bootstrap")
+    df = load_benchmarks(csv_path, LOAD_COLUMNS, campaigns=args.campaign, include_notes=with_notes, compact=True)
+    if args.steady_state:
+        df = exclude_warmup(df)
+        print(f"Aquecimento excluído das médias em {df.attrs['warmup_rows']} execuções.")
+    df = normalize_frame(df)
+
+    profile = profile_from_args(args)
+    jobs: List[ChartJob] = []
+    manifests: List[Path] = []
+    for family in families:
+        family_dir = output_dir / FAMILY_DIRS[family]
+        family_jobs = FAMILY_JOBS[family](df, family_dir, args)
+        if not args.plan:
+            print(f"{family}: {len(family_jobs)} figuras em {family_dir}")
+        jobs.extend(family_jobs)
+        manifests.append(family_dir / MANIFEST_NAME)
+
+    if args.plan:
+        print_plan(plan_jobs(jobs, manifests, profile))
+        return
+    rendered = run_jobs(jobs, args.workers, generate_charts.init_worker, manifest=manifests, profile=profile)
+    print(
+        f"{rendered} figuras renderizadas com {max(args.workers, 1)} processo(s); "
+        f"{len(jobs) - rendered} inalteradas."
+    )
+    if args.thumbnails:
+        for manifest in manifests:
+            sheet = write_thumbnails([job.output for job in jobs], manifest.parent, profile)
+            if sheet:
+                print(f"Miniaturas em {sheet}")
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except Exception as exc:
+        print(f"Erro: {exc}", file=sys.stderr)
+        sys.exit(1)
@@ -7,7 +7,25 @@ Gera gráficos de benchmark a partir de benchmark_results.csv.
 - Há gráficos separados com CPU puro vs TFLite para evidenciar a diferença de ordem
   de grandeza, e gráficos apenas com delegates TFLite para comparação real entre
   aceleradores.
-- Speedup (CPU Kotlin puro / delegate) é usado como métrica clara de ganho relativo.
+- Speedup (CPU Kotlin puro / delegate) é usado como métrica clara de ganho relativo,
+  com intervalo de confiança por bootstrap das iterações de `notes`
+  (`benchmark_stats.bootstrap_speedup`) nas figuras e no resumo impresso;
+  `--speedup-ci none` volta ao speedup sem intervalo (sem ler `notes`).
+- Cada figura é um job independente (chart_jobs.py) com as linhas agregadas já
+  recortadas; `--workers N` renderiza os jobs num pool de processos.
+- `--summary-layout grid` troca os PNGs `summary/tempo_*`/`speedup_*` (um por
+  algoritmo × delegate × tamanho) por uma grade por família: `tempo_<ALG>_grid.png`
+  (delegates × tamanhos) e `speedup_<ALG>_grid.png` (um painel por delegate).
+- Reexecuções só redesenham figuras cujos dados/estilo mudaram (manifesto
+  `.charts.manifest.json` na pasta de saída); `--clean` apaga tudo e redesenha.
+- Matplotlib/seaborn só são importados ao desenhar; `--plan` lista as figuras que
+  seriam geradas (e quais estão desatualizadas) sem importá-los.
+- `--steady-state` lê as iterações de `notes` e tira o aquecimento detectado
+  (benchmark_warmup.py) das médias, então o speedup compara regimes estáveis.
+- Com `--csv` apontando para um banco `benchmark_db.py` (.sqlite), as médias por
+  dispositivo/algoritmo/delegate/tamanho saem de `aggregate_runs` (GROUP BY
+  indexado) e as linhas só são carregadas quando o IC do speedup ou
+  `--steady-state` precisam das iterações de `notes`.
 """
 
 from __future__ import annotations
@@ -16,21 +34,43 @@ import argparse
 import shutil
 import os
 from pathlib import Path
-from typing import Dict, Iterable, List, Tuple
+from typing import Dict, Iterable, List, Optional, Tuple
 
-BASE_DIR = Path(__file__).parent
-MPL_CACHE = BASE_DIR / ".matplotlib"
-# Mantém cache local do Matplotlib para evitar tentativas de escrita em ~/.matplotlib.
-os.environ.setdefault("MPLCONFIGDIR", str(MPL_CACHE))
-MPL_CACHE.mkdir(parents=True, exist_ok=True)
-
-import matplotlib
-
-matplotlib.use("Agg")
-import matplotlib.pyplot as plt
 import pandas as pd
-import seaborn as sns
 
+from benchmark_db import aggregate_runs, connect, is_database
+from benchmark_normalize import normalize_frame
+from benchmark_notes import explode_samples
+from benchmark_schema import widen_types
+from benchmark_stats import DEFAULT_BOOTSTRAP_SAMPLES, bootstrap_speedup
+from benchmark_store import load_benchmarks
+from benchmark_warmup import add_steady_state_argument, exclude_warmup, steady_samples
+from chart_jobs import MANIFEST_NAME, ChartJob, lazy_import, plan_jobs, print_plan, run_jobs
+from chart_output import add_render_arguments, profile_from_args, save_figure, write_thumbnails
+
+# Stack de plot importado só ao desenhar a primeira figura (`--help`/`--plan` rápidos).
+plt = lazy_import("matplotlib.pyplot")
+sns = lazy_import("seaborn")
+
+
+LOAD_COLUMNS = [
+    "device_model",
+    "deviceInfo",
+    "model",
+    "delegate",
+    "test_name",
+    "data_description",
+    "input_size",
+    "batch_size",
+    "duration_ms",
+    "transfer_ms",
+    "compute_ms",
+]
+
+TFLITE_DELEGATES = ["TFLite CPU", "TFLite GPU", "TFLite NNAPI"]
+SUMMARY_LAYOUTS = ["files", "grid"]
+SPEEDUP_INTERVALS = ["bootstrap", "none"]
+SPEEDUP_KEYS = ["device_model", "algoritmo", "tamanho_do_vetor"]
 
 PALETTE = {
     "CPU Kotlin": "#7f7f7f",  # cinza
@@ -54,32 +94,17 @@ def format_vector_label(length: int) -> str:
     return str(int(length))
 
 
-def load_data(csv_path: Path) -> pd.DataFrame:
+def load_data(
+    csv_path: Path, campaigns: Optional[List[str]] = None, include_notes: bool = False
+) -> pd.DataFrame:
     if not csv_path.exists():
         raise FileNotFoundError(f"CSV não encontrado em {csv_path}")
-    df = pd.read_csv(csv_path)
+    df = load_benchmarks(csv_path, LOAD_COLUMNS, campaigns=campaigns, include_notes=include_notes, compact=True)
     # padroniza nomes de colunas para evitar problemas com espaços
     df.columns = [c.strip() for c in df.columns]
     return df
 
 
-def extract_device_model(df: pd.DataFrame) -> pd.DataFrame:
-    df = df.copy()
-    if "device_model" in df.columns:
-        df["device_model"] = df["device_model"].astype(str).str.strip()
-        return df
-
-    if "deviceInfo" in df.columns:
-        base_model = df["deviceInfo"].fillna("Dispositivo").astype(str).str.strip()
-    elif "model" in df.columns:
-        base_model = df["model"].fillna("Dispositivo").astype(str).str.strip()
-    else:
-        base_model = pd.Series(["Dispositivo"] * len(df))
-
-    df["device_model"] = base_model.where(base_model != "", "Dispositivo")
-    return df
-
-
 def maybe_add_fake_devices(df: pd.DataFrame) -> pd.DataFrame:
     """Se houver só um dispositivo, duplica linhas com labels fictícios para testar gráficos multi-device."""
     unique_devices = df["device_model"].nunique()
@@ -99,64 +124,12 @@ def maybe_add_fake_devices(df: pd.DataFrame) -> pd.DataFrame:
     return combined
 
 
-def normalize_delegate(delegate: str) -> str:
-    if not isinstance(delegate, str):
-        return "CPU Kotlin"
-    name = delegate.strip().lower()
-    mapping = {
-        "cpu kotlin": "CPU Kotlin",
-        "cpu": "CPU Kotlin",
-        "kotlin cpu": "CPU Kotlin",
-        "tflite cpu": "TFLite CPU",
-        "tflite gpu": "TFLite GPU",
-        "gpu": "TFLite GPU",
-        "tflite nnapi": "TFLite NNAPI",
-        "nnapi": "TFLite NNAPI",
-    }
-    return mapping.get(name, delegate.strip() or "CPU Kotlin")
-
-
-def add_normalized_columns(df: pd.DataFrame) -> pd.DataFrame:
-    df = df.copy()
-    df["delegate_norm"] = df["delegate"].apply(normalize_delegate)
-
-    def detect_algo(text: str) -> str:
-        t = str(text).upper()
-        if "MAD" in t:
-            return "MAD"
-        if "FFT" in t:
-            return "FFT"
-        return "Outro"
-
-    df["algoritmo"] = df["test_name"].apply(detect_algo)
-    return df
-
-
-def derive_vector_size(df: pd.DataFrame) -> pd.DataFrame:
-    df = df.copy()
-
-    def normalize_row(row: pd.Series) -> int:
-        try:
-            base = float(row.get("input_size", 0) or 0)
-        except Exception:  # noqa: BLE001
-            return 0
-
-        batch = int(row.get("batch_size", 1) or 1)
-        if batch > 0:
-            base /= batch
-
-        algoritmo = row.get("algoritmo")
-        if isinstance(algoritmo, str) and algoritmo.upper() == "FFT":
-            sensors = 10
-            if sensors > 0:
-                base /= sensors
-
-        if base <= 0:
-            return 0
-        return int(round(base))
-
-    df["tamanho_do_vetor"] = df.apply(normalize_row, axis=1)
-    return df
+def prepare_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Normaliza um frame já carregado para os nomes de coluna usados aqui."""
+    df = normalize_frame(df)
+    df = maybe_add_fake_devices(df)
+    df = df.rename(columns={"algorithm": "algoritmo", "vector_length": "tamanho_do_vetor"})
+    return ensure_timing_columns(df)
 
 
 def ensure_timing_columns(df: pd.DataFrame) -> pd.DataFrame:
@@ -167,9 +140,20 @@ def ensure_timing_columns(df: pd.DataFrame) -> pd.DataFrame:
     return df
 
 
+AGGREGATE_KEYS = ["device_model", "algoritmo", "delegate_norm", "tamanho_do_vetor"]
+AGGREGATE_COLUMNS = AGGREGATE_KEYS + ["duration_mean", "duration_std", "transfer_mean", "compute_mean", "n"]
+
+
+def _approximate_compute(grouped: pd.DataFrame) -> pd.DataFrame:
+    # se não houver compute_ms, usamos duration - transfer como aproximação
+    approx = (grouped["duration_mean"] - grouped["transfer_mean"]).clip(lower=0)
+    grouped["compute_mean"] = grouped["compute_mean"].where(grouped["compute_mean"] != 0, approx)
+    return grouped
+
+
 def aggregate_metrics(df: pd.DataFrame) -> pd.DataFrame:
     grouped = (
-        df.groupby(["device_model", "algoritmo", "delegate_norm", "tamanho_do_vetor"])
+        df.groupby(AGGREGATE_KEYS, observed=True)
         .agg(
             duration_mean=("duration_ms", "mean"),
             duration_std=("duration_ms", "std"),
@@ -178,19 +162,35 @@ def aggregate_metrics(df: pd.DataFrame) -> pd.DataFrame:
             n=("duration_ms", "count"),
         )
         .reset_index()
+        .pipe(widen_types)
     )
+    return _approximate_compute(grouped)
 
-    # se não houver compute_ms, usamos duration - transfer como aproximação
-    grouped["compute_mean"] = grouped.apply(
-        lambda row: row.compute_mean
-        if row.compute_mean != 0
-        else max(row.duration_mean - row.transfer_mean, 0),
-        axis=1,
-    )
-    return grouped
 
+def aggregate_database(db_path: Path, campaigns: Optional[List[str]] = None) -> pd.DataFrame:
+    """`aggregate_metrics` calculado no SQLite (`benchmark_db.aggregate_runs`), sem carregar as linhas."""
+    with connect(db_path) as conn:
+        agg = aggregate_runs(conn, campaigns=campaigns)
+    agg = agg.rename(columns={"algorithm": "algoritmo", "vector_length": "tamanho_do_vetor"})
+    agg = maybe_add_fake_devices(agg)[AGGREGATE_COLUMNS]
+    agg["n"] = agg["n"].astype("int64")
+    return _approximate_compute(agg)
 
-def compute_speedup(agg: pd.DataFrame) -> pd.DataFrame:
+
+def speedup_intervals(
+    raw: pd.DataFrame, steady_state: bool = False, n_boot: int = DEFAULT_BOOTSTRAP_SAMPLES
+) -> Optional[pd.DataFrame]:
+    """IC do speedup por célula, reamostrando as iterações de `notes` (None sem `notes`)."""
+    if "notes" not in raw.columns:
+        return None
+    samples = explode_samples(raw, SPEEDUP_KEYS + ["delegate_norm"])
+    if steady_state:
+        samples = steady_samples(samples)
+    intervals = bootstrap_speedup(samples, SPEEDUP_KEYS, n_boot=n_boot)
+    return widen_types(intervals[SPEEDUP_KEYS + ["delegate_norm", "speedup_low", "speedup_high"]])
+
+
+def compute_speedup(agg: pd.DataFrame, intervals: Optional[pd.DataFrame] = None) -> pd.DataFrame:
     cpu = agg[agg["delegate_norm"] == "CPU Kotlin"][
         ["device_model", "algoritmo", "tamanho_do_vetor", "duration_mean"]
     ].rename(columns={"duration_mean": "cpu_duration"})
@@ -201,11 +201,50 @@ def compute_speedup(agg: pd.DataFrame) -> pd.DataFrame:
         how="left",
     )
     merged["speedup"] = merged["cpu_duration"] / merged["duration_mean"]
+    if intervals is not None:
+        merged = merged.merge(intervals, on=SPEEDUP_KEYS + ["delegate_norm"], how="left")
     return merged
 
 
-def prepare_output_dirs(base_dir: Path, devices: Iterable[str]) -> None:
-    if base_dir.exists():
+def _has_intervals(data: pd.DataFrame) -> bool:
+    return "speedup_low" in data.columns and data["speedup_low"].notna().any()
+
+
+def speedup_errorbars(ax, data: pd.DataFrame, hue: str) -> None:
+    """Barras de erro do IC sobre um `sns.barplot` de speedup com `hue`.
+
+    O seaborn cria um container por nível de `hue` (ordenado) e omite as barras
+    ausentes; cada barra é ligada à linha pelo categórico do eixo X sob seu centro.
+    Uma única chamada de `errorbar` para a figura toda.
+    """
+    if not _has_intervals(data):
+        return
+    order = [label.get_text() for label in ax.get_xticklabels()]
+    bounds = data.set_index(["device_model", hue])[["speedup_low", "speedup_high"]]
+    x: List[float] = []
+    y: List[float] = []
+    low: List[float] = []
+    high: List[float] = []
+    for level, container in zip(sorted(data[hue].unique()), ax.containers):
+        for bar in container:
+            center = bar.get_x() + bar.get_width() / 2
+            key = (order[int(round(center))], level)
+            if key not in bounds.index:
+                continue
+            lo, hi = bounds.loc[key]
+            if pd.isna(lo):
+                continue
+            height = bar.get_height()
+            x.append(center)
+            y.append(height)
+            low.append(max(height - lo, 0.0))
+            high.append(max(hi - height, 0.0))
+    if x:
+        ax.errorbar(x, y, yerr=[low, high], fmt="none", ecolor="black", elinewidth=0.8, capsize=2)
+
+
+def prepare_output_dirs(base_dir: Path, devices: Iterable[str], clean: bool = False) -> None:
+    if clean and base_dir.exists():
         shutil.rmtree(base_dir)
     for device in devices:
         for sub in ["global", "tflite", "speedup"]:
@@ -252,16 +291,17 @@ def plot_global_comparison(
         marker="o",
         ax=ax,
     )
-    for _, row in subset.iterrows():
-        if pd.notna(row["duration_std"]):
-            ax.errorbar(
-                row["tamanho_do_vetor"],
-                row["duration_mean"],
-                yerr=row["duration_std"],
-                fmt="none",
-                ecolor=PALETTE.get(row["delegate_norm"], "black"),
-                alpha=0.4,
-            )
+    # Uma chamada de errorbar por delegate (em vez de uma por linha).
+    with_std = subset.dropna(subset=["duration_std"])
+    for delegate, series in with_std.groupby("delegate_norm", sort=False):
+        ax.errorbar(
+            series["tamanho_do_vetor"],
+            series["duration_mean"],
+            yerr=series["duration_std"],
+            fmt="none",
+            ecolor=PALETTE.get(delegate, "black"),
+            alpha=0.4,
+        )
 
     title = f"{device} · {algoritmo} – CPU vs Delegates"
     apply_title(ax, title)
@@ -269,21 +309,22 @@ def plot_global_comparison(
     apply_vector_ticks(ax, subset["tamanho_do_vetor"].unique())
     fig.text(0.5, 0.005, SUBTITLE_BATCH_INFO, ha="center", fontsize=9)
     finalize_figure(fig)
-    fig.savefig(out_dir / f"global_{algoritmo}.png", dpi=300)
+    save_figure(fig, out_dir / f"global_{algoritmo}.png")
     plt.close(fig)
 
 
-def plot_tflite_comparison(
-    data: pd.DataFrame, device: str, algoritmo: str, out_dir: Path
-) -> None:
-    tflite_delegates = ["TFLite CPU", "TFLite GPU", "TFLite NNAPI"]
-    subset = data[
+def _tflite_subset(data: pd.DataFrame, device: str, algoritmo: str) -> pd.DataFrame:
+    return data[
         (data["device_model"] == device)
         & (data["algoritmo"] == algoritmo)
-        & (data["delegate_norm"].isin(tflite_delegates))
+        & (data["delegate_norm"].isin(TFLITE_DELEGATES))
     ].sort_values("tamanho_do_vetor")
 
-    # Tempo total
+
+def plot_tflite_total(
+    data: pd.DataFrame, device: str, algoritmo: str, out_dir: Path
+) -> None:
+    subset = _tflite_subset(data, device, algoritmo)
     fig, ax = plt.subplots(figsize=(8, 4.5))
     sns.lineplot(
         data=subset,
@@ -299,16 +340,21 @@ def plot_tflite_comparison(
     apply_vector_ticks(ax, subset["tamanho_do_vetor"].unique())
     fig.text(0.5, 0.005, SUBTITLE_BATCH_INFO, ha="center", fontsize=9)
     finalize_figure(fig)
-    fig.savefig(out_dir / f"tflite_total_{algoritmo}.png", dpi=300)
+    save_figure(fig, out_dir / f"tflite_total_{algoritmo}.png")
     plt.close(fig)
 
-    # Transferência vs processamento (barras empilhadas)
+
+def plot_tflite_transfer(
+    data: pd.DataFrame, device: str, algoritmo: str, out_dir: Path
+) -> None:
+    """Transferência vs processamento (barras empilhadas)."""
+    subset = _tflite_subset(data, device, algoritmo)
     fig, ax = plt.subplots(figsize=(8, 4.5))
     width = 0.2
     x_positions = range(len(subset["tamanho_do_vetor"].unique()))
     size_order = sorted(subset["tamanho_do_vetor"].unique())
 
-    for i, delegate in enumerate(tflite_delegates):
+    for i, delegate in enumerate(TFLITE_DELEGATES):
         partial = subset[subset["delegate_norm"] == delegate]
         partial = partial.set_index("tamanho_do_vetor").reindex(size_order)
         transfer = partial["transfer_mean"].fillna(0.0)
@@ -334,18 +380,11 @@ def plot_tflite_comparison(
             label=f"{delegate} - Processamento",
         )
 
-        for pos, t, c in zip(positions, transfer, compute):
-            total = t + c
-            if total > 0:
-                overhead = (t / total) * 100
-                ax.text(
-                    pos,
-                    total + max(total * 0.02, 0.5),
-                    f"{overhead:.1f}%",
-                    ha="center",
-                    va="bottom",
-                    fontsize=7,
-                )
+        # Rótulos de overhead da série inteira numa única chamada (topo da pilha).
+        total = transfer + compute
+        overhead = (transfer / total.where(total > 0) * 100).to_numpy()
+        labels = ["" if pd.isna(value) else f"{value:.1f}%" for value in overhead]
+        ax.bar_label(bars2, labels=labels, padding=2, fontsize=7)
 
     xtick_positions = [x + width for x in x_positions]
     ax.set_xticks(xtick_positions)
@@ -357,7 +396,7 @@ def plot_tflite_comparison(
     fig.text(0.5, 0.005, SUBTITLE_BATCH_INFO, ha="center", fontsize=9)
     ax.legend()
     finalize_figure(fig)
-    fig.savefig(out_dir / f"tflite_transfer_{algoritmo}.png", dpi=300)
+    save_figure(fig, out_dir / f"tflite_transfer_{algoritmo}.png")
     plt.close(fig)
 
 
@@ -367,7 +406,7 @@ def plot_speedup(
     subset = speedup_df[
         (speedup_df["device_model"] == device)
         & (speedup_df["algoritmo"] == algoritmo)
-        & (speedup_df["delegate_norm"].isin(["TFLite CPU", "TFLite GPU", "TFLite NNAPI"]))
+        & (speedup_df["delegate_norm"].isin(TFLITE_DELEGATES))
     ].sort_values("tamanho_do_vetor")
 
     fig, ax = plt.subplots(figsize=(8, 4.5))
@@ -380,121 +419,301 @@ def plot_speedup(
         marker="o",
         ax=ax,
     )
+    # IC do bootstrap: uma chamada de errorbar por delegate, como no tempo global.
+    if _has_intervals(subset):
+        for delegate, series in subset.dropna(subset=["speedup_low"]).groupby("delegate_norm", sort=False):
+            ax.errorbar(
+                series["tamanho_do_vetor"],
+                series["speedup"],
+                yerr=[
+                    (series["speedup"] - series["speedup_low"]).clip(lower=0),
+                    (series["speedup_high"] - series["speedup"]).clip(lower=0),
+                ],
+                fmt="none",
+                ecolor=PALETTE.get(delegate, "black"),
+                alpha=0.6,
+                capsize=3,
+            )
     apply_title(ax, f"{device} · {algoritmo} – Speedup vs CPU Kotlin")
     add_common_formatting(ax, "Speedup (×)")
     apply_vector_ticks(ax, subset["tamanho_do_vetor"].unique())
     fig.text(0.5, 0.005, SUBTITLE_BATCH_INFO, ha="center", fontsize=9)
     finalize_figure(fig)
-    fig.savefig(out_dir / f"speedup_{algoritmo}.png", dpi=300)
+    save_figure(fig, out_dir / f"speedup_{algoritmo}.png")
     plt.close(fig)
 
 
 def print_device_summary(agg: pd.DataFrame, speedup_df: pd.DataFrame, device: str) -> None:
+    # Uma linha por algoritmo × tamanho: o IC do speedup não pode ser promediado
+    # entre MAD e FFT como o valor pontual.
+    index = ["algoritmo", "tamanho_do_vetor"]
     durations = (
         agg[agg["device_model"] == device]
         .pivot_table(
-            index="tamanho_do_vetor",
+            index=index,
             columns="delegate_norm",
             values="duration_mean",
+            observed=True,
         )
         .sort_index()
     )
+    device_speed = speedup_df[
+        (speedup_df["device_model"] == device)
+        & (speedup_df["delegate_norm"] != "CPU Kotlin")
+    ]
     speedups = (
-        speedup_df[
-            (speedup_df["device_model"] == device)
-            & (speedup_df["delegate_norm"] != "CPU Kotlin")
-        ]
-        .pivot_table(
-            index="tamanho_do_vetor",
+        device_speed.pivot_table(
+            index=index,
             columns="delegate_norm",
             values="speedup",
+            observed=True,
         )
         .sort_index()
     )
+    intervals = None
+    if _has_intervals(device_speed):
+        with_ci = device_speed.dropna(subset=["speedup_low"])
+        with_ci = with_ci.assign(
+            ic=with_ci["speedup_low"].map("{:.2f}".format) + "–" + with_ci["speedup_high"].map("{:.2f}".format)
+        )
+        intervals = with_ci.pivot(index=index, columns="delegate_norm", values="ic")
 
     combined = pd.DataFrame(index=durations.index)
     for delegate in durations.columns:
         combined[f"{delegate} (ms)"] = durations[delegate]
         if delegate != "CPU Kotlin" and delegate in speedups.columns:
             combined[f"{delegate} speedup"] = speedups[delegate]
+            if intervals is not None and delegate in intervals.columns:
+                combined[f"{delegate} IC95%"] = intervals[delegate]
 
     print(f"\nResumo para {device}")
     print(combined.round(3).fillna("-"))
 
 
-def generate_device_plots(
-    agg: pd.DataFrame, speedup_df: pd.DataFrame, base_dir: Path, device: str
+def plot_summary_time(
+    subset: pd.DataFrame, algoritmo: str, delegate: str, size: int, summary_dir: Path
 ) -> None:
-    for algoritmo in ["MAD", "FFT"]:
-        plot_global_comparison(agg, device, algoritmo, base_dir / device / "global")
-        plot_tflite_comparison(agg, device, algoritmo, base_dir / device / "tflite")
-        plot_speedup(speedup_df, device, algoritmo, base_dir / device / "speedup")
+    fig, ax = plt.subplots(figsize=(8, 4.5))
+    sns.barplot(
+        data=subset,
+        x="device_model",
+        y="duration_mean",
+        color=PALETTE[delegate],
+        ax=ax,
+    )
+    apply_title(
+        ax,
+        f"{algoritmo} – {delegate} – vetor {format_vector_label(size)}",
+    )
+    add_common_formatting(ax, "Tempo (ms)", "Dispositivo")
+    fig.text(0.5, 0.005, SUBTITLE_BATCH_INFO, ha="center", fontsize=9)
+    finalize_figure(fig)
+    save_figure(
+        fig,
+        summary_dir
+        / f"tempo_{algoritmo}_{delegate}_{size}.png",
+    )
+    plt.close(fig)
 
 
-def generate_summary_plots(
-    agg: pd.DataFrame, speedup_df: pd.DataFrame, base_dir: Path
+def plot_summary_speedup(
+    subset_speed: pd.DataFrame, algoritmo: str, delegate: str, summary_dir: Path
 ) -> None:
-    summary_dir = base_dir / "summary"
-    delegates = ["TFLite CPU", "TFLite GPU", "TFLite NNAPI"]
+    fig, ax = plt.subplots(figsize=(8, 4.5))
+    sns.barplot(
+        data=subset_speed,
+        x="device_model",
+        y="speedup",
+        hue="tamanho_do_vetor",
+        ax=ax,
+    )
+    speedup_errorbars(ax, subset_speed, "tamanho_do_vetor")
+    apply_title(
+        ax, f"{algoritmo} – {delegate} – Speedup vs CPU Kotlin"
+    )
+    add_common_formatting(ax, "Speedup (×)", "Dispositivo")
+    fig.text(0.5, 0.005, SUBTITLE_BATCH_INFO, ha="center", fontsize=9)
+    finalize_figure(fig)
+    save_figure(
+        fig,
+        summary_dir / f"speedup_{algoritmo}_{delegate}.png",
+    )
+    plt.close(fig)
 
-    for algoritmo in ["MAD", "FFT"]:
-        for delegate in delegates:
-            for size in sorted(agg["tamanho_do_vetor"].unique()):
-                subset = agg[
-                    (agg["algoritmo"] == algoritmo)
-                    & (agg["delegate_norm"] == delegate)
-                    & (agg["tamanho_do_vetor"] == size)
+
+def plot_summary_time_grid(combo: pd.DataFrame, algoritmo: str, summary_dir: Path) -> None:
+    """Todos os `tempo_<ALG>_<DELEGATE>_<TAMANHO>` numa figura: delegates × tamanhos.
+
+    Cada coluna (tamanho) compartilha o eixo Y, então os delegates ficam comparáveis.
+    """
+    delegates = [d for d in TFLITE_DELEGATES if d in set(combo["delegate_norm"])]
+    sizes = sorted(combo["tamanho_do_vetor"].unique())
+    devices = sorted(combo["device_model"].unique())
+    fig, axes = plt.subplots(
+        len(delegates),
+        len(sizes),
+        figsize=(2.2 * len(sizes) + 1, 2.0 * len(delegates) + 1),
+        sharex=True,
+        sharey="col",
+        squeeze=False,
+    )
+    cells = combo.set_index(["delegate_norm", "tamanho_do_vetor", "device_model"])["duration_mean"]
+    positions = range(len(devices))
+    for row, delegate in enumerate(delegates):
+        for col, size in enumerate(sizes):
+            ax = axes[row][col]
+            heights = cells.reindex(
+                pd.MultiIndex.from_product([[delegate], [size], devices])
+            ).fillna(0.0)
+            ax.bar(positions, heights.to_numpy(), color=PALETTE[delegate])
+            ax.grid(True, axis="y", linestyle="--", alpha=0.4)
+            if row == 0:
+                ax.set_title(f"vetor {format_vector_label(size)}", fontsize=9)
+            if col == 0:
+                ax.set_ylabel(f"{delegate}\nTempo (ms)", fontsize=8)
+            ax.tick_params(labelsize=7)
+    for ax in axes[-1]:
+        ax.set_xticks(list(positions))
+        ax.set_xticklabels(devices, rotation=60, ha="right", fontsize=7)
+    fig.suptitle(f"{algoritmo} – Tempo por dispositivo (delegates × tamanhos)", fontsize=TITLE_FONTSIZE)
+    fig.text(0.5, 0.005, SUBTITLE_BATCH_INFO, ha="center", fontsize=9)
+    finalize_figure(fig)
+    save_figure(fig, summary_dir / f"tempo_{algoritmo}_grid.png")
+    plt.close(fig)
+
+
+def plot_summary_speedup_grid(combo: pd.DataFrame, algoritmo: str, summary_dir: Path) -> None:
+    """Os `speedup_<ALG>_<DELEGATE>` lado a lado, com eixos compartilhados."""
+    delegates = [d for d in TFLITE_DELEGATES if d in set(combo["delegate_norm"])]
+    fig, axes = plt.subplots(
+        1,
+        len(delegates),
+        figsize=(5 * len(delegates), 4.5),
+        sharex=True,
+        sharey=True,
+        squeeze=False,
+    )
+    by_delegate = dict(list(combo.groupby("delegate_norm", sort=False, observed=True)))
+    for ax, delegate in zip(axes[0], delegates):
+        sns.barplot(
+            data=by_delegate[delegate],
+            x="device_model",
+            y="speedup",
+            hue="tamanho_do_vetor",
+            order=sorted(combo["device_model"].unique()),
+            ax=ax,
+        )
+        speedup_errorbars(ax, by_delegate[delegate], "tamanho_do_vetor")
+        ax.set_title(delegate, fontsize=10)
+        add_common_formatting(ax, "Speedup (×)", "Dispositivo")
+        ax.tick_params(axis="x", labelrotation=60, labelsize=7)
+        if ax is not axes[0][-1] and ax.get_legend() is not None:
+            ax.get_legend().remove()
+    fig.suptitle(f"{algoritmo} – Speedup vs CPU Kotlin", fontsize=TITLE_FONTSIZE)
+    fig.text(0.5, 0.005, SUBTITLE_BATCH_INFO, ha="center", fontsize=9)
+    finalize_figure(fig)
+    save_figure(fig, summary_dir / f"speedup_{algoritmo}_grid.png")
+    plt.close(fig)
+
+
+def device_jobs(
+    agg: pd.DataFrame, speedup_df: pd.DataFrame, base_dir: Path
+) -> List[ChartJob]:
+    """Jobs por dispositivo × algoritmo, cada um com apenas as linhas que desenha."""
+    jobs: List[ChartJob] = []
+    keys = ["device_model", "algoritmo"]
+    by_key = dict(list(agg.groupby(keys, sort=False, observed=True)))
+    speed_by_key = dict(list(speedup_df.groupby(keys, sort=False, observed=True)))
+    empty = agg.iloc[0:0]
+    for device in agg["device_model"].unique():
+        device_dir = base_dir / device
+        for algoritmo in ["MAD", "FFT"]:
+            data = by_key.get((device, algoritmo), empty)
+            speed = speed_by_key.get((device, algoritmo), speedup_df.iloc[0:0])
+            args = (device, algoritmo)
+            jobs.extend(
+                [
+                    ChartJob(plot_global_comparison, (data, *args, device_dir / "global"),
+                             device_dir / "global" / f"global_{algoritmo}.png"),
+                    ChartJob(plot_tflite_total, (data, *args, device_dir / "tflite"),
+                             device_dir / "tflite" / f"tflite_total_{algoritmo}.png"),
+                    ChartJob(plot_tflite_transfer, (data, *args, device_dir / "tflite"),
+                             device_dir / "tflite" / f"tflite_transfer_{algoritmo}.png"),
+                    ChartJob(plot_speedup, (speed, *args, device_dir / "speedup"),
+                             device_dir / "speedup" / f"speedup_{algoritmo}.png"),
                 ]
-                if subset.empty:
-                    continue
-                fig, ax = plt.subplots(figsize=(8, 4.5))
-                sns.barplot(
-                    data=subset,
-                    x="device_model",
-                    y="duration_mean",
-                    color=PALETTE[delegate],
-                    ax=ax,
+            )
+    return jobs
+
+
+def summary_jobs(
+    agg: pd.DataFrame, speedup_df: pd.DataFrame, base_dir: Path, layout: str = "files"
+) -> List[ChartJob]:
+    summary_dir = base_dir / "summary"
+    jobs: List[ChartJob] = []
+    if layout == "grid":
+        tflite_agg = agg[agg["delegate_norm"].isin(TFLITE_DELEGATES)]
+        tflite_speed = speedup_df[speedup_df["delegate_norm"].isin(TFLITE_DELEGATES)].dropna(subset=["speedup"])
+        for algoritmo in ["MAD", "FFT"]:
+            combo = tflite_agg[tflite_agg["algoritmo"] == algoritmo]
+            if not combo.empty:
+                jobs.append(
+                    ChartJob(
+                        plot_summary_time_grid,
+                        (combo, algoritmo, summary_dir),
+                        summary_dir / f"tempo_{algoritmo}_grid.png",
+                    )
                 )
-                apply_title(
-                    ax,
-                    f"{algoritmo} – {delegate} – vetor {format_vector_label(size)}",
+            speed = tflite_speed[tflite_speed["algoritmo"] == algoritmo]
+            if not speed.empty:
+                jobs.append(
+                    ChartJob(
+                        plot_summary_speedup_grid,
+                        (speed, algoritmo, summary_dir),
+                        summary_dir / f"speedup_{algoritmo}_grid.png",
+                    )
                 )
-                add_common_formatting(ax, "Tempo (ms)", "Dispositivo")
-                fig.text(0.5, 0.005, SUBTITLE_BATCH_INFO, ha="center", fontsize=9)
-                finalize_figure(fig)
-                fig.savefig(
-                    summary_dir
-                    / f"tempo_{algoritmo}_{delegate}_{size}.png",
-                    dpi=300,
+        return jobs
+
+    # Particiona uma única vez (em vez de uma máscara booleana por combinação).
+    by_combo = dict(list(agg.groupby(["algoritmo", "delegate_norm"], sort=False, observed=True)))
+    speed_by_combo = dict(list(speedup_df.groupby(["algoritmo", "delegate_norm"], sort=False, observed=True)))
+
+    for algoritmo in ["MAD", "FFT"]:
+        for delegate in TFLITE_DELEGATES:
+            combo = by_combo.get((algoritmo, delegate))
+            if combo is None:
+                continue
+            for size, subset in combo.groupby("tamanho_do_vetor"):
+                jobs.append(
+                    ChartJob(
+                        plot_summary_time,
+                        (subset, algoritmo, delegate, size, summary_dir),
+                        summary_dir / f"tempo_{algoritmo}_{delegate}_{size}.png",
+                    )
                 )
-                plt.close(fig)
-
-            subset_speed = speedup_df[
-                (speedup_df["algoritmo"] == algoritmo)
-                & (speedup_df["delegate_norm"] == delegate)
-                & (speedup_df["delegate_norm"] != "CPU Kotlin")
-            ]
-            if subset_speed.empty:
+
+            subset_speed = speed_by_combo.get((algoritmo, delegate))
+            if subset_speed is None or subset_speed.empty:
                 continue
-            fig, ax = plt.subplots(figsize=(8, 4.5))
-            sns.barplot(
-                data=subset_speed,
-                x="device_model",
-                y="speedup",
-                hue="tamanho_do_vetor",
-                ax=ax,
-            )
-            apply_title(
-                ax, f"{algoritmo} – {delegate} – Speedup vs CPU Kotlin"
-            )
-            add_common_formatting(ax, "Speedup (×)", "Dispositivo")
-            fig.text(0.5, 0.005, SUBTITLE_BATCH_INFO, ha="center", fontsize=9)
-            finalize_figure(fig)
-            fig.savefig(
-                summary_dir / f"speedup_{algoritmo}_{delegate}.png",
-                dpi=300,
+            jobs.append(
+                ChartJob(
+                    plot_summary_speedup,
+                    (subset_speed, algoritmo, delegate, summary_dir),
+                    summary_dir / f"speedup_{algoritmo}_{delegate}.png",
+                )
             )
-            plt.close(fig)
+    return jobs
+
+
+def build_jobs(
+    agg: pd.DataFrame, speedup_df: pd.DataFrame, base_dir: Path, summary_layout: str = "files"
+) -> List[ChartJob]:
+    return device_jobs(agg, speedup_df, base_dir) + summary_jobs(agg, speedup_df, base_dir, summary_layout)
+
+
+def init_worker() -> None:
+    sns.set_theme(style="whitegrid")
 
 
 def main() -> None:
@@ -504,39 +723,93 @@ def main() -> None:
     parser.add_argument(
         "--csv",
         default="benchmark_results.csv",
-        help="Caminho para benchmark_results.csv",
+        help="Caminho para benchmark_results.csv ou diretório do store colunar (benchmark_store.py).",
+    )
+    parser.add_argument(
+        "--campaign",
+        action="append",
+        help="Filtra campanhas do store colunar (nome da pasta). Pode ser repetido.",
     )
     parser.add_argument(
         "--output",
         default="charts",
         help="Diretório raiz para salvar gráficos.",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help=f"Processos para renderizar os gráficos em paralelo (ex.: {os.cpu_count() or 1}).",
+    )
+    parser.add_argument(
+        "--summary-layout",
+        choices=SUMMARY_LAYOUTS,
+        default="files",
+        help="files: um PNG por algoritmo × delegate × tamanho; grid: uma grade por família.",
+    )
+    parser.add_argument(
+        "--clean",
+        action="store_true",
+        help="Apaga a pasta de saída e redesenha tudo (ignora o manifesto de figuras).",
+    )
+    parser.add_argument(
+        "--plan",
+        action="store_true",
+        help="Só lista as figuras (novas, alteradas, atuais, obsoletas), sem desenhar nem importar o Matplotlib.",
+    )
+    parser.add_argument(
+        "--speedup-ci",
+        choices=SPEEDUP_INTERVALS,
+        default="bootstrap",
+        help="IC do speedup: bootstrap das iterações de notes (padrão) ou none.",
+    )
+    parser.add_argument(
+        "--bootstrap-samples",
+        type=int,
+        default=DEFAULT_BOOTSTRAP_SAMPLES,
+        help=f"Reamostragens do IC do speedup (padrão: {DEFAULT_BOOTSTRAP_SAMPLES}).",
+    )
+    add_steady_state_argument(parser)
+    add_render_arguments(parser)
     args = parser.parse_args()
 
     csv_path = Path(args.csv)
     output_dir = Path(args.output)
 
-    sns.set_theme(style="whitegrid")
-
-    raw = load_data(csv_path)
-    raw = extract_device_model(raw)
-    raw = maybe_add_fake_devices(raw)
-    raw = add_normalized_columns(raw)
-    raw = derive_vector_size(raw)
-    raw = ensure_timing_columns(raw)
-
-    agg = aggregate_metrics(raw)
-    speedup_df = compute_speedup(agg)
-
-    prepare_output_dirs(output_dir, agg["device_model"].unique())
+    with_ci = args.speedup_ci == "bootstrap"
+    # Banco sem --steady-state: médias no SQLite; linhas só para o IC do speedup.
+    in_database = is_database(csv_path) and csv_path.exists() and not args.steady_state
+    raw: Optional[pd.DataFrame] = None
+    if with_ci or not in_database:
+        df = load_data(csv_path, args.campaign, include_notes=args.steady_state or with_ci)
+        if args.steady_state:
+            df = exclude_warmup(df)
+            print(f"Aquecimento excluído das médias em {df.attrs['warmup_rows']} execuções.")
+        raw = prepare_frame(df)
+    agg = aggregate_database(csv_path, args.campaign) if in_database else aggregate_metrics(raw)
+    intervals = speedup_intervals(raw, args.steady_state, args.bootstrap_samples) if with_ci else None
+    speedup_df = compute_speedup(agg, intervals)
+    jobs = build_jobs(agg, speedup_df, output_dir, args.summary_layout)
+    profile = profile_from_args(args)
+    if args.plan:
+        print_plan(plan_jobs(jobs, output_dir / MANIFEST_NAME, profile))
+        return
+
+    prepare_output_dirs(output_dir, agg["device_model"].unique(), args.clean)
+    rendered = run_jobs(jobs, args.workers, init_worker, manifest=output_dir / MANIFEST_NAME, profile=profile)
 
     for device in agg["device_model"].unique():
-        generate_device_plots(agg, speedup_df, output_dir, device)
         print_device_summary(agg, speedup_df, device)
         print(f"Gráficos gerados para dispositivo {device} em {output_dir}/{device}/...")
-
-    generate_summary_plots(agg, speedup_df, output_dir)
     print(f"Gráficos de comparação entre dispositivos gerados em {output_dir}/summary/...")
+    print(
+        f"{rendered} figuras renderizadas com {max(args.workers, 1)} processo(s); "
+        f"{len(jobs) - rendered} inalteradas."
+    )
+    if args.thumbnails:
+        sheet = write_thumbnails([job.output for job in jobs], output_dir, profile)
+        if sheet:
+            print(f"Miniaturas em {sheet}")
 
 
 if __name__ == "__main__":
@@ -6,22 +6,39 @@ Gera gráficos de temperatura (bateria/CPU/GPU) e energia (labels) a partir de b
 from __future__ import annotations
 
 import argparse
-import os
 import re
 from pathlib import Path
 from typing import Dict, Iterable, List, Optional
 
-import matplotlib
-
-BASE_DIR = Path(__file__).parent
-MPL_CACHE = BASE_DIR / ".matplotlib"
-os.environ.setdefault("MPLCONFIGDIR", str(MPL_CACHE))
-MPL_CACHE.mkdir(parents=True, exist_ok=True)
-matplotlib.use("Agg")
-
-import matplotlib.pyplot as plt
 import pandas as pd
-import seaborn as sns
+
+from benchmark_normalize import ALGORITHMS, normalize_frame
+from benchmark_schema import widen_types
+from benchmark_store import load_benchmarks
+from chart_jobs import ChartJob, lazy_import, run_jobs
+from chart_output import add_render_arguments, profile_from_args, save_figure, write_thumbnails
+
+# Stack de plot importado só ao desenhar a primeira figura (`--help`/`--plan` rápidos).
+plt = lazy_import("matplotlib.pyplot")
+sns = lazy_import("seaborn")
+
+LOAD_COLUMNS = [
+    "device_model",
+    "deviceModel",
+    "deviceInfo",
+    "model",
+    "delegate",
+    "test_name",
+    "input_size",
+    "batch_size",
+    "estimated_energy",
+    "battery_temp_start_c",
+    "battery_temp_end_c",
+    "cpu_temp_start_c",
+    "cpu_temp_end_c",
+    "gpu_temp_start_c",
+    "gpu_temp_end_c",
+]
 
 PALETTE = {
     "CPU Kotlin": "#7f7f7f",
@@ -38,57 +55,6 @@ SENSOR_PREFIXES = [
 ]
 
 
-def ensure_device_labels(df: pd.DataFrame) -> pd.DataFrame:
-    df = df.copy()
-    for column in ["device_model", "deviceModel", "deviceInfo", "model"]:
-        if column in df.columns:
-            labels = df[column].fillna("").astype(str).str.strip()
-            if labels.ne("").any():
-                df["device_model"] = labels.where(labels != "", "Dispositivo")
-                break
-    else:
-        df["device_model"] = "Dispositivo"
-    return df
-
-
-def normalize_delegate(text: str) -> str:
-    mapping = {
-        "cpu kotlin": "CPU Kotlin",
-        "kotlin": "CPU Kotlin",
-        "cpu": "CPU Kotlin",
-        "tflite cpu": "TFLite CPU",
-        "tflite gpu": "TFLite GPU",
-        "gpu": "TFLite GPU",
-        "tflite nnapi": "TFLite NNAPI",
-        "nnapi": "TFLite NNAPI",
-    }
-    key = str(text).strip().lower()
-    return mapping.get(key, text.strip() or "CPU Kotlin")
-
-
-def detect_algorithm(name: str) -> str:
-    upper = str(name).upper()
-    if "MAD" in upper:
-        return "MAD"
-    if "FFT" in upper:
-        return "FFT"
-    return "Outro"
-
-
-def derive_vector_length(row: pd.Series) -> int:
-    try:
-        base = float(row.get("input_size", 0) or 0)
-    except Exception:  # noqa: BLE001
-        return 0
-    batch = int(row.get("batch_size", 1) or 1)
-    if batch > 0:
-        base /= batch
-    if row.get("algorithm") == "FFT":
-        sensors = 10
-        base /= sensors
-    return int(round(base)) if base > 0 else 0
-
-
 def slugify(text: str) -> str:
     return re.sub(r"[^a-z0-9]+", "-", text.lower()).strip("-")
 
@@ -122,15 +88,15 @@ def energy_mode(series: pd.Series) -> Optional[str]:
     return candidates[0]
 
 
-def prepare_dataframe(csv_path: Path) -> pd.DataFrame:
-    df = pd.read_csv(csv_path)
-    df = ensure_device_labels(df)
-    df["delegate_norm"] = df["delegate"].apply(normalize_delegate)
-    df["algorithm"] = df["test_name"].apply(detect_algorithm)
-    df = df[df["algorithm"].isin(["MAD", "FFT"])]
-    df["mode"] = df["batch_size"].fillna(1).astype(int).apply(lambda v: "Batch (x10)" if v > 1 else "Single")
-    df["vector_length"] = df.apply(derive_vector_length, axis=1)
-    df = df[df["vector_length"] > 0]
+def prepare_dataframe(csv_path: Path, campaigns: Optional[List[str]] = None) -> pd.DataFrame:
+    return prepare_frame(load_benchmarks(csv_path, LOAD_COLUMNS, campaigns=campaigns, compact=True))
+
+
+def prepare_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Normaliza um frame já carregado (o original não é alterado)."""
+    df = normalize_frame(df, batch_by="batch_size")
+    df = df[df["algorithm"].isin(ALGORITHMS) & (df["vector_length"] > 0)].copy()
+    df["mode"] = df["is_batch"].map({True: "Batch (x10)", False: "Single"}).astype("category")
     df["energy_label"] = df["estimated_energy"].apply(parse_energy_label)
     df["energy_score"] = df["energy_label"].map(ENERGY_TO_SCORE)
     for prefix, _ in SENSOR_PREFIXES:
@@ -144,7 +110,7 @@ def prepare_dataframe(csv_path: Path) -> pd.DataFrame:
 def aggregate_temperatures(df: pd.DataFrame) -> pd.DataFrame:
     group_cols = ["device_model", "algorithm", "delegate_norm", "mode", "vector_length"]
     agg = (
-        df.groupby(group_cols)
+        df.groupby(group_cols, observed=True)
         .agg(
             battery_temp_start_c=("battery_temp_start_c", "mean"),
             battery_temp_end_c=("battery_temp_end_c", "mean"),
@@ -154,6 +120,7 @@ def aggregate_temperatures(df: pd.DataFrame) -> pd.DataFrame:
             gpu_temp_end_c=("gpu_temp_end_c", "mean"),
         )
         .reset_index()
+        .pipe(widen_types)
     )
     for prefix, _ in SENSOR_PREFIXES:
         agg[f"{prefix}_temp_delta_c"] = agg[f"{prefix}_temp_end_c"] - agg[f"{prefix}_temp_start_c"]
@@ -203,7 +170,7 @@ def plot_device_temperature_panels(
     g.add_legend(title="Delegate / Medição")
     g.figure.suptitle(f"{device} — {label} (Início × Fim)", y=1.02, fontsize=13)
     filename = output_dir / f"{slugify(device)}_{prefix}_start_end.png"
-    g.savefig(filename, dpi=300, bbox_inches="tight")
+    save_figure(g, filename, bbox_inches="tight")
     plt.close(g.fig)
 
 
@@ -212,7 +179,7 @@ def plot_delta_summary(agg: pd.DataFrame, prefix: str, label: str, output_dir: P
     if col not in agg.columns:
         return
     summary = (
-        agg.groupby(["device_model", "algorithm", "mode", "vector_length"])[col]
+        agg.groupby(["device_model", "algorithm", "mode", "vector_length"], observed=True)[col]
         .mean()
         .reset_index()
     )
@@ -235,83 +202,129 @@ def plot_delta_summary(agg: pd.DataFrame, prefix: str, label: str, output_dir: P
     g.set_axis_labels("Tamanho do vetor (amostras)", "Δ temperatura (°C)")
     g.figure.suptitle(f"Variação média de temperatura — {label}", y=1.02, fontsize=13)
     filename = output_dir / f"deltas_{prefix}.png"
-    g.savefig(filename, dpi=300, bbox_inches="tight")
+    save_figure(g, filename, bbox_inches="tight")
     plt.close(g.fig)
 
 
-def plot_energy_heatmaps(df: pd.DataFrame, output_dir: Path) -> None:
-    energy_df = df.dropna(subset=["energy_label"]).copy()
-    if energy_df.empty:
-        return
-
+def energy_summary(df: pd.DataFrame) -> pd.DataFrame:
+    """Etiqueta energética predominante por dispositivo × algoritmo × delegate."""
+    energy_df = df.dropna(subset=["energy_label"])
     summary = (
-        energy_df.groupby(["device_model", "algorithm", "delegate_norm"])
+        energy_df.groupby(["device_model", "algorithm", "delegate_norm"], observed=True)
         .agg(energy_label=("energy_label", energy_mode))
         .reset_index()
+        .pipe(widen_types)
     )
     summary["energy_score"] = summary["energy_label"].map(ENERGY_TO_SCORE)
-    for algorithm in sorted(summary["algorithm"].unique()):
-        subset = summary[summary["algorithm"] == algorithm]
-        pivot_values = subset.pivot(
-            index="device_model",
-            columns="delegate_norm",
-            values="energy_score",
-        )
-        if pivot_values.empty:
-            continue
-        labels = subset.pivot(
-            index="device_model",
-            columns="delegate_norm",
-            values="energy_label",
+    return summary
+
+
+def plot_energy_heatmap(subset: pd.DataFrame, algorithm: str, output_dir: Path) -> None:
+    pivot_values = subset.pivot(
+        index="device_model",
+        columns="delegate_norm",
+        values="energy_score",
+    )
+    if pivot_values.empty:
+        return
+    labels = subset.pivot(
+        index="device_model",
+        columns="delegate_norm",
+        values="energy_label",
+    )
+    sns.set_theme(style="whitegrid")
+    plt.figure(figsize=(6, 0.8 * len(pivot_values.index) + 2))
+    ax = sns.heatmap(
+        pivot_values,
+        annot=labels,
+        fmt="",
+        cmap="YlGnBu",
+        vmin=min(ENERGY_TO_SCORE.values()),
+        vmax=max(ENERGY_TO_SCORE.values()),
+        cbar_kws={"label": "Intensidade (1=Baixa, 3=Alta)"},
+    )
+    ax.set_xlabel("Delegate")
+    ax.set_ylabel("Dispositivo")
+    ax.set_title(f"Etiqueta energética predominante — {algorithm}")
+    filename = output_dir / f"energy_{algorithm.lower()}.png"
+    plt.tight_layout()
+    save_figure(plt, filename)
+    plt.close()
+
+
+def build_jobs(df: pd.DataFrame, output_dir: Path) -> List[ChartJob]:
+    """Jobs térmicos (`thermal/`) e energéticos (`energy/`), um por figura."""
+    thermal_dir = output_dir / "thermal"
+    energy_dir = output_dir / "energy"
+    jobs: List[ChartJob] = []
+    temp_agg = aggregate_temperatures(df)
+    by_device = dict(list(temp_agg.groupby("device_model", observed=True)))
+    for prefix, label in SENSOR_PREFIXES:
+        columns = [f"{prefix}_temp_start_c", f"{prefix}_temp_end_c"]
+        if temp_agg[columns].isna().all(axis=None):
+            continue  # sensor sem leituras nesta campanha
+        for device in sorted(by_device):
+            if by_device[device][columns].isna().all(axis=None):
+                continue
+            jobs.append(
+                ChartJob(
+                    plot_device_temperature_panels,
+                    (by_device[device], device, prefix, label, thermal_dir),
+                    thermal_dir / f"{slugify(device)}_{prefix}_start_end.png",
+                )
+            )
+        jobs.append(
+            ChartJob(
+                plot_delta_summary,
+                (temp_agg, prefix, label, thermal_dir),
+                thermal_dir / f"deltas_{prefix}.png",
+            )
         )
-        sns.set_theme(style="whitegrid")
-        plt.figure(figsize=(6, 0.8 * len(pivot_values.index) + 2))
-        ax = sns.heatmap(
-            pivot_values,
-            annot=labels,
-            fmt="",
-            cmap="YlGnBu",
-            vmin=min(ENERGY_TO_SCORE.values()),
-            vmax=max(ENERGY_TO_SCORE.values()),
-            cbar_kws={"label": "Intensidade (1=Baixa, 3=Alta)"},
+
+    summary = energy_summary(df)
+    for algorithm, subset in summary.groupby("algorithm", observed=True):
+        jobs.append(
+            ChartJob(
+                plot_energy_heatmap,
+                (subset, algorithm, energy_dir),
+                energy_dir / f"energy_{algorithm.lower()}.png",
+            )
         )
-        ax.set_xlabel("Delegate")
-        ax.set_ylabel("Dispositivo")
-        ax.set_title(f"Etiqueta energética predominante — {algorithm}")
-        filename = output_dir / f"energy_{algorithm.lower()}.png"
-        plt.tight_layout()
-        plt.savefig(filename, dpi=300)
-        plt.close()
+    return jobs
 
 
 def main() -> None:
     parser = argparse.ArgumentParser(description="Gera gráficos térmicos e energéticos dos benchmarks.")
-    parser.add_argument("--csv", required=True, help="Caminho para o CSV consolidado.")
+    parser.add_argument(
+        "--csv",
+        required=True,
+        help="Caminho para o CSV consolidado ou diretório do store colunar.",
+    )
+    parser.add_argument(
+        "--campaign",
+        action="append",
+        help="Filtra campanhas do store colunar (nome da pasta). Pode ser repetido.",
+    )
     parser.add_argument(
         "--output",
         default="docs/charts/comparativo-09-12/thermal_energy",
         help="Diretório base para salvar os gráficos.",
     )
+    add_render_arguments(parser)
     args = parser.parse_args()
 
     csv_path = Path(args.csv)
     output_dir = Path(args.output)
-    thermal_dir = output_dir / "thermal"
-    energy_dir = output_dir / "energy"
-    thermal_dir.mkdir(parents=True, exist_ok=True)
-    energy_dir.mkdir(parents=True, exist_ok=True)
-
-    df = prepare_dataframe(csv_path)
-    temp_agg = aggregate_temperatures(df)
-    devices = sorted(temp_agg["device_model"].unique())
-    for prefix, label in SENSOR_PREFIXES:
-        for device in devices:
-            plot_device_temperature_panels(temp_agg, device, prefix, label, thermal_dir)
-        plot_delta_summary(temp_agg, prefix, label, thermal_dir)
-
-    plot_energy_heatmaps(df, energy_dir)
-    print(f"Gráficos térmicos salvos em {thermal_dir}")
-    print(f"Gráficos energéticos salvos em {energy_dir}")
+    df = prepare_dataframe(csv_path, args.campaign)
+    jobs = build_jobs(df, output_dir)
+    profile = profile_from_args(args)
+    run_jobs(jobs, profile=profile)
+    if args.thumbnails:
+        sheet = write_thumbnails([job.output for job in jobs], output_dir, profile)
+        if sheet:
+            print(f"Miniaturas em {sheet}")
+    print(f"Gráficos térmicos salvos em {output_dir / 'thermal'}")
+    print(f"Gráficos energéticos salvos em {output_dir / 'energy'}")
 
 
 if __name__ == "__main__":
@@ -9,23 +9,35 @@ processamento para cada delegate (TFLite CPU/GPU/NNAPI).
 from __future__ import annotations
 
 import argparse
-import os
 from pathlib import Path
-from typing import List
+from typing import List, Optional
 
-import matplotlib
-
-BASE_DIR = Path(__file__).parent
-MPL_CACHE = BASE_DIR / ".matplotlib"
-os.environ.setdefault("MPLCONFIGDIR", str(MPL_CACHE))
-MPL_CACHE.mkdir(parents=True, exist_ok=True)
-matplotlib.use("Agg")
-
-import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
-import seaborn as sns
-from matplotlib.patches import Patch
+
+from benchmark_normalize import filter_known, normalize_frame
+from benchmark_schema import widen_types
+from benchmark_store import load_benchmarks
+from chart_jobs import ChartJob, lazy_import, run_jobs
+from chart_output import add_render_arguments, output_path, profile_from_args, save_figure, write_thumbnails
+
+# Stack de plot importado só ao desenhar a primeira figura (`--help`/`--plan` rápidos).
+plt = lazy_import("matplotlib.pyplot")
+sns = lazy_import("seaborn")
+mpatches = lazy_import("matplotlib.patches")
+
+LOAD_COLUMNS = [
+    "device_model",
+    "deviceModel",
+    "deviceInfo",
+    "model",
+    "delegate",
+    "test_name",
+    "input_size",
+    "batch_size",
+    "transfer_ms",
+    "compute_ms",
+]
 
 DELEGATES = ["CPU Kotlin", "TFLite CPU", "TFLite GPU", "TFLite NNAPI"]
 ALGORITHMS = ["MAD", "FFT"]
@@ -47,34 +59,6 @@ DELEGATE_COLORS = {
 TRANSFER_COLOR = "#CBD5E0"
 
 
-def _fallback_device_series(df: pd.DataFrame) -> pd.Series:
-    if "deviceModel" in df.columns:
-        return df["deviceModel"]
-    if "deviceInfo" in df.columns:
-        return df["deviceInfo"]
-    if "model" in df.columns:
-        return df["model"]
-    return pd.Series(["Dispositivo"] * len(df))
-
-
-def ensure_device_labels(df: pd.DataFrame) -> pd.DataFrame:
-    df = df.copy()
-    if "device_model" in df.columns:
-        df["device_model"] = df["device_model"].astype(str).str.strip()
-        empties = df["device_model"] == ""
-        if empties.any():
-            fallback = _fallback_device_series(df)
-            df.loc[empties, "device_model"] = (
-                fallback.fillna("Dispositivo").astype(str).str.strip().where(lambda s: s != "", "Dispositivo")
-            )
-        return df
-
-    fallback = _fallback_device_series(df)
-    df["device_model"] = fallback.fillna("Dispositivo").astype(str).str.strip()
-    df.loc[df["device_model"] == "", "device_model"] = "Dispositivo"
-    return df
-
-
 def determine_device_order(devices: List[str]) -> List[str]:
     order: List[str] = []
     for known in KNOWN_DEVICE_ORDER:
@@ -86,45 +70,26 @@ def determine_device_order(devices: List[str]) -> List[str]:
     return order
 
 
-def detect_algorithm(name: str) -> str:
-    upper = str(name).upper()
-    if "MAD" in upper:
-        return "MAD"
-    if "FFT" in upper:
-        return "FFT"
-    return "Outro"
-
+def prepare_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Normaliza um frame já carregado (o original não é alterado)."""
+    df = normalize_frame(df, batch_by="batch_size")
+    df = df.assign(delegate=df["delegate_norm"])
+    return filter_known(df, ALGORITHMS, DELEGATES)
 
-def derive_vector_length(row: pd.Series) -> int:
-    batch = int(row.get("batch_size", 1) or 1)
-    input_size = int(row.get("input_size", 0) or 0)
-    if row["algorithm"] == "FFT":
-        sensors = 10
-        return int(input_size / (batch * sensors)) if input_size else 0
-    return int(input_size / batch) if batch else int(input_size)
 
-
-def prepare_data(csv_path: Path) -> pd.DataFrame:
-    df = pd.read_csv(csv_path)
-    df = ensure_device_labels(df)
-    df["delegate"] = df["delegate"].astype(str).str.strip()
-    df["algorithm"] = df["test_name"].apply(detect_algorithm)
-    df["is_batch"] = df["batch_size"].fillna(1).astype(int) > 1
-    df["vector_length"] = df.apply(derive_vector_length, axis=1)
-    df = df[df["algorithm"].isin(ALGORITHMS)]
-    df = df[df["delegate"].isin(DELEGATES)]
-    df = df[df["vector_length"] > 0]
-    return df
+def prepare_data(csv_path: Path, campaigns: Optional[List[str]] = None) -> pd.DataFrame:
+    return prepare_frame(load_benchmarks(csv_path, LOAD_COLUMNS, campaigns=campaigns, compact=True))
 
 
 def aggregate_metrics(df: pd.DataFrame) -> pd.DataFrame:
     agg = (
-        df.groupby(["algorithm", "delegate", "device_model", "is_batch"])
+        df.groupby(["algorithm", "delegate", "device_model", "is_batch"], observed=True)
         .agg(
             transfer_mean=("transfer_ms", "mean"),
             compute_mean=("compute_ms", "mean"),
         )
         .reset_index()
+        .pipe(widen_types)
     )
     # garante que CPU tenha transferência zero e compute como tempo total
     cpu_mask = agg["delegate"] == "CPU Kotlin"
@@ -202,8 +167,8 @@ def plot_summary(df: pd.DataFrame, algorithm: str, output_path: Path, device_ord
         ax.set_ylabel("Tempo (ms)")
         ax.grid(True, axis="y", linestyle="--", alpha=0.4)
 
-    legend_handles = [Patch(color=TRANSFER_COLOR, label="Transferência (GPU/NNAPI)")]
-    legend_handles += [Patch(color=DELEGATE_COLORS[d], label=f"{d} - Processamento") for d in DELEGATES]
+    legend_handles = [mpatches.Patch(color=TRANSFER_COLOR, label="Transferência (GPU/NNAPI)")]
+    legend_handles += [mpatches.Patch(color=DELEGATE_COLORS[d], label=f"{d} - Processamento") for d in DELEGATES]
     fig.legend(
         legend_handles,
         [h.get_label() for h in legend_handles],
@@ -213,32 +178,58 @@ def plot_summary(df: pd.DataFrame, algorithm: str, output_path: Path, device_ord
     )
     fig.suptitle(f"Tempo de transferência vs processamento — {algorithm}", y=0.995, fontsize=16)
     fig.tight_layout(rect=[0, 0, 1, 0.97])
-    fig.savefig(output_path, dpi=300)
+    save_figure(fig, output_path)
     plt.close(fig)
 
 
+def build_jobs(data: pd.DataFrame, output_dir: Path) -> List[ChartJob]:
+    """Um job por algoritmo, com o agregado já recortado."""
+    agg = aggregate_metrics(data)
+    device_order = determine_device_order(list(data["device_model"].unique()))
+    return [
+        ChartJob(
+            plot_summary,
+            (agg[agg["algorithm"] == algo], algo, output_dir / f"transfer_compute_{algo.lower()}.png", device_order),
+            output_dir / f"transfer_compute_{algo.lower()}.png",
+        )
+        for algo in ALGORITHMS
+    ]
+
+
 def main() -> None:
     parser = argparse.ArgumentParser(
         description="Gera gráfico único de transferência x processamento para MAD/FFT."
     )
-    parser.add_argument("--csv", required=True, help="Caminho para benchmark_results.csv consolidado.")
+    parser.add_argument(
+        "--csv",
+        required=True,
+        help="Caminho para benchmark_results.csv consolidado ou diretório do store colunar.",
+    )
+    parser.add_argument(
+        "--campaign",
+        action="append",
+        help="Filtra campanhas do store colunar (nome da pasta). Pode ser repetido.",
+    )
     parser.add_argument(
         "--output",
         default="docs/charts/comparativo-30-11/transfer",
         help="Diretório de saída para os PNGs.",
     )
+    add_render_arguments(parser)
     args = parser.parse_args()
 
     csv_path = Path(args.csv)
-    data = prepare_data(csv_path)
-    agg = aggregate_metrics(data)
-    device_order = determine_device_order(list(data["device_model"].unique()))
+    data = prepare_data(csv_path, args.campaign)
     output_dir = Path(args.output)
-    output_dir.mkdir(parents=True, exist_ok=True)
-    for algo in ALGORITHMS:
-        target = output_dir / f"transfer_compute_{algo.lower()}.png"
-        plot_summary(agg, algo, target, device_order)
-        print(f"Gráfico salvo em {target}")
+    jobs = build_jobs(data, output_dir)
+    profile = profile_from_args(args)
+    run_jobs(jobs, profile=profile)
+    for job in jobs:
+        print(f"Gráfico salvo em {output_path(job.output, profile)}")
+    if args.thumbnails:
+        sheet = write_thumbnails([job.output for job in jobs], output_dir, profile)
+        if sheet:
+            print(f"Miniaturas em {sheet}")
 
 
 if __name__ == "__main__":
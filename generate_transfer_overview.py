@@ -8,28 +8,41 @@ Para cada algoritmo/delegate são criados dois gráficos:
 - batch: batch_size > 1 (ex.: x10)
 
 Os dados são extraídos de benchmark_results.csv e os PNGs ficam organizados em
-<output>/<ALG>/<DELEGATE>/<arquivo>.png.
+<output>/<ALG>/<DELEGATE>/<arquivo>.png. As médias e faixas (`--ci`) vêm de
+benchmark_stats.summarize, calculadas uma vez antes dos gráficos.
 """
 
 from __future__ import annotations
 
 import argparse
-import os
 from itertools import cycle
 from pathlib import Path
-from typing import Dict, Iterable, List
+from typing import Dict, Iterable, List, Optional
 
-import matplotlib
-
-BASE_DIR = Path(__file__).parent
-MPL_CACHE = BASE_DIR / ".matplotlib"
-os.environ.setdefault("MPLCONFIGDIR", str(MPL_CACHE))
-MPL_CACHE.mkdir(parents=True, exist_ok=True)
-matplotlib.use("Agg")
-
-import matplotlib.pyplot as plt
 import pandas as pd
-import seaborn as sns
+
+from benchmark_normalize import filter_known, normalize_frame
+from benchmark_schema import widen_types
+from benchmark_stats import add_interval_arguments, fill_intervals, summarize
+from benchmark_store import load_benchmarks
+from chart_jobs import ChartJob, lazy_import, run_jobs
+from chart_output import add_render_arguments, profile_from_args, save_figure, write_thumbnails
+
+# Stack de plot importado só ao desenhar a primeira figura (`--help`/`--plan` rápidos).
+plt = lazy_import("matplotlib.pyplot")
+sns = lazy_import("seaborn")
+
+LOAD_COLUMNS = [
+    "device_model",
+    "deviceModel",
+    "deviceInfo",
+    "model",
+    "delegate",
+    "test_name",
+    "input_size",
+    "batch_size",
+    "transfer_ms",
+]
 
 DELEGATES = ["TFLite CPU", "TFLite GPU", "TFLite NNAPI"]
 ALGORITHMS = ["MAD", "FFT"]
@@ -52,6 +65,7 @@ FALLBACK_COLORS = [
 ]
 TITLE_FONTSIZE = 12
 TITLE_PAD = 14
+SUMMARY_KEYS = ["algorithm", "delegate", "is_batch", "device_model", "vector_length"]
 
 
 def format_vector_label(length: int) -> str:
@@ -62,54 +76,6 @@ def format_vector_label(length: int) -> str:
     return str(int(length))
 
 
-def detect_algorithm(name: str) -> str:
-    upper = str(name).upper()
-    if "MAD" in upper:
-        return "MAD"
-    if "FFT" in upper:
-        return "FFT"
-    return "Outro"
-
-
-def derive_vector_length(row: pd.Series) -> int:
-    batch = int(row.get("batch_size", 1) or 1)
-    input_size = int(row.get("input_size", 0) or 0)
-    if row["algorithm"] == "FFT":
-        sensors = 10
-        if input_size == 0:
-            return 0
-        return int(input_size / (batch * sensors))
-    return int(input_size / batch) if batch else int(input_size)
-
-
-def _fallback_device_series(df: pd.DataFrame) -> pd.Series:
-    if "deviceModel" in df.columns:
-        return df["deviceModel"]
-    if "deviceInfo" in df.columns:
-        return df["deviceInfo"]
-    if "model" in df.columns:
-        return df["model"]
-    return pd.Series(["Dispositivo"] * len(df))
-
-
-def ensure_device_labels(df: pd.DataFrame) -> pd.DataFrame:
-    df = df.copy()
-    if "device_model" in df.columns:
-        df["device_model"] = df["device_model"].astype(str).str.strip()
-        empties = df["device_model"] == ""
-        if empties.any():
-            fallback = _fallback_device_series(df)
-            df.loc[empties, "device_model"] = (
-                fallback.fillna("Dispositivo").astype(str).str.strip().where(lambda s: s != "", "Dispositivo")
-            )
-        return df
-
-    fallback = _fallback_device_series(df)
-    df["device_model"] = fallback.fillna("Dispositivo").astype(str).str.strip()
-    df.loc[df["device_model"] == "", "device_model"] = "Dispositivo"
-    return df
-
-
 def build_device_palette(devices: List[str]) -> Dict[str, str]:
     palette: Dict[str, str] = {}
     extra_colors = cycle(FALLBACK_COLORS)
@@ -124,23 +90,15 @@ def build_device_palette(devices: List[str]) -> Dict[str, str]:
     return palette
 
 
-def prepare_data(csv_path: Path) -> pd.DataFrame:
-    df = pd.read_csv(csv_path)
-    df = ensure_device_labels(df)
-    df["delegate"] = df["delegate"].astype(str).str.strip()
-    df["algorithm"] = df["test_name"].apply(detect_algorithm)
-    df["is_batch"] = df["batch_size"].fillna(1).astype(int) > 1
-    df["vector_length"] = df.apply(derive_vector_length, axis=1)
-    df = df[df["algorithm"].isin(ALGORITHMS)]
-    df = df[df["delegate"].isin(DELEGATES)]
-    df = df[df["vector_length"] > 0]
-    return df
+def prepare_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Normaliza um frame já carregado (o original não é alterado)."""
+    df = normalize_frame(df, batch_by="batch_size")
+    df = df.assign(delegate=df["delegate_norm"])
+    return widen_types(filter_known(df, ALGORITHMS, DELEGATES))
 
 
-def ensure_output_dirs(base: Path, algorithms: Iterable[str], delegates: Iterable[str]) -> None:
-    for algo in algorithms:
-        for delegate in delegates:
-            (base / algo / delegate.replace(" ", "_")).mkdir(parents=True, exist_ok=True)
+def prepare_data(csv_path: Path, campaigns: Optional[List[str]] = None) -> pd.DataFrame:
+    return prepare_frame(load_benchmarks(csv_path, LOAD_COLUMNS, campaigns=campaigns, compact=True))
 
 
 def apply_vector_ticks(ax, values: Iterable[int]) -> None:
@@ -161,7 +119,6 @@ def plot_transfer_lines(
     data: pd.DataFrame,
     algorithm: str,
     delegate: str,
-    *,
     batch_mode: bool,
     output_dir: Path,
     palette: Dict[str, str],
@@ -181,11 +138,14 @@ def plot_transfer_lines(
     ax = sns.lineplot(
         data=subset,
         x="vector_length",
-        y="transfer_ms",
+        y="mean",
         hue="device_model",
+        hue_order=sorted(subset["device_model"].unique()),
         marker="o",
         palette=palette,
+        errorbar=None,
     )
+    fill_intervals(ax, subset, "vector_length", "device_model", palette)
     ax.set_xlabel("Tamanho efetivo do vetor (amostras)")
     ax.set_ylabel("Tempo médio de transferência (ms)")
     apply_title(ax, f"{algorithm} — {delegate} — {title_mode}")
@@ -193,10 +153,30 @@ def plot_transfer_lines(
     ax.legend(title="Dispositivo", loc="best", fontsize=9, title_fontsize=10)
     finalize_plot()
     filename = f"{algorithm.lower()}_{delegate.replace(' ', '_').lower()}_{filename_mode}.png"
-    plt.savefig(output_dir / algorithm / delegate.replace(" ", "_") / filename, dpi=300)
+    save_figure(plt, output_dir / algorithm / delegate.replace(" ", "_") / filename)
     plt.close()
 
 
+def build_jobs(data: pd.DataFrame, output_dir: Path) -> List[ChartJob]:
+    """Um job por figura, com o agregado de `summarize` já recortado."""
+    palette = build_device_palette(sorted(data["device_model"].unique()))
+    jobs: List[ChartJob] = []
+    groups = data.groupby(["algorithm", "delegate", "is_batch"], observed=True)
+    for (algo, delegate, batch_mode), subset in groups:
+        if algo not in ALGORITHMS or delegate not in DELEGATES:
+            continue
+        mode = "batch" if batch_mode else "single"
+        slug = delegate.replace(" ", "_")
+        jobs.append(
+            ChartJob(
+                plot_transfer_lines,
+                (subset, algo, delegate, batch_mode, output_dir, palette),
+                output_dir / algo / slug / f"{algo.lower()}_{slug.lower()}_{mode}.png",
+            )
+        )
+    return jobs
+
+
 def main() -> None:
     parser = argparse.ArgumentParser(
         description="Gera gráficos multi-dispositivo focados no tempo de transferência dos delegates TFLite."
@@ -204,28 +184,36 @@ def main() -> None:
     parser.add_argument(
         "--csv",
         required=True,
-        help="Caminho para benchmark_results.csv consolidado.",
+        help="Caminho para benchmark_results.csv consolidado ou diretório do store colunar.",
+    )
+    parser.add_argument(
+        "--campaign",
+        action="append",
+        help="Filtra campanhas do store colunar (nome da pasta). Pode ser repetido.",
     )
     parser.add_argument(
         "--output",
         default="docs/charts/comparativo-30-11/transfer",
         help="Diretório base onde os PNGs serão salvos.",
     )
+    add_interval_arguments(parser)
+    add_render_arguments(parser)
     args = parser.parse_args()
 
     csv_path = Path(args.csv)
     output_dir = Path(args.output)
     output_dir.mkdir(parents=True, exist_ok=True)
 
-    data = prepare_data(csv_path)
-    devices = sorted(data["device_model"].unique())
-    palette = build_device_palette(devices)
-    ensure_output_dirs(output_dir, ALGORITHMS, DELEGATES)
-
-    for algo in ALGORITHMS:
-        for delegate in DELEGATES:
-            plot_transfer_lines(data, algo, delegate, batch_mode=False, output_dir=output_dir, palette=palette)
-            plot_transfer_lines(data, algo, delegate, batch_mode=True, output_dir=output_dir, palette=palette)
+    raw = prepare_data(csv_path, args.campaign)
+    # Média + intervalo de todas as linhas de uma vez; as figuras só recortam.
+    data = summarize(raw, SUMMARY_KEYS, "transfer_ms", args.ci, n_boot=args.bootstrap_samples)
+    jobs = build_jobs(data, output_dir)
+    profile = profile_from_args(args)
+    run_jobs(jobs, profile=profile)
+    if args.thumbnails:
+        sheet = write_thumbnails([job.output for job in jobs], output_dir, profile)
+        if sheet:
+            print(f"Miniaturas em {sheet}")
 
     print(f"Gráficos de transferência salvos em {output_dir}")
 
@@ -11,26 +11,83 @@ python3 merge_benchmarks.py \
   --device "Moto G84 (30-11)=app/src/BANCHMARK/motog-84-30-11/benchmark_results.csv" \
   --output app/src/BANCHMARK/comparativo-09-12/benchmark_results.csv
 ```
+
+Os arquivos são lidos em blocos (`--chunk-rows`) e gravados no destino à medida
+que chegam, então a memória fica constante independentemente do número de
+dispositivos. Cada linha é mapeada pelo número de campos para o layout correto
+(17 colunas legacy, 30 colunas, 36 colunas com temperaturas), o que cobre CSVs em
+que o app foi atualizado no meio da campanha.
+
+Com `--incremental`, um manifesto `<saida>.manifest.json` guarda tamanho, mtime e
+SHA-256 de cada fonte: fontes inalteradas são puladas sem leitura, e das
+alteradas/novas só entram as linhas cuja chave (`timestamp`, `test_name`,
+`device_model`) ainda não existe no consolidado (append, sem reescrever o arquivo).
+Linhas removidas de uma fonte só saem do consolidado numa execução completa.
+
+`--discover` percorre `app/src/BANCHMARK/*/benchmark_results.csv` (ignorando os
+consolidados, que já têm `device_model`) e deduz o label pela pasta
+(`motog84-09-12` → "Moto G84 (09-12)"); pastas sem data usam o dia do primeiro
+`timestamp`, e aparelhos desconhecidos usam o `model` do próprio CSV. Com
+`--workers N`, cada fonte é convertida em paralelo num pool de processos e as
+partes são concatenadas na ordem das fontes:
+
+```bash
+python3 merge_benchmarks.py --discover --workers 4 --output /tmp/historico/benchmark_results.csv
+```
 """
 
 from __future__ import annotations
 
 import argparse
+import csv
+import hashlib
+import json
+import os
+import re
+import shutil
 import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
 from pathlib import Path
-from typing import List, Optional, Tuple
+from typing import Dict, Iterator, List, Optional, Set, Tuple
 
-import csv
 import pandas as pd
 
-EXTRA_TEMPERATURE_COLS = [
-    "battery_temp_start_c",
-    "battery_temp_end_c",
-    "cpu_temp_start_c",
-    "cpu_temp_end_c",
-    "gpu_temp_start_c",
-    "gpu_temp_end_c",
-]
+from benchmark_schema import (
+    BASE_COLUMNS,
+    DEVICE_TIMEZONE,
+    LEGACY_COLUMNS,
+    MERGE_COLUMNS,
+    TEMPERATURE_COLUMNS,
+    THERMAL_COLUMNS,
+    coerce_types,
+    reindex_columns,
+)
+
+EXTRA_TEMPERATURE_COLS = TEMPERATURE_COLUMNS
+
+# Layouts conhecidos indexados pela quantidade de campos da linha.
+KNOWN_LAYOUTS: Dict[int, List[str]] = {
+    len(LEGACY_COLUMNS): LEGACY_COLUMNS,
+    len(BASE_COLUMNS): BASE_COLUMNS,
+    len(THERMAL_COLUMNS): THERMAL_COLUMNS,
+    len(THERMAL_COLUMNS) + len(MERGE_COLUMNS): THERMAL_COLUMNS + MERGE_COLUMNS,
+}
+
+DEFAULT_CHUNK_ROWS = 5000
+DEDUP_KEYS = ["timestamp", "test_name", "device_model"]
+DEFAULT_BENCHMARK_DIR = Path(__file__).parent / "app" / "src" / "BANCHMARK"
+
+# Nome do aparelho na pasta da campanha (sem prefixos/hífens) -> label dos gráficos.
+DEVICE_ALIASES = {
+    "s21": "Galaxy S21",
+    "motog04": "Moto G04s",
+    "motog04s": "Moto G04s",
+    "motog84": "Moto G84",
+}
+CAMPAIGN_PREFIXES = ("meu-", "glace-")
+CAMPAIGN_DATE = re.compile(r"^(?P<device>.+?)-(?P<date>\d{2}-\d{2})$")
 
 
 def parse_device_args(entries: List[str]) -> List[Tuple[Optional[str], Path]]:
@@ -50,16 +107,79 @@ def fallback_device_label(df: pd.DataFrame) -> pd.Series:
             series = df[column].fillna("").astype(str).str.strip()
             if series.ne("").any():
                 return series.where(series != "", "Dispositivo")
-    return pd.Series(["Dispositivo"] * len(df))
+    return pd.Series(["Dispositivo"] * len(df), index=df.index)
 
 
-def load_with_label(csv_path: Path, label: Optional[str]) -> pd.DataFrame:
-    if not csv_path.exists():
-        raise FileNotFoundError(f"Arquivo não encontrado: {csv_path}")
-    try:
-        df = pd.read_csv(csv_path)
-    except pd.errors.ParserError:
-        df = _load_with_padding(csv_path)
+def read_header(csv_path: Path) -> List[str]:
+    with csv_path.open(newline="") as fp:
+        header = next(csv.reader(fp), [])
+    return [c.strip() for c in header]
+
+
+def detect_layout_version(header: List[str]) -> str:
+    """Identifica o layout do cabeçalho: `legacy-17`, `base-30`, `thermal-36` ou `custom-N`."""
+    names = {
+        tuple(LEGACY_COLUMNS): "legacy-17",
+        tuple(BASE_COLUMNS): "base-30",
+        tuple(THERMAL_COLUMNS): "thermal-36",
+    }
+    prefix = tuple(header[: len(THERMAL_COLUMNS)])
+    if tuple(header) in names:
+        return names[tuple(header)]
+    if prefix == tuple(THERMAL_COLUMNS):
+        return f"thermal-36+{len(header) - len(THERMAL_COLUMNS)}"
+    return f"custom-{len(header)}"
+
+
+def _columns_for_width(header: List[str], width: int) -> List[str]:
+    if width == len(header):
+        return header
+    if width in KNOWN_LAYOUTS:
+        return KNOWN_LAYOUTS[width]
+    if width > len(header):
+        missing = width - len(header)
+        if missing == len(EXTRA_TEMPERATURE_COLS):
+            return header + EXTRA_TEMPERATURE_COLS
+        return header + [f"extra_col_{i+1}" for i in range(missing)]
+    return header[:width]
+
+
+def _frame_from_rows(rows: List[List[str]], header: List[str]) -> pd.DataFrame:
+    by_width: Dict[int, List[List[str]]] = {}
+    for row in rows:
+        by_width.setdefault(len(row), []).append(row)
+    frames = [
+        pd.DataFrame(group, columns=_columns_for_width(header, width), dtype="string")
+        for width, group in by_width.items()
+    ]
+    frame = frames[0] if len(frames) == 1 else pd.concat(frames, ignore_index=True, sort=False)
+    return coerce_types(frame)
+
+
+def iter_benchmark_chunks(csv_path: Path, chunk_rows: int = DEFAULT_CHUNK_ROWS) -> Iterator[pd.DataFrame]:
+    """Lê o CSV em blocos tipados de até `chunk_rows` linhas.
+
+    Linhas com mais/menos campos que o cabeçalho são mapeadas para o layout
+    conhecido de mesma largura; larguras desconhecidas recebem `extra_col_N`.
+    """
+    with csv_path.open(newline="") as fp:
+        reader = csv.reader(fp)
+        header = [c.strip() for c in next(reader, [])]
+        if not header:
+            return
+        rows: List[List[str]] = []
+        for row in reader:
+            if not row:
+                continue
+            rows.append(row)
+            if len(rows) >= chunk_rows:
+                yield _frame_from_rows(rows, header)
+                rows = []
+        if rows:
+            yield _frame_from_rows(rows, header)
+
+
+def label_chunk(df: pd.DataFrame, csv_path: Path, label: Optional[str]) -> pd.DataFrame:
     if label:
         df["device_model"] = label
     else:
@@ -68,23 +188,295 @@ def load_with_label(csv_path: Path, label: Optional[str]) -> pd.DataFrame:
     return df
 
 
-def _load_with_padding(csv_path: Path) -> pd.DataFrame:
-    with csv_path.open(newline="") as fp:
-        reader = list(csv.reader(fp))
-    if not reader:
+def iter_labeled_chunks(
+    csv_path: Path, label: Optional[str], chunk_rows: int = DEFAULT_CHUNK_ROWS
+) -> Iterator[pd.DataFrame]:
+    if not csv_path.exists():
+        raise FileNotFoundError(f"Arquivo não encontrado: {csv_path}")
+    for chunk in iter_benchmark_chunks(csv_path, chunk_rows):
+        yield label_chunk(chunk, csv_path, label)
+
+
+def load_with_label(csv_path: Path, label: Optional[str]) -> pd.DataFrame:
+    frames = list(iter_labeled_chunks(csv_path, label))
+    if not frames:
         return pd.DataFrame()
-    header = reader[0]
-    max_len = max(len(row) for row in reader)
-    if max_len > len(header):
-        missing = max_len - len(header)
-        if missing == len(EXTRA_TEMPERATURE_COLS):
-            header = header + EXTRA_TEMPERATURE_COLS
+    return pd.concat(frames, ignore_index=True, sort=False)
+
+
+def output_columns(paths: List[Path]) -> List[str]:
+    """Colunas do CSV consolidado: layout térmico completo + colunas extras dos cabeçalhos."""
+    columns = THERMAL_COLUMNS + MERGE_COLUMNS
+    for path in paths:
+        for col in read_header(path):
+            if col not in columns:
+                columns.append(col)
+    return columns
+
+
+def _first_value(csv_path: Path, column: str) -> str:
+    with csv_path.open(newline="") as fp:
+        reader = csv.reader(fp)
+        header = [c.strip() for c in next(reader, [])]
+        row = next(reader, [])
+    if column not in header or len(row) <= header.index(column):
+        return ""
+    return row[header.index(column)].strip()
+
+
+def infer_device_label(csv_path: Path) -> str:
+    """Label a partir da pasta da campanha; usa o CSV para a data/modelo quando faltam."""
+    name = csv_path.parent.name
+    match = CAMPAIGN_DATE.match(name)
+    device, date = (match.group("device"), match.group("date")) if match else (name, None)
+    for prefix in CAMPAIGN_PREFIXES:
+        if device.startswith(prefix):
+            device = device[len(prefix):]
+    device_name = DEVICE_ALIASES.get(device.replace("-", "").lower())
+    if device_name is None:
+        device_name = _first_value(csv_path, "model") or name
+    if date is None:
+        stamp = _first_value(csv_path, "timestamp")
+        if stamp.isdigit():
+            moment = datetime.fromtimestamp(int(stamp) / 1000, tz=DEVICE_TIMEZONE)
+            date = moment.strftime("%d-%m")
+    return f"{device_name} ({date})" if date else device_name
+
+
+def discover_sources(base_dir: Path = DEFAULT_BENCHMARK_DIR) -> List[Tuple[Optional[str], Path]]:
+    """Campanhas de um único aparelho em `base_dir`, com o label deduzido."""
+    entries: List[Tuple[Optional[str], Path]] = []
+    labels: Dict[str, int] = {}
+    for path in sorted(base_dir.glob("*/benchmark_results.csv")):
+        if path.parent.name.startswith(".") or "device_model" in read_header(path):
+            continue
+        label = infer_device_label(path)
+        labels[label] = labels.get(label, 0) + 1
+        if labels[label] > 1:
+            label = f"{label} [{path.parent.name}]"
+        entries.append((label, path))
+    return entries
+
+
+def _write_source(
+    label: Optional[str],
+    path: Path,
+    columns: List[str],
+    out,
+    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+) -> int:
+    rows = 0
+    for chunk in iter_labeled_chunks(path, label, chunk_rows):
+        dropped = [c for c in chunk.columns if c not in columns]
+        if dropped:
+            print(f"Aviso: {path} tem colunas sem cabeçalho ignoradas: {dropped}", file=sys.stderr)
+        reindex_columns(chunk, columns).to_csv(out, header=False, index=False)
+        rows += len(chunk)
+    return rows
+
+
+def _write_part(
+    label: Optional[str], path: Path, columns: List[str], part_path: Path, chunk_rows: int
+) -> int:
+    """Executado no pool: converte uma fonte para um arquivo-parte sem cabeçalho."""
+    with part_path.open("w", newline="") as out:
+        return _write_source(label, path, columns, out, chunk_rows)
+
+
+def _report(label: Optional[str], path: Path, rows: int) -> None:
+    version = detect_layout_version(read_header(path))
+    print(f"Adicionando {path} como '{label or 'auto'}' ({rows} linhas, layout {version})")
+
+
+def merge_to_csv(
+    entries: List[Tuple[Optional[str], Path]],
+    output_path: Path,
+    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+    workers: int = 1,
+) -> Tuple[int, int]:
+    """Grava o consolidado bloco a bloco; retorna (linhas, colunas).
+
+    Com `workers > 1` as fontes são convertidas em paralelo para arquivos-parte
+    temporários, concatenados depois na ordem de `entries`.
+    """
+    for _, path in entries:
+        if not path.exists():
+            raise FileNotFoundError(f"Arquivo não encontrado: {path}")
+    columns = output_columns([path for _, path in entries])
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = output_path.with_name(output_path.name + ".tmp")
+    total = 0
+    with tmp_path.open("w", newline="") as out:
+        pd.DataFrame(columns=columns).to_csv(out, index=False)
+        if workers <= 1 or len(entries) <= 1:
+            for label, path in entries:
+                rows = _write_source(label, path, columns, out, chunk_rows)
+                total += rows
+                _report(label, path, rows)
         else:
-            header = header + [f"extra_col_{i+1}" for i in range(missing)]
-    padded_rows = [
-        row + [""] * (len(header) - len(row)) for row in reader[1:]
+            with tempfile.TemporaryDirectory(dir=output_path.parent) as tmp_dir:
+                parts = [Path(tmp_dir) / f"part-{i:04d}.csv" for i in range(len(entries))]
+                with ProcessPoolExecutor(max_workers=workers) as pool:
+                    futures = [
+                        pool.submit(_write_part, label, path, columns, part, chunk_rows)
+                        for (label, path), part in zip(entries, parts)
+                    ]
+                    for (label, path), part, future in zip(entries, parts, futures):
+                        rows = future.result()
+                        with part.open(newline="") as src:
+                            shutil.copyfileobj(src, out)
+                        total += rows
+                        _report(label, path, rows)
+    tmp_path.replace(output_path)
+    return total, len(columns)
+
+
+def manifest_path(output_path: Path) -> Path:
+    return output_path.with_name(output_path.name + ".manifest.json")
+
+
+def file_digest(path: Path, limit: Optional[int] = None) -> str:
+    """SHA-256 do arquivo (ou só dos primeiros `limit` bytes)."""
+    digest = hashlib.sha256()
+    remaining = limit
+    with path.open("rb") as fp:
+        while remaining is None or remaining > 0:
+            block = fp.read(1 << 20 if remaining is None else min(1 << 20, remaining))
+            if not block:
+                break
+            digest.update(block)
+            if remaining is not None:
+                remaining -= len(block)
+    return digest.hexdigest()
+
+
+def source_fingerprint(path: Path, label: Optional[str], digest: Optional[str] = None) -> Dict[str, object]:
+    stat = path.stat()
+    return {
+        "label": label,
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "sha256": digest or file_digest(path),
+    }
+
+
+def load_manifest(output_path: Path) -> Dict[str, object]:
+    path = manifest_path(output_path)
+    if not path.exists() or not output_path.exists():
+        return {}
+    with path.open() as fp:
+        return json.load(fp)
+
+
+def save_manifest(output_path: Path, columns: List[str], sources: Dict[str, Dict[str, object]]) -> None:
+    path = manifest_path(output_path)
+    tmp_path = path.with_name(path.name + ".tmp")
+    with tmp_path.open("w") as fp:
+        json.dump({"columns": columns, "sources": sources}, fp, indent=2, ensure_ascii=False)
+    tmp_path.replace(path)
+
+
+def _key_frame(df: pd.DataFrame) -> pd.Series:
+    parts = [df[col].astype("string").fillna("") for col in DEDUP_KEYS]
+    return parts[0].str.cat(parts[1:], sep="\x1f")
+
+
+def existing_keys(output_path: Path) -> Set[str]:
+    df = pd.read_csv(output_path, usecols=DEDUP_KEYS, dtype="string", keep_default_na=False)
+    return set(_key_frame(df))
+
+
+def _is_unchanged(path: Path, label: Optional[str], previous: Optional[Dict[str, object]]) -> Tuple[bool, Optional[str]]:
+    """Compara com o manifesto; devolve (inalterada, hash calculado ou None)."""
+    if not previous or previous.get("label") != label:
+        return False, None
+    stat = path.stat()
+    if stat.st_size != previous.get("size"):
+        return False, None
+    if stat.st_mtime_ns == previous.get("mtime_ns"):
+        return True, str(previous.get("sha256"))
+    digest = file_digest(path)
+    return digest == previous.get("sha256"), digest
+
+
+def _is_append(path: Path, label: Optional[str], previous: Dict[str, object]) -> bool:
+    """Fonte conhecida que só ganhou linhas no fim (mesmo label, conteúdo antigo como prefixo)."""
+    if previous.get("label") != label:
+        return False
+    size = int(previous.get("size", -1))
+    if size < 0 or path.stat().st_size < size:
+        return False
+    return file_digest(path, size) == previous.get("sha256")
+
+
+def merge_incremental(
+    entries: List[Tuple[Optional[str], Path]],
+    output_path: Path,
+    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+    workers: int = 1,
+) -> Tuple[int, int]:
+    """Acrescenta ao consolidado apenas as linhas novas das fontes alteradas.
+
+    Sem manifesto, com fontes retiradas da lista, com colunas inéditas ou com uma
+    fonte conhecida que mudou de label ou foi editada (não só acrescida no fim), cai
+    no merge completo: as chaves de deduplicação incluem `device_model`, então
+    acrescentar duplicaria as execuções, e linhas editadas/apagadas ficariam no consolidado.
+    Retorna (linhas acrescentadas, colunas).
+    """
+    manifest = load_manifest(output_path)
+    columns = list(manifest.get("columns", []))
+    previous_sources: Dict[str, Dict[str, object]] = dict(manifest.get("sources", {}))
+    for _, path in entries:
+        if not path.exists():
+            raise FileNotFoundError(f"Arquivo não encontrado: {path}")
+
+    pending: List[Tuple[Optional[str], Path, Optional[str]]] = []
+    sources: Dict[str, Dict[str, object]] = {}
+    for label, path in entries:
+        previous = previous_sources.get(str(path))
+        unchanged, digest = _is_unchanged(path, label, previous) if manifest else (False, None)
+        if unchanged:
+            sources[str(path)] = source_fingerprint(path, label, digest)
+            print(f"Inalterado: {path}")
+        else:
+            pending.append((label, path, digest))
+
+    removed = set(previous_sources) - {str(path) for _, path in entries}
+    new_columns = not set(output_columns([p for _, p, _ in pending])) <= set(columns)
+    rewritten = [
+        path
+        for label, path, _ in pending
+        if str(path) in previous_sources and not _is_append(path, label, previous_sources[str(path)])
     ]
-    return pd.DataFrame(padded_rows, columns=header)
+    for path in rewritten:
+        print(f"Fonte alterada (label ou linhas existentes): {path}; refazendo o consolidado.")
+    if not manifest or removed or new_columns or rewritten:
+        rows, width = merge_to_csv(entries, output_path, chunk_rows, workers)
+        save_manifest(
+            output_path,
+            output_columns([path for _, path in entries]),
+            {str(path): source_fingerprint(path, label) for label, path in entries},
+        )
+        return rows, width
+
+    total = 0
+    if pending:
+        seen = existing_keys(output_path)
+        with output_path.open("a", newline="") as out:
+            for label, path, digest in pending:
+                added = 0
+                for chunk in iter_labeled_chunks(path, label, chunk_rows):
+                    keys = _key_frame(chunk)
+                    fresh = ~keys.isin(seen) & ~keys.duplicated()
+                    if fresh.any():
+                        reindex_columns(chunk[fresh.to_numpy()], columns).to_csv(out, header=False, index=False)
+                        seen.update(keys[fresh])
+                        added += int(fresh.sum())
+                total += added
+                sources[str(path)] = source_fingerprint(path, label, digest)
+                print(f"Atualizando {path} como '{label or 'auto'}' (+{added} linhas novas)")
+    save_manifest(output_path, columns, {str(p): sources[str(p)] for _, p in entries})
+    return total, len(columns)
 
 
 def main() -> None:
@@ -92,28 +484,53 @@ def main() -> None:
     parser.add_argument(
         "--device",
         action="append",
-        required=True,
+        default=[],
         metavar="LABEL=CSV",
         help="Par label=arquivo.csv (label opcional). Pode ser passado várias vezes.",
     )
+    parser.add_argument(
+        "--discover",
+        nargs="?",
+        const=str(DEFAULT_BENCHMARK_DIR),
+        metavar="DIR",
+        help="Inclui todas as campanhas de DIR (padrão: app/src/BANCHMARK) com label deduzido da pasta.",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help=f"Processos para converter as fontes em paralelo (ex.: {os.cpu_count() or 1}).",
+    )
     parser.add_argument(
         "--output",
         required=True,
         help="Caminho do CSV consolidado que será criado.",
     )
+    parser.add_argument(
+        "--chunk-rows",
+        type=int,
+        default=DEFAULT_CHUNK_ROWS,
+        help=f"Linhas por bloco na leitura/escrita (padrão: {DEFAULT_CHUNK_ROWS}).",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Pula fontes inalteradas (manifesto <saida>.manifest.json) e só acrescenta linhas novas.",
+    )
     args = parser.parse_args()
 
     entries = parse_device_args(args.device)
-    frames = []
-    for label, path in entries:
-        frames.append(load_with_label(path, label))
-        print(f"Adicionando {path} como '{label or 'auto'}' ({len(frames[-1])} linhas)")
-
-    combined = pd.concat(frames, ignore_index=True, sort=False)
+    if args.discover:
+        entries.extend(discover_sources(Path(args.discover)))
+    if not entries:
+        parser.error("informe --device ou --discover")
     output_path = Path(args.output)
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    combined.to_csv(output_path, index=False)
-    print(f"CSV consolidado salvo em {output_path} com {len(combined)} linhas e {len(combined.columns)} colunas.")
+    if args.incremental:
+        rows, columns = merge_incremental(entries, output_path, args.chunk_rows, args.workers)
+        print(f"CSV consolidado atualizado em {output_path} (+{rows} linhas, {columns} colunas).")
+        return
+    rows, columns = merge_to_csv(entries, output_path, args.chunk_rows, args.workers)
+    print(f"CSV consolidado salvo em {output_path} com {rows} linhas e {columns} colunas.")
 
 
 if __name__ == "__main__":